@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.services.data_version import data_version
+
+CACHE_CONTROL = "no-cache"
+
+
+def cached_response(request: Request, version: int) -> Optional[Response]:
+    headers = _headers(version)
+    if data_version.matches(request.headers.get("if-none-match"), version):
+        return Response(status_code=304, headers=headers)
+    body = data_version.body(_key(request), version)
+    if body is None:
+        return None
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def versioned_response(
+    request: Request, version: int, adapter: TypeAdapter, content: Any
+) -> Response:
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    data_version.store(_key(request), version, body)
+    return Response(body, media_type="application/json", headers=_headers(version))
+
+
+def _key(request: Request) -> str:
+    return f"{request.url.path}?{request.url.query}"
+
+
+def _headers(version: int) -> dict:
+    return {"ETag": data_version.etag(version), "Cache-Control": CACHE_CONTROL}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import struct
+from datetime import timedelta
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import Response
+
+from app.services.recent_readings import EPOCH
+
+COLUMNAR = "application/vnd.waterpal.columnar+json"
+MSGPACK = "application/msgpack"
+MSGPACK_ALIASES = (MSGPACK, "application/x-msgpack", "application/vnd.msgpack")
+
+MILLISECOND = timedelta(milliseconds=1)
+
+Series = Tuple[np.ndarray, np.ndarray]
+
+_MEDIA_TYPES: Dict[str, Optional[str]] = {
+    "application/json": None,
+    COLUMNAR: COLUMNAR,
+    **{alias: MSGPACK for alias in MSGPACK_ALIASES},
+}
+_PREFERENCE = (None, MSGPACK, COLUMNAR)
+
+_INT64 = np.dtype([("tag", "u1"), ("value", ">i8")])
+_INT32 = np.dtype([("tag", "u1"), ("value", ">i4")])
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    if not accept:
+        return None
+    weights: Dict[Optional[str], float] = {}
+    for part in accept.split(","):
+        media, *params = part.split(";")
+        media = media.strip().lower()
+        if media in _MEDIA_TYPES:
+            fmt = _MEDIA_TYPES[media]
+            weights[fmt] = max(weights.get(fmt, 0.0), _quality(params))
+    offered = [fmt for fmt, quality in weights.items() if quality > 0]
+    if not offered:
+        return None
+    return max(offered, key=lambda fmt: (weights[fmt], _PREFERENCE.index(fmt)))
+
+
+def _quality(params: Sequence[str]) -> float:
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return min(1.0, max(0.0, float(value)))
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def series_from_rows(rows: Sequence) -> Dict[int, Series]:
+    rows = rows[::-1]
+    count = len(rows)
+    zone_ids = np.fromiter((row.zone_id for row in rows), dtype=np.int64, count=count)
+    values = np.fromiter((row.value for row in rows), dtype=np.int32, count=count)
+    stamps = np.fromiter(
+        ((row.created_at - EPOCH) // MILLISECOND for row in rows), dtype=np.int64, count=count
+    )
+    order = np.argsort(zone_ids, kind="stable")
+    zones, starts = np.unique(zone_ids[order], return_index=True)
+    return {
+        int(zone_id): (stamps[index], values[index])
+        for zone_id, index in zip(zones, np.split(order, starts[1:]))
+    }
+
+
+def render(fmt: str, series: Dict[int, Series], next_cursor: Optional[str]) -> Response:
+    if fmt == MSGPACK:
+        body = encode_msgpack(series, next_cursor)
+    else:
+        body = encode_columnar(series, next_cursor)
+    return Response(body, media_type=fmt)
+
+
+def encode_columnar(series: Dict[int, Series], next_cursor: Optional[str]) -> bytes:
+    zones = {
+        str(zone_id): {"t": stamps.tolist(), "v": values.tolist()}
+        for zone_id, (stamps, values) in series.items()
+    }
+    payload = {"zones": zones, "next_cursor": next_cursor}
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def encode_msgpack(series: Dict[int, Series], next_cursor: Optional[str]) -> bytes:
+    parts = [_map_header(2), _str("zones"), _map_header(len(series))]
+    for zone_id, (stamps, values) in series.items():
+        parts += [_str(str(zone_id)), _map_header(2)]
+        parts += [_str("t"), _int_array(stamps, _INT64, 0xD3)]
+        parts += [_str("v"), _int_array(values, _INT32, 0xD2)]
+    parts += [_str("next_cursor"), b"\xc0" if next_cursor is None else _str(next_cursor)]
+    return b"".join(parts)
+
+
+def _map_header(size: int) -> bytes:
+    if size < 16:
+        return bytes([0x80 | size])
+    if size < 1 << 16:
+        return struct.pack(">BH", 0xDE, size)
+    return struct.pack(">BI", 0xDF, size)
+
+
+def _array_header(size: int) -> bytes:
+    if size < 16:
+        return bytes([0x90 | size])
+    if size < 1 << 16:
+        return struct.pack(">BH", 0xDC, size)
+    return struct.pack(">BI", 0xDD, size)
+
+
+def _str(value: str) -> bytes:
+    raw = value.encode()
+    if len(raw) < 32:
+        return bytes([0xA0 | len(raw)]) + raw
+    if len(raw) < 1 << 8:
+        return struct.pack(">BB", 0xD9, len(raw)) + raw
+    if len(raw) < 1 << 16:
+        return struct.pack(">BH", 0xDA, len(raw)) + raw
+    return struct.pack(">BI", 0xDB, len(raw)) + raw
+
+
+def _int_array(values: np.ndarray, dtype: np.dtype, tag: int) -> bytes:
+    packed = np.empty(len(values), dtype=dtype)
+    packed["tag"] = tag
+    packed["value"] = values
+    return _array_header(len(values)) + packed.tobytes()
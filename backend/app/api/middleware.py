@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+
+from app.db.profiling import profiler
+from app.services.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=method, route=path)
+            HTTP_REQUESTS.inc(method=method, route=path, status=status["code"])
+
+
+class QueryProfilingMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with profiler.profile() as stats:
+
+            async def send_with_headers(message) -> None:
+                if message["type"] == "http.response.start":
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", []),
+                            (b"x-db-query-count", str(stats.count).encode()),
+                            (b"x-db-time-ms", str(stats.time_ms).encode()),
+                        ],
+                    }
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
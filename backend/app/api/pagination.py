@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, desc, tuple_
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+MAX_CHART_POINTS = 100000
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_statement(stmt: Select, model, cursor: Optional[str], limit: int) -> Select:
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+    return stmt.order_by(desc(model.created_at), desc(model.id)).limit(limit + 1)
+
+
+def page_items(rows: List, limit: int) -> Tuple[List, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
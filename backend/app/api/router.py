@@ -1,28 +1,72 @@
-from datetime import datetime
+import gzip
+from dataclasses import asdict
+from datetime import datetime, timezone
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from app.api.conditional import cached_response, versioned_response
+from app.api.formats import negotiate, render, series_from_rows
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_CHART_POINTS,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    page_items,
+    page_statement,
+)
 from app.api.schemas import (
     AlertEventOut,
+    BulkIngestOut,
+    BulkReadingIn,
+    CycleRunOut,
+    FleetNodeOut,
     ManualWaterRequest,
+    Page,
     PumpEventOut,
+    PumpJobOut,
+    ReadingAggregateOut,
     ReadingOut,
     StatusItem,
+    SyncAckOut,
+    SyncBatchIn,
     TestReadingOut,
     ZoneCreate,
+    ZoneForecastOut,
     ZoneOut,
+    ZoneScheduleOut,
     ZoneUpdate,
 )
 from app.config import settings
-from app.db.session import SessionLocal
-from app.models import AlertEvent, PumpEvent, Reading, Zone
-from app.services.monitoring import run_monitoring_cycle
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models import AlertEvent, PumpEvent, Reading, Zone, ZoneState
+from app.services.broadcaster import broadcaster, serialize
+from app.services.data_version import data_version
+from app.services.export import MEDIA_TYPES, stream_export
+from app.services.fleet import apply_sync_batch, fleet_status
+from app.services.forecast import forecaster
+from app.services.ingest import IngestBufferFull, PendingReading
+from app.services.recent_readings import from_micros, recent_readings
+from app.services.retention import run_retention
+from app.services.rollups import BUCKETS, bucket_start
+from app.services.zone_cache import zone_cache
+from app.services.zone_state import refresh_cooldowns
 
 router = APIRouter(prefix="/api")
 
+_bulk_readings = TypeAdapter(List[BulkReadingIn])
+_bulk_reading = TypeAdapter(BulkReadingIn)
+_zones_out = TypeAdapter(List[ZoneOut])
+_status_out = TypeAdapter(List[StatusItem])
+_alerts_out = TypeAdapter(Page[AlertEventOut])
+
 
 def get_db():
     db = SessionLocal()
@@ -32,22 +76,49 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 @router.get("/zones", response_model=List[ZoneOut])
-def list_zones(db: Session = Depends(get_db)):
-    return db.query(Zone).order_by(Zone.id).all()
+async def list_zones(request: Request, db: AsyncSession = Depends(get_async_db)):
+    version = data_version.current
+    cached = cached_response(request, version)
+    if cached is not None:
+        return cached
+    return versioned_response(request, version, _zones_out, await zone_cache.all_async(db))
+
+
+@router.get("/zones/cache-stats")
+def zone_cache_stats():
+    return zone_cache.stats()
+
+
+@router.get("/zones/schedule", response_model=List[ZoneScheduleOut])
+def zone_schedule(request: Request):
+    return request.app.state.sampling_scheduler.schedules()
 
 
 @router.post("/zones", response_model=ZoneOut, status_code=201)
-def create_zone(payload: ZoneCreate, db: Session = Depends(get_db)):
+def create_zone(payload: ZoneCreate, request: Request, db: Session = Depends(get_db)):
     zone = Zone(**payload.model_dump())
     db.add(zone)
     db.commit()
     db.refresh(zone)
+    zone_cache.put(zone)
+    data_version.bump()
+    request.app.state.sampling_scheduler.wake(zone.id)
     return zone
 
 
 @router.patch("/zones/{zone_id}", response_model=ZoneOut)
-def update_zone(zone_id: int, payload: ZoneUpdate, db: Session = Depends(get_db)):
+def update_zone(
+    zone_id: int,
+    payload: ZoneUpdate,
+    request: Request,
+    db: Session = Depends(get_db),
+):
     zone = db.query(Zone).filter(Zone.id == zone_id).first()
     if not zone:
         raise HTTPException(status_code=404, detail="Zone not found")
@@ -55,29 +126,51 @@ def update_zone(zone_id: int, payload: ZoneUpdate, db: Session = Depends(get_db)
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(zone, field, value)
 
+    if zone.state is not None:
+        refresh_cooldowns(zone.state, zone)
+
     db.commit()
     db.refresh(zone)
+    zone_cache.put(zone)
+    data_version.bump()
+    request.app.state.sampling_scheduler.wake(zone.id)
     return zone
 
 
 @router.delete("/zones/{zone_id}", status_code=204)
-def delete_zone(zone_id: int, db: Session = Depends(get_db)):
+def delete_zone(zone_id: int, request: Request, db: Session = Depends(get_db)):
     zone = db.query(Zone).filter(Zone.id == zone_id).first()
     if not zone:
         raise HTTPException(status_code=404, detail="Zone not found")
+    for model in BUCKETS.values():
+        db.query(model).filter(model.zone_id == zone_id).delete()
     db.delete(zone)
     db.commit()
+    zone_cache.remove(zone_id)
+    recent_readings.remove(zone_id)
+    forecaster.reset(zone_id)
+    request.app.state.sampling_scheduler.forget(zone_id)
+    data_version.bump()
     return None
 
 
-@router.post("/zones/{zone_id}/water", response_model=PumpEventOut)
+@router.get("/zones/{zone_id}/forecast", response_model=ZoneForecastOut)
+def zone_forecast(zone_id: int, db: Session = Depends(get_db)):
+    zone = zone_cache.get(db, zone_id)
+    if not zone:
+        raise HTTPException(status_code=404, detail="Zone not found")
+    forecast = forecaster.forecast(zone.id, zone.threshold)
+    return ZoneForecastOut(threshold=zone.threshold, **asdict(forecast))
+
+
+@router.post("/zones/{zone_id}/water", response_model=PumpJobOut, status_code=202)
 def manual_water(
     zone_id: int,
     payload: ManualWaterRequest,
     request: Request,
     db: Session = Depends(get_db),
 ):
-    zone = db.query(Zone).filter(Zone.id == zone_id).first()
+    zone = zone_cache.get(db, zone_id)
     if not zone:
         raise HTTPException(status_code=404, detail="Zone not found")
     if not zone.enabled:
@@ -85,76 +178,258 @@ def manual_water(
 
     requested_duration = payload.duration_sec or zone.water_duration_sec
     max_duration = min(requested_duration, settings.max_pump_seconds)
-    pump_controller = request.app.state.pump_controller
-    ran = pump_controller.run(zone.pump_gpio, max_duration)
-
-    event = PumpEvent(
-        zone_id=zone.id,
-        action="manual",
-        reason="manual",
-        duration_sec=max_duration if ran else None,
-    )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+    pump_engine = request.app.state.pump_engine
+    if pump_engine.is_busy(zone.id, zone.pump_gpio):
+        raise HTTPException(status_code=409, detail="Pump already running")
+    return pump_engine.submit(zone.id, zone.pump_gpio, max_duration, "manual", "manual")
+
 
+@router.get("/pump-jobs", response_model=List[PumpJobOut])
+def list_pump_jobs(request: Request):
+    return request.app.state.pump_engine.jobs()
 
-@router.get("/readings", response_model=List[ReadingOut])
-def list_readings(
+
+@router.get("/pump-jobs/{job_id}", response_model=PumpJobOut)
+def get_pump_job(job_id: str, request: Request):
+    job = request.app.state.pump_engine.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Pump job not found")
+    return job
+
+
+@router.get("/readings", response_model=Page[ReadingOut])
+async def list_readings(
+    request: Request,
     zone_id: Optional[int] = None,
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_CHART_POINTS),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(Reading)
+    fmt = negotiate(request.headers.get("accept"))
+    if fmt is None and limit > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=422, detail=f"limit must be at most {MAX_PAGE_SIZE} for row JSON"
+        )
+    start = _naive_utc(start) if start is not None else None
+    end = _naive_utc(end) if end is not None else None
+
     if zone_id is not None:
-        query = query.filter(Reading.zone_id == zone_id)
-    if start is not None:
-        query = query.filter(Reading.created_at >= start)
-    if end is not None:
-        query = query.filter(Reading.created_at <= end)
-    return query.order_by(desc(Reading.created_at)).limit(500).all()
+        before = decode_cursor(cursor) if cursor is not None else None
+        if fmt is not None:
+            columns = recent_readings.window_columns(zone_id, start, end, limit + 1, before)
+            if columns is not None:
+                return _chart_page(fmt, zone_id, columns, limit)
+        else:
+            recent = recent_readings.window(zone_id, start, end, limit + 1, before)
+            if recent is not None:
+                items, next_cursor = page_items([_recent_out(row) for row in recent], limit)
+                return Page[ReadingOut](items=items, next_cursor=next_cursor)
+
+    filters = _event_filters(Reading, zone_id, start, end)
+    if fmt is not None:
+        stmt = select(Reading.zone_id, Reading.id, Reading.value, Reading.created_at).where(
+            *filters
+        )
+        rows = (await db.execute(page_statement(stmt, Reading, cursor, limit))).all()
+        items, next_cursor = page_items(rows, limit)
+        return render(fmt, series_from_rows(items), next_cursor)
+
+    stmt = select(Reading).where(*filters)
+    rows = (await db.scalars(page_statement(stmt, Reading, cursor, limit))).all()
+    items, next_cursor = page_items(rows, limit)
+    return Page[ReadingOut](items=items, next_cursor=next_cursor)
+
 
+@router.get("/readings/latest", response_model=List[ReadingOut])
+def latest_readings(db: Session = Depends(get_db)):
+    recent = recent_readings.latest_all()
+    if recent is None:
+        states = db.query(ZoneState).filter(ZoneState.latest_reading_id.is_not(None))
+        recent = [
+            (state.zone_id, state.latest_reading_id, state.latest_value, state.latest_reading_at)
+            for state in states.order_by(ZoneState.zone_id)
+        ]
+    return [_recent_out(row) for row in recent]
 
-@router.get("/pump-events", response_model=List[PumpEventOut])
-def list_pump_events(
+
+@router.get("/readings/recent/stats")
+def recent_readings_stats():
+    return recent_readings.stats()
+
+
+@router.get("/readings/export")
+def export_readings(
+    request: Request,
     zone_id: Optional[int] = None,
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
 ):
-    query = db.query(PumpEvent)
+    stmt = (
+        select(Reading.id, Reading.zone_id, Reading.value, Reading.created_at)
+        .where(*_event_filters(Reading, zone_id, start, end))
+        .order_by(Reading.created_at, Reading.id)
+    )
+    return _export_response(request, stmt, fmt, "readings")
+
+
+@router.post("/readings/bulk", response_model=BulkIngestOut, status_code=202)
+async def ingest_readings(request: Request):
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type:
+            items = [
+                _bulk_reading.validate_json(line)
+                for line in body.splitlines()
+                if line.strip()
+            ]
+        else:
+            items = _bulk_readings.validate_json(body)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False))
+
+    now = datetime.utcnow()
+    pending = [
+        PendingReading(
+            client_id=item.id,
+            zone_id=item.zone_id,
+            value=item.value,
+            created_at=_naive_utc(item.created_at) if item.created_at else now,
+        )
+        for item in items
+    ]
+    try:
+        depth = request.app.state.ingest_buffer.submit(pending)
+    except IngestBufferFull:
+        raise HTTPException(status_code=503, detail="Ingest buffer full, retry later")
+    return BulkIngestOut(accepted=len(pending), pending=depth)
+
+
+@router.get("/readings/bulk/stats")
+def ingest_stats(request: Request):
+    return request.app.state.ingest_buffer.stats()
+
+
+@router.get("/readings/aggregate", response_model=List[ReadingAggregateOut])
+async def aggregate_readings(
+    zone_id: Optional[int] = None,
+    bucket: str = Query("1h", pattern="^(1h|1d)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    model = BUCKETS[bucket]
+    stmt = select(model)
     if zone_id is not None:
-        query = query.filter(PumpEvent.zone_id == zone_id)
+        stmt = stmt.where(model.zone_id == zone_id)
     if start is not None:
-        query = query.filter(PumpEvent.created_at >= start)
+        stmt = stmt.where(model.bucket_start >= bucket_start(_naive_utc(start), bucket))
     if end is not None:
-        query = query.filter(PumpEvent.created_at <= end)
-    return query.order_by(desc(PumpEvent.created_at)).limit(500).all()
+        stmt = stmt.where(model.bucket_start <= _naive_utc(end))
+    rows = (await db.scalars(stmt.order_by(model.zone_id, model.bucket_start))).all()
+    return [
+        ReadingAggregateOut(
+            zone_id=row.zone_id,
+            bucket_start=row.bucket_start,
+            count=row.count,
+            min=row.min_value,
+            max=row.max_value,
+            avg=row.value_sum / row.count,
+        )
+        for row in rows
+    ]
 
 
-@router.get("/alerts", response_model=List[AlertEventOut])
-def list_alerts(
+@router.get("/pump-events", response_model=Page[PumpEventOut])
+async def list_pump_events(
+    zone_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(PumpEvent).where(*_event_filters(PumpEvent, zone_id, start, end))
+    rows = (await db.scalars(page_statement(stmt, PumpEvent, cursor, limit))).all()
+    items, next_cursor = page_items(rows, limit)
+    return Page[PumpEventOut](items=items, next_cursor=next_cursor)
+
+
+@router.get("/pump-events/export")
+def export_pump_events(
+    request: Request,
+    zone_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+):
+    stmt = (
+        select(
+            PumpEvent.id,
+            PumpEvent.zone_id,
+            PumpEvent.action,
+            PumpEvent.reason,
+            PumpEvent.duration_sec,
+            PumpEvent.created_at,
+        )
+        .where(*_event_filters(PumpEvent, zone_id, start, end))
+        .order_by(PumpEvent.created_at, PumpEvent.id)
+    )
+    return _export_response(request, stmt, fmt, "pump-events")
+
+
+@router.get("/alerts", response_model=Page[AlertEventOut])
+async def list_alerts(
+    request: Request,
     zone_id: Optional[int] = None,
     alert_type: Optional[str] = None,
     acknowledged: Optional[bool] = None,
     start: Optional[datetime] = None,
     end: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(AlertEvent)
-    if zone_id is not None:
-        query = query.filter(AlertEvent.zone_id == zone_id)
-    if alert_type is not None:
-        query = query.filter(AlertEvent.alert_type == alert_type)
-    if acknowledged is not None:
-        query = query.filter(AlertEvent.acknowledged == acknowledged)
-    if start is not None:
-        query = query.filter(AlertEvent.created_at >= start)
-    if end is not None:
-        query = query.filter(AlertEvent.created_at <= end)
-    return query.order_by(desc(AlertEvent.created_at)).limit(200).all()
+    version = data_version.current
+    cached = cached_response(request, version)
+    if cached is not None:
+        return cached
+    stmt = select(AlertEvent).where(
+        *_alert_filters(zone_id, alert_type, acknowledged, start, end)
+    )
+    rows = (await db.scalars(page_statement(stmt, AlertEvent, cursor, limit))).all()
+    items, next_cursor = page_items(rows, limit)
+    page = Page[AlertEventOut](items=items, next_cursor=next_cursor)
+    return versioned_response(request, version, _alerts_out, page)
+
+
+@router.get("/alerts/export")
+def export_alerts(
+    request: Request,
+    zone_id: Optional[int] = None,
+    alert_type: Optional[str] = None,
+    acknowledged: Optional[bool] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+):
+    stmt = (
+        select(
+            AlertEvent.id,
+            AlertEvent.zone_id,
+            AlertEvent.alert_type,
+            AlertEvent.message,
+            AlertEvent.created_at,
+            AlertEvent.acknowledged,
+            AlertEvent.acknowledged_at,
+        )
+        .where(*_alert_filters(zone_id, alert_type, acknowledged, start, end))
+        .order_by(AlertEvent.created_at, AlertEvent.id)
+    )
+    return _export_response(request, stmt, fmt, "alerts")
 
 
 @router.post("/alerts/{alert_id}/ack", response_model=AlertEventOut)
@@ -166,45 +441,55 @@ def acknowledge_alert(alert_id: int, db: Session = Depends(get_db)):
         alert.acknowledged = True
         alert.acknowledged_at = datetime.utcnow()
         db.commit()
-    db.refresh(alert)
+        db.refresh(alert)
+        data_version.bump()
+        broadcaster.publish("alerts", alert.zone_id, serialize(alert))
     return alert
 
 
 @router.get("/status", response_model=List[StatusItem])
-def get_status(db: Session = Depends(get_db)):
-    zones = db.query(Zone).order_by(Zone.id).all()
+async def get_status(request: Request, db: AsyncSession = Depends(get_async_db)):
+    version = data_version.current
+    cached = cached_response(request, version)
+    if cached is not None:
+        return cached
+    zones = await zone_cache.all_async(db)
+    states = {
+        state.zone_id: state
+        for state in await db.scalars(
+            select(ZoneState).options(
+                joinedload(ZoneState.latest_reading),
+                joinedload(ZoneState.last_pump_event),
+            )
+        )
+    }
     status_items: List[StatusItem] = []
     for zone in zones:
-        latest_reading = (
-            db.query(Reading)
-            .filter(Reading.zone_id == zone.id)
-            .order_by(desc(Reading.created_at))
-            .first()
-        )
-        last_event = (
-            db.query(PumpEvent)
-            .filter(PumpEvent.zone_id == zone.id)
-            .order_by(desc(PumpEvent.created_at))
-            .first()
-        )
+        state = states.get(zone.id)
         status_items.append(
             StatusItem(
                 zone=zone,
-                latest_reading=latest_reading,
-                last_pump_event=last_event,
+                latest_reading=state.latest_reading if state else None,
+                last_pump_event=state.last_pump_event if state else None,
             )
         )
-    return status_items
+    return versioned_response(request, version, _status_out, status_items)
+
+
+@router.get("/data-version")
+def get_data_version():
+    return data_version.stats()
 
 
 @router.get("/test-readings", response_model=List[TestReadingOut])
 def test_readings(request: Request, db: Session = Depends(get_db)):
     sensor_manager = request.app.state.sensor_manager
-    zones = db.query(Zone).order_by(Zone.id).all()
+    zones = zone_cache.all(db)
+    values = sensor_manager.read_channels(zone.sensor_channel for zone in zones)
     results: List[TestReadingOut] = []
 
     for zone in zones:
-        value = sensor_manager.read_channel(zone.sensor_channel)
+        value = values.get(zone.sensor_channel)
         if value is None:
             results.append(
                 TestReadingOut(
@@ -222,18 +507,157 @@ def test_readings(request: Request, db: Session = Depends(get_db)):
     return results
 
 
-@router.post("/run-cycle")
-def run_cycle(request: Request, db: Session = Depends(get_db)):
-    sensor_manager = request.app.state.sensor_manager
-    pump_controller = request.app.state.pump_controller
-    return run_monitoring_cycle(db, sensor_manager, pump_controller)
+@router.get("/sensors/stats")
+def sensor_stats(request: Request):
+    return request.app.state.sensor_manager.stats()
+
+
+@router.post("/run-cycle", response_model=CycleRunOut)
+def run_cycle(
+    request: Request,
+    response: Response,
+    wait: bool = True,
+    timeout: float = Query(60, gt=0, le=600),
+):
+    executor = request.app.state.cycle_executor
+    if not wait:
+        response.status_code = 202
+        return executor.trigger(source="api")
+    return executor.run(source="api", timeout=timeout)
+
+
+@router.get("/cycles", response_model=List[CycleRunOut])
+def list_cycles(request: Request):
+    return request.app.state.cycle_executor.runs()
+
+
+@router.get("/cycles/stats")
+def cycle_stats(request: Request):
+    return request.app.state.cycle_executor.stats()
+
+
+@router.get("/cycles/{run_id}", response_model=CycleRunOut)
+def get_cycle(run_id: str, request: Request, wait: float = Query(0, ge=0, le=600)):
+    executor = request.app.state.cycle_executor
+    run = executor.wait(run_id, wait) if wait else executor.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Cycle not found")
+    return run
+
+
+@router.post("/run-retention")
+def run_retention_now(request: Request):
+    report = run_retention(request.app.state.session_factory)
+    request.app.state.retention_report = report
+    return report
+
+
+@router.post("/fleet/sync", response_model=SyncAckOut)
+async def fleet_sync(request: Request):
+    if request.app.state.node_mode != "aggregator":
+        raise HTTPException(status_code=404, detail="Not running in aggregator mode")
+    body = await request.body()
+    if request.headers.get("content-encoding") == "gzip":
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError):
+            raise HTTPException(status_code=400, detail="Invalid gzip body")
+    try:
+        batch = SyncBatchIn.model_validate_json(body)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False))
+    return await run_in_threadpool(_apply_sync, request.app.state.session_factory, batch)
+
+
+@router.get("/fleet/status", response_model=List[FleetNodeOut])
+def get_fleet_status(request: Request, db: Session = Depends(get_db)):
+    if request.app.state.node_mode != "aggregator":
+        raise HTTPException(status_code=404, detail="Not running in aggregator mode")
+    return fleet_status(db)
+
+
+@router.get("/fleet/outbox")
+def outbox_stats(request: Request):
+    syncer = getattr(request.app.state, "outbox_syncer", None)
+    if syncer is None:
+        raise HTTPException(status_code=404, detail="Not running in edge mode")
+    return syncer.stats()
 
 
 @router.post("/reset-db")
-def reset_db(db: Session = Depends(get_db)):
+def reset_db(request: Request, db: Session = Depends(get_db)):
+    db.query(ZoneState).delete()
+    for model in BUCKETS.values():
+        db.query(model).delete()
     db.query(AlertEvent).delete()
     db.query(PumpEvent).delete()
     db.query(Reading).delete()
     db.query(Zone).delete()
     db.commit()
+    zone_cache.invalidate()
+    recent_readings.clear()
+    forecaster.clear()
+    request.app.state.sampling_scheduler.forget()
+    data_version.bump()
     return {"status": "reset"}
+
+
+def _apply_sync(session_factory, batch: SyncBatchIn) -> dict:
+    db = session_factory()
+    try:
+        return apply_sync_batch(
+            db,
+            batch.node_id,
+            [zone.model_dump() for zone in batch.zones],
+            [event.model_dump() for event in batch.events],
+        )
+    finally:
+        db.close()
+
+
+def _chart_page(fmt: str, zone_id: int, columns, limit: int):
+    ids, stamps, values = columns
+    next_cursor = None
+    if len(ids) > limit:
+        ids, stamps, values = ids[1:], stamps[1:], values[1:]
+        next_cursor = encode_cursor(from_micros(int(stamps[0])), int(ids[0]))
+    return render(fmt, {zone_id: (stamps // 1000, values)}, next_cursor)
+
+
+def _recent_out(row) -> ReadingOut:
+    zone_id, reading_id, value, created_at = row
+    return ReadingOut(id=reading_id, zone_id=zone_id, value=value, created_at=created_at)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _event_filters(model, zone_id, start, end) -> list:
+    filters = []
+    if zone_id is not None:
+        filters.append(model.zone_id == zone_id)
+    if start is not None:
+        filters.append(model.created_at >= _naive_utc(start))
+    if end is not None:
+        filters.append(model.created_at <= _naive_utc(end))
+    return filters
+
+
+def _alert_filters(zone_id, alert_type, acknowledged, start, end) -> list:
+    filters = _event_filters(AlertEvent, zone_id, start, end)
+    if alert_type is not None:
+        filters.append(AlertEvent.alert_type == alert_type)
+    if acknowledged is not None:
+        filters.append(AlertEvent.acknowledged == acknowledged)
+    return filters
+
+
+def _export_response(request: Request, stmt, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(request.app.state.session_factory, stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
@@ -1,8 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
+T = TypeVar("T")
+
 
 class ZoneOut(BaseModel):
     id: int
@@ -50,6 +52,27 @@ class ReadingOut(BaseModel):
         from_attributes = True
 
 
+class BulkReadingIn(BaseModel):
+    id: str = Field(min_length=1, max_length=128)
+    zone_id: int
+    value: int = Field(ge=-32768, le=32767)
+    created_at: Optional[datetime] = None
+
+
+class BulkIngestOut(BaseModel):
+    accepted: int
+    pending: int
+
+
+class ReadingAggregateOut(BaseModel):
+    zone_id: int
+    bucket_start: datetime
+    count: int
+    min: int
+    max: int
+    avg: float
+
+
 class PumpEventOut(BaseModel):
     id: int
     zone_id: int
@@ -62,6 +85,63 @@ class PumpEventOut(BaseModel):
         from_attributes = True
 
 
+class PumpJobOut(BaseModel):
+    id: str
+    zone_id: int
+    action: str
+    reason: str
+    duration_sec: int
+    status: str
+    queued_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    event_id: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+
+class CycleRunOut(BaseModel):
+    id: str
+    zone_ids: Optional[List[int]]
+    sources: List[str]
+    triggers: int
+    status: str
+    queued_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    duration_ms: Optional[float]
+    queries: Optional[int]
+    result: Optional[Dict[str, int]]
+    error: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
+class ZoneScheduleOut(BaseModel):
+    zone_id: int
+    next_due_at: datetime
+    interval_sec: float
+    last_value: Optional[int]
+    last_sampled_at: Optional[datetime]
+    drying_rate_per_hour: Optional[float]
+    predicted_threshold_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class ZoneForecastOut(BaseModel):
+    zone_id: int
+    threshold: int
+    samples: int
+    drying_rate_per_hour: Optional[float]
+    predicted_value: Optional[float]
+    hours_to_threshold: Optional[float]
+    threshold_at: Optional[datetime]
+
+
 class AlertEventOut(BaseModel):
     id: int
     zone_id: int
@@ -75,6 +155,11 @@ class AlertEventOut(BaseModel):
         from_attributes = True
 
 
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
+
 class StatusItem(BaseModel):
     zone: ZoneOut
     latest_reading: Optional[ReadingOut]
@@ -90,3 +175,49 @@ class TestReadingOut(BaseModel):
 
 class ManualWaterRequest(BaseModel):
     duration_sec: Optional[int] = Field(default=None, ge=1, le=600)
+
+
+class SyncZoneIn(BaseModel):
+    id: int
+    name: str
+
+
+class SyncEventIn(BaseModel):
+    seq: int
+    topic: str = Field(pattern="^(readings|pump_events|alerts)$")
+    key: str
+    zone_id: Optional[int]
+    data: Dict[str, Any]
+
+
+class SyncBatchIn(BaseModel):
+    node_id: str = Field(min_length=1)
+    zones: List[SyncZoneIn] = []
+    events: List[SyncEventIn]
+
+
+class SyncAckOut(BaseModel):
+    acked_seq: int
+    inserted: int
+    duplicates: int
+
+
+class FleetZoneOut(BaseModel):
+    zone_id: int
+    zone_name: Optional[str]
+    latest_value: Optional[int]
+    latest_reading_at: Optional[datetime]
+    last_pump_at: Optional[datetime]
+    last_alert_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class FleetNodeOut(BaseModel):
+    node_id: str
+    last_seen_at: Optional[datetime]
+    last_seq: int
+    events_total: int
+    duplicates_total: int
+    zones: List[FleetZoneOut]
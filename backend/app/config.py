@@ -1,14 +1,69 @@
 from dataclasses import dataclass
 import os
+import socket
 
 
 @dataclass(frozen=True)
 class Settings:
+    database_url: str = os.getenv("DATABASE_URL", "sqlite:///./waterpal.db")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "16"))
+    db_pool_timeout_sec: float = float(os.getenv("DB_POOL_TIMEOUT_SEC", "30"))
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    sqlite_cache_size_kib: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "16384"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    db_profiling: bool = os.getenv("DB_PROFILING", "false").lower() == "true"
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "100"))
     read_interval_hours: int = int(os.getenv("READ_INTERVAL_HOURS", "4"))
+    sample_min_interval_minutes: int = int(os.getenv("SAMPLE_MIN_INTERVAL_MINUTES", "15"))
+    sample_max_interval_minutes: int = int(
+        os.getenv(
+            "SAMPLE_MAX_INTERVAL_MINUTES",
+            str(int(os.getenv("READ_INTERVAL_HOURS", "4")) * 60),
+        )
+    )
+    sample_batch_window_sec: int = int(os.getenv("SAMPLE_BATCH_WINDOW_SEC", "60"))
+    sample_retry_sec: float = float(os.getenv("SAMPLE_RETRY_SEC", "5"))
+    forecast_window_hours: float = float(os.getenv("FORECAST_WINDOW_HOURS", "24"))
+    forecast_reset_jump: int = int(os.getenv("FORECAST_RESET_JUMP", "500"))
+    forecast_min_samples: int = int(os.getenv("FORECAST_MIN_SAMPLES", "3"))
+    recent_readings_per_zone: int = int(os.getenv("RECENT_READINGS_PER_ZONE", "720"))
+    response_cache_entries: int = int(os.getenv("RESPONSE_CACHE_ENTRIES", "256"))
+    response_gzip: bool = os.getenv("RESPONSE_GZIP", "true").lower() == "true"
+    gzip_min_size: int = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+    gzip_level: int = int(os.getenv("GZIP_LEVEL", "5"))
     default_threshold: int = int(os.getenv("DEFAULT_THRESHOLD", "16000"))
     default_hysteresis: int = int(os.getenv("DEFAULT_HYSTERESIS", "800"))
     max_pump_seconds: int = int(os.getenv("MAX_PUMP_SECONDS", "30"))
+    max_simultaneous_pumps: int = int(os.getenv("MAX_SIMULTANEOUS_PUMPS", "2"))
     cooldown_hours: int = int(os.getenv("COOLDOWN_HOURS", "4"))
+    retention_interval_hours: int = int(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+    retention_batch_size: int = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+    readings_retention_days: int = int(os.getenv("READINGS_RETENTION_DAYS", "30"))
+    pump_events_retention_days: int = int(os.getenv("PUMP_EVENTS_RETENTION_DAYS", "365"))
+    alerts_retention_days: int = int(os.getenv("ALERTS_RETENTION_DAYS", "90"))
+    hourly_rollups_retention_days: int = int(os.getenv("HOURLY_ROLLUPS_RETENTION_DAYS", "0"))
+    daily_rollups_retention_days: int = int(os.getenv("DAILY_ROLLUPS_RETENTION_DAYS", "0"))
+    ingest_batch_size: int = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+    ingest_flush_interval_sec: float = float(os.getenv("INGEST_FLUSH_INTERVAL_SEC", "1.0"))
+    ingest_max_pending: int = int(os.getenv("INGEST_MAX_PENDING", "50000"))
+    ingest_max_backoff_sec: float = float(os.getenv("INGEST_MAX_BACKOFF_SEC", "30"))
+    sensor_adcs: str = os.getenv("SENSOR_ADCS", "1:0x48")
+    sensor_samples: int = int(os.getenv("SENSOR_SAMPLES", "5"))
+    sensor_filter: str = os.getenv("SENSOR_FILTER", "median")
+    sensor_trim_fraction: float = float(os.getenv("SENSOR_TRIM_FRACTION", "0.2"))
+    sensor_ads_mode: str = os.getenv("SENSOR_ADS_MODE", "single")
+    ws_queue_size: int = int(os.getenv("WS_QUEUE_SIZE", "100"))
+    node_mode: str = os.getenv("NODE_MODE", "standalone")
+    node_id: str = os.getenv("NODE_ID", socket.gethostname())
+    aggregator_url: str = os.getenv("AGGREGATOR_URL", "http://localhost:8000")
+    sync_interval_sec: float = float(os.getenv("SYNC_INTERVAL_SEC", "30"))
+    sync_batch_size: int = int(os.getenv("SYNC_BATCH_SIZE", "5000"))
+    sync_timeout_sec: float = float(os.getenv("SYNC_TIMEOUT_SEC", "30"))
+    sync_max_backoff_sec: float = float(os.getenv("SYNC_MAX_BACKOFF_SEC", "300"))
+    simulation_seed: int = int(os.getenv("SIMULATION_SEED", "0"))
     simulate_sensors: bool = os.getenv("SIMULATE_SENSORS", "true").lower() == "true"
     simulate_pumps: bool = os.getenv(
         "SIMULATE_PUMPS",
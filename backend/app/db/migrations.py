@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.models import AlertEvent, Base, OutboxEntry, PumpEvent, Reading, SchemaVersion
+from app.services.rollups import backfill_rollups, rollups_missing
+from app.services.zone_state import backfill_zone_states
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[Engine], None]
+
+
+def current_version(engine: Engine) -> int:
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+    except OperationalError:
+        return 0
+
+
+def migrate(engine: Engine) -> int:
+    version = current_version(engine)
+    if version >= LATEST_VERSION:
+        return version
+
+    SchemaVersion.__table__.create(bind=engine, checkfirst=True)
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        migration.apply(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                insert(SchemaVersion).values(version=migration.version, name=migration.name)
+            )
+        version = migration.version
+    return version
+
+
+def _incremental_vacuum(engine: Engine) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        mode = connection.execute(text("PRAGMA auto_vacuum")).scalar()
+        if mode != 2:
+            connection.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            connection.execute(text("VACUUM"))
+
+
+def _create_tables(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
+
+
+def _zone_water_duration(engine: Engine) -> None:
+    with engine.begin() as connection:
+        if "water_duration_sec" not in _columns(connection, "zones"):
+            connection.execute(
+                text("ALTER TABLE zones ADD COLUMN water_duration_sec INTEGER NOT NULL DEFAULT 30")
+            )
+            connection.execute(text("UPDATE zones SET water_duration_sec = 30"))
+
+
+def _alert_acknowledgement(engine: Engine) -> None:
+    with engine.begin() as connection:
+        column_names = _columns(connection, "alert_events")
+        if "acknowledged" not in column_names:
+            connection.execute(
+                text("ALTER TABLE alert_events ADD COLUMN acknowledged BOOLEAN DEFAULT 0")
+            )
+        if "acknowledged_at" not in column_names:
+            connection.execute(
+                text("ALTER TABLE alert_events ADD COLUMN acknowledged_at DATETIME")
+            )
+
+
+def _reading_client_id(engine: Engine) -> None:
+    with engine.begin() as connection:
+        if "client_id" not in _columns(connection, "readings"):
+            connection.execute(text("ALTER TABLE readings ADD COLUMN client_id VARCHAR"))
+
+
+def _event_indexes(engine: Engine) -> None:
+    for model in (Reading, PumpEvent, AlertEvent):
+        for index in model.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _zone_state(engine: Engine) -> None:
+    with Session(bind=engine) as db:
+        backfill_zone_states(db)
+
+
+def _rollups(engine: Engine) -> None:
+    with Session(bind=engine) as db:
+        if rollups_missing(db):
+            backfill_rollups(db)
+
+
+def _outbox_autoincrement(engine: Engine) -> None:
+    with engine.begin() as connection:
+        sql = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'sync_outbox'")
+        ).scalar()
+        if sql is None or "AUTOINCREMENT" in sql.upper():
+            return
+        connection.execute(text("ALTER TABLE sync_outbox RENAME TO sync_outbox_old"))
+        OutboxEntry.__table__.create(bind=connection)
+        connection.execute(
+            text(
+                "INSERT INTO sync_outbox (id, topic, key, zone_id, payload, created_at)"
+                " SELECT id, topic, key, zone_id, payload, created_at FROM sync_outbox_old"
+            )
+        )
+        connection.execute(text("DROP TABLE sync_outbox_old"))
+
+
+def _columns(connection, table: str) -> set:
+    return {row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))}
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "incremental auto_vacuum", _incremental_vacuum),
+    Migration(2, "create tables", _create_tables),
+    Migration(3, "zones.water_duration_sec", _zone_water_duration),
+    Migration(4, "alert_events acknowledgement", _alert_acknowledgement),
+    Migration(5, "readings.client_id", _reading_client_id),
+    Migration(6, "event indexes", _event_indexes),
+    Migration(7, "zone_state backfill", _zone_state),
+    Migration(8, "reading rollups backfill", _rollups),
+    Migration(9, "sync_outbox autoincrement", _outbox_autoincrement),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    parent: Optional["QueryStats"] = None
+
+    @property
+    def time_ms(self) -> float:
+        return round(self.seconds * 1000, 2)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+class QueryProfiler:
+    def __init__(self, enabled: bool, slow_query_ms: float) -> None:
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+
+    def install(self, engine: Engine) -> None:
+        if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            return
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def current(self) -> Optional[QueryStats]:
+        return _current.get()
+
+    @contextmanager
+    def profile(self, name: Optional[str] = None) -> Iterator[Optional[QueryStats]]:
+        if not self.enabled:
+            yield None
+            return
+        stats = QueryStats(parent=_current.get())
+        token = _current.set(stats)
+        try:
+            yield stats
+        finally:
+            _current.reset(token)
+            if name is not None:
+                logger.info("%s ran %s queries in %s ms", name, stats.count, stats.time_ms)
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats = _current.get()
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+            stats = stats.parent
+        if self.enabled and elapsed * 1000 >= self.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms): %s\n%s",
+                elapsed * 1000,
+                statement,
+                _explain(conn, statement, parameters, executemany),
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _explain(conn, statement, parameters, executemany) -> str:
+    if conn.dialect.name != "sqlite" or executemany:
+        return ""
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return ""
+    explain = conn.connection.cursor()
+    try:
+        explain.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "\n".join(f"  {row[-1]}" for row in explain.fetchall())
+    except Exception as exc:
+        return f"  EXPLAIN failed: {exc}"
+    finally:
+        explain.close()
+
+
+profiler = QueryProfiler(settings.db_profiling, settings.slow_query_ms)
@@ -1,11 +1,90 @@
-from sqlalchemy import create_engine
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
-DATABASE_URL = "sqlite:///./waterpal.db"
+from app.config import settings
+from app.db.profiling import profiler
+
+
+def sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": -settings.sqlite_cache_size_kib,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "temp_store": "MEMORY",
+    }
+
+
+def async_url(url: str) -> str:
+    return url.replace("sqlite://", "sqlite+aiosqlite://", 1) if url.startswith("sqlite://") else url
+
+
+def make_engine(url: str, tuned: bool = True, **options) -> Engine:
+    engine = create_engine(url, **_engine_options(url, tuned, QueuePool, options))
+    if tuned:
+        _apply_pragmas(engine, url)
+    profiler.install(engine)
+    return engine
+
+
+def make_async_engine(url: str, tuned: bool = True, **options) -> AsyncEngine:
+    url = async_url(url)
+    engine = create_async_engine(
+        url, **_engine_options(url, tuned, AsyncAdaptedQueuePool, options)
+    )
+    if tuned:
+        _apply_pragmas(engine.sync_engine, url)
+    profiler.install(engine.sync_engine)
+    return engine
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+
+def _engine_options(url: str, tuned: bool, poolclass: type[Pool], options: dict) -> dict:
+    parsed = make_url(url)
+    defaults: dict = {}
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.get_driver_name() == "pysqlite":
+            defaults["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            return {**defaults, **options}
+        Path(parsed.database).parent.mkdir(parents=True, exist_ok=True)
+    if tuned and "poolclass" not in options:
+        defaults.update(
+            poolclass=poolclass,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_sec,
+        )
+    return {**defaults, **options}
+
+
+def _apply_pragmas(engine: Engine, url: str) -> None:
+    if make_url(url).get_backend_name() != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in sqlite_pragmas().items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+engine = make_engine(settings.database_url)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = make_async_engine(settings.database_url)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
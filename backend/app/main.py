@@ -1,14 +1,37 @@
-from fastapi import FastAPI, WebSocket
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
+from apscheduler.events import EVENT_JOB_SUBMITTED, JobSubmissionEvent
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from app.api.middleware import QueryProfilingMiddleware, RequestMetricsMiddleware
 from app.api.router import router as api_router
 from app.config import settings
 from app.db.init_db import init_db
+from app.db.profiling import profiler
 from app.db.session import SessionLocal, engine
-from app.services.monitoring import run_monitoring_cycle
+from app.services.broadcaster import Subscriber, broadcaster
+from app.services.cycle_executor import CycleExecutor
+from app.services.forecast import forecaster
+from app.services.ingest import ReadingIngestBuffer
+from app.services.recent_readings import recent_readings
+from app.services.metrics import SCHEDULER_LAG_SECONDS, registry
+from app.services.outbox import OutboxSyncer, http_sender
 from app.services.pump_controller import PumpController
+from app.services.pump_engine import PumpEngine
+from app.services.retention import run_retention
+from app.services.sampling import SamplingScheduler
 from app.services.sensor_manager import SensorManager
+from app.services.simulation import SoilSimulator
+from app.services.zone_cache import zone_cache
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="WaterPal API")
 
@@ -18,7 +41,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-Ms"],
 )
+if settings.response_gzip:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.gzip_min_size,
+        compresslevel=settings.gzip_level,
+    )
+app.add_middleware(QueryProfilingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 
 app.include_router(api_router)
 
@@ -26,44 +58,173 @@ app.include_router(api_router)
 @app.on_event("startup")
 def on_startup() -> None:
     init_db(engine)
-
-    app.state.sensor_manager = SensorManager()
-    app.state.pump_controller = PumpController()
+    db = SessionLocal()
+    try:
+        forecaster.warm(db)
+    finally:
+        db.close()
+    app.state.recent_readings_warm = recent_readings.start_warm(SessionLocal)
+
+    app.state.session_factory = SessionLocal
+    app.state.node_mode = settings.node_mode
+    app.state.simulator = SoilSimulator(gpio_channels=_pump_channels)
+    app.state.sensor_manager = SensorManager(simulator=app.state.simulator)
+    app.state.pump_controller = PumpController(app.state.simulator)
+    app.state.pump_engine = PumpEngine(app.state.pump_controller, SessionLocal)
+    app.state.pump_engine.start()
+    app.state.ingest_buffer = ReadingIngestBuffer(SessionLocal)
+    app.state.ingest_buffer.start()
+    app.state.cycle_executor = CycleExecutor(
+        SessionLocal, app.state.sensor_manager, app.state.pump_engine
+    )
+    app.state.cycle_executor.start()
+    app.state.sampling_scheduler = SamplingScheduler(
+        SessionLocal,
+        app.state.sensor_manager,
+        app.state.pump_engine,
+        executor=app.state.cycle_executor,
+    )
+    app.state.sampling_scheduler.start()
+    if settings.node_mode == "edge":
+        app.state.outbox_syncer = OutboxSyncer(SessionLocal, http_sender(settings.aggregator_url))
+        app.state.outbox_syncer.start()
 
     scheduler = BackgroundScheduler()
     scheduler.add_job(
-        _scheduled_cycle,
+        _scheduled_retention,
         "interval",
-        hours=settings.read_interval_hours,
-        id="monitoring-cycle",
+        hours=settings.retention_interval_hours,
+        id="retention",
         replace_existing=True,
     )
+    scheduler.add_listener(_record_scheduler_lag, EVENT_JOB_SUBMITTED)
     scheduler.start()
     app.state.scheduler = scheduler
 
 
+@app.on_event("startup")
+async def bind_broadcaster() -> None:
+    broadcaster.bind_loop(asyncio.get_running_loop())
+
+
 @app.on_event("shutdown")
 def on_shutdown() -> None:
     scheduler = getattr(app.state, "scheduler", None)
     if scheduler:
         scheduler.shutdown()
+    outbox_syncer = getattr(app.state, "outbox_syncer", None)
+    if outbox_syncer:
+        outbox_syncer.shutdown()
+    sampling_scheduler = getattr(app.state, "sampling_scheduler", None)
+    if sampling_scheduler:
+        sampling_scheduler.shutdown()
+    cycle_executor = getattr(app.state, "cycle_executor", None)
+    if cycle_executor:
+        cycle_executor.shutdown()
+    pump_engine = getattr(app.state, "pump_engine", None)
+    if pump_engine:
+        pump_engine.shutdown()
+    ingest_buffer = getattr(app.state, "ingest_buffer", None)
+    if ingest_buffer:
+        ingest_buffer.shutdown()
+    sensor_manager = getattr(app.state, "sensor_manager", None)
+    if sensor_manager:
+        sensor_manager.shutdown()
+
+
+def _scheduled_retention() -> None:
+    with profiler.profile("Retention job"):
+        report = run_retention(SessionLocal)
+    app.state.retention_report = report
+    logger.info(
+        "Retention pruned %s rows, reclaimed %s bytes",
+        report["rows_pruned"],
+        report["bytes_reclaimed"],
+    )
 
 
-def _scheduled_cycle() -> None:
+def _pump_channels() -> Dict[int, List[int]]:
     db = SessionLocal()
     try:
-        run_monitoring_cycle(db, app.state.sensor_manager, app.state.pump_controller)
+        channels: Dict[int, List[int]] = {}
+        for zone in zone_cache.all(db):
+            if zone.pump_gpio is not None:
+                channels.setdefault(zone.pump_gpio, []).append(zone.sensor_channel)
+        return channels
     finally:
         db.close()
 
 
+def _record_scheduler_lag(event: JobSubmissionEvent) -> None:
+    planned = event.scheduled_run_times[-1]
+    lag = (datetime.now(timezone.utc) - planned).total_seconds()
+    SCHEDULER_LAG_SECONDS.observe(max(0.0, lag), job=event.job_id)
+
+
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    return registry.render()
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    subscriber = broadcaster.subscribe(
+        zones=_parse_ids(websocket.query_params.get("zones")),
+        topics=_parse_list(websocket.query_params.get("topics")),
+    )
     await websocket.send_json({"message": "connected"})
-    await websocket.close()
+
+    sender = asyncio.create_task(_send_events(websocket, subscriber))
+    receiver = asyncio.create_task(_receive_filters(websocket, subscriber))
+    try:
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        broadcaster.unsubscribe(subscriber)
+        sender.cancel()
+        receiver.cancel()
+
+    if subscriber.dropped:
+        await websocket.close(code=1013, reason="Slow consumer")
+
+
+async def _send_events(websocket: WebSocket, subscriber: Subscriber) -> None:
+    while True:
+        event = await subscriber.queue.get()
+        if event is None:
+            return
+        await websocket.send_json(event)
+
+
+async def _receive_filters(websocket: WebSocket, subscriber: Subscriber) -> None:
+    try:
+        while True:
+            message = await websocket.receive_json()
+            if message.get("action") == "subscribe":
+                subscriber.update(message.get("zones"), message.get("topics"))
+                await websocket.send_json(
+                    {
+                        "message": "subscribed",
+                        "zones": sorted(subscriber.zones) if subscriber.zones else None,
+                        "topics": sorted(subscriber.topics),
+                    }
+                )
+    except WebSocketDisconnect:
+        return
+
+
+def _parse_ids(value: Optional[str]) -> Optional[List[int]]:
+    if not value:
+        return None
+    return [int(item) for item in value.split(",") if item.strip().isdigit()]
+
+
+def _parse_list(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
@@ -1,3 +1,31 @@
-from .models import Base, Zone, Reading, PumpEvent, AlertEvent
+from .models import (
+    AlertEvent,
+    Base,
+    FleetEvent,
+    FleetNode,
+    FleetZoneState,
+    OutboxEntry,
+    PumpEvent,
+    Reading,
+    ReadingRollupDaily,
+    ReadingRollupHourly,
+    SchemaVersion,
+    Zone,
+    ZoneState,
+)
 
-__all__ = ["Base", "Zone", "Reading", "PumpEvent", "AlertEvent"]
+__all__ = [
+    "Base",
+    "Zone",
+    "Reading",
+    "PumpEvent",
+    "AlertEvent",
+    "ZoneState",
+    "ReadingRollupHourly",
+    "ReadingRollupDaily",
+    "OutboxEntry",
+    "FleetNode",
+    "FleetEvent",
+    "FleetZoneState",
+    "SchemaVersion",
+]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -21,6 +21,12 @@ class Zone(Base):
     readings = relationship("Reading", back_populates="zone")
     pump_events = relationship("PumpEvent", back_populates="zone")
     alert_events = relationship("AlertEvent", back_populates="zone")
+    state = relationship(
+        "ZoneState",
+        back_populates="zone",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
 
 class Reading(Base):
@@ -30,9 +36,16 @@ class Reading(Base):
     zone_id = Column(Integer, ForeignKey("zones.id"))
     value = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    client_id = Column(String, nullable=True)
 
     zone = relationship("Zone", back_populates="readings")
 
+    __table_args__ = (
+        Index("ix_readings_zone_created", "zone_id", "created_at"),
+        Index("ix_readings_created_id", "created_at", "id"),
+        Index("ix_readings_client_id", "client_id", unique=True),
+    )
+
 
 class PumpEvent(Base):
     __tablename__ = "pump_events"
@@ -46,6 +59,11 @@ class PumpEvent(Base):
 
     zone = relationship("Zone", back_populates="pump_events")
 
+    __table_args__ = (
+        Index("ix_pump_events_zone_created", "zone_id", "created_at"),
+        Index("ix_pump_events_created_id", "created_at", "id"),
+    )
+
 
 class AlertEvent(Base):
     __tablename__ = "alert_events"
@@ -59,3 +77,115 @@ class AlertEvent(Base):
     acknowledged_at = Column(DateTime, nullable=True)
 
     zone = relationship("Zone", back_populates="alert_events")
+
+    __table_args__ = (
+        Index("ix_alert_events_zone_created", "zone_id", "created_at"),
+        Index("ix_alert_events_type_created", "alert_type", "created_at"),
+        Index("ix_alert_events_created_id", "created_at", "id"),
+    )
+
+
+class ZoneState(Base):
+    __tablename__ = "zone_state"
+
+    zone_id = Column(Integer, ForeignKey("zones.id"), primary_key=True)
+    latest_reading_id = Column(Integer, ForeignKey("readings.id"), nullable=True)
+    latest_value = Column(Integer, nullable=True)
+    latest_reading_at = Column(DateTime, nullable=True)
+    last_pump_event_id = Column(Integer, ForeignKey("pump_events.id"), nullable=True)
+    last_pump_at = Column(DateTime, nullable=True)
+    water_cooldown_until = Column(DateTime, nullable=True)
+    last_low_moisture_alert_id = Column(Integer, ForeignKey("alert_events.id"), nullable=True)
+    last_low_moisture_alert_at = Column(DateTime, nullable=True)
+    low_moisture_cooldown_until = Column(DateTime, nullable=True)
+    last_pump_failed_alert_id = Column(Integer, ForeignKey("alert_events.id"), nullable=True)
+    last_pump_failed_alert_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    zone = relationship("Zone", back_populates="state")
+    latest_reading = relationship("Reading", foreign_keys=[latest_reading_id])
+    last_pump_event = relationship("PumpEvent", foreign_keys=[last_pump_event_id])
+
+
+class ReadingRollupMixin:
+    zone_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Integer, nullable=False, default=0)
+    min_value = Column(Integer, nullable=False)
+    max_value = Column(Integer, nullable=False)
+
+
+class ReadingRollupHourly(ReadingRollupMixin, Base):
+    __tablename__ = "reading_rollups_hourly"
+
+    __table_args__ = (Index("ix_reading_rollups_hourly_bucket", "bucket_start"),)
+
+
+class ReadingRollupDaily(ReadingRollupMixin, Base):
+    __tablename__ = "reading_rollups_daily"
+
+    __table_args__ = (Index("ix_reading_rollups_daily_bucket", "bucket_start"),)
+
+
+class OutboxEntry(Base):
+    __tablename__ = "sync_outbox"
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    zone_id = Column(Integer, nullable=True)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+class FleetNode(Base):
+    __tablename__ = "fleet_nodes"
+
+    node_id = Column(String, primary_key=True)
+    last_seen_at = Column(DateTime, nullable=True)
+    last_seq = Column(Integer, nullable=False, default=0)
+    events_total = Column(Integer, nullable=False, default=0)
+    duplicates_total = Column(Integer, nullable=False, default=0)
+
+
+class FleetEvent(Base):
+    __tablename__ = "fleet_events"
+
+    id = Column(Integer, primary_key=True)
+    node_id = Column(String, nullable=False)
+    topic = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    zone_id = Column(Integer, nullable=True)
+    value = Column(Integer, nullable=True)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=True)
+    received_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_fleet_events_node_key", "node_id", "key", unique=True),
+        Index("ix_fleet_events_node_zone_created", "node_id", "zone_id", "created_at"),
+    )
+
+
+class FleetZoneState(Base):
+    __tablename__ = "fleet_zone_state"
+
+    node_id = Column(String, primary_key=True)
+    zone_id = Column(Integer, primary_key=True)
+    zone_name = Column(String, nullable=True)
+    latest_value = Column(Integer, nullable=True)
+    latest_reading_at = Column(DateTime, nullable=True)
+    last_pump_at = Column(DateTime, nullable=True)
+    last_alert_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
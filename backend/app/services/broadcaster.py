@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+
+from app.config import settings
+
+TOPICS = ("readings", "pump_events", "pump_jobs", "alerts")
+
+
+class Subscriber:
+    def __init__(
+        self,
+        queue_size: int,
+        zones: Optional[Iterable[int]] = None,
+        topics: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.zones: Optional[Set[int]] = None
+        self.topics: Set[str] = set(TOPICS)
+        self.dropped = False
+        self.update(zones, topics)
+
+    def update(
+        self,
+        zones: Optional[Iterable[int]] = None,
+        topics: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.zones = set(zones) if zones else None
+        self.topics = set(topics) & set(TOPICS) if topics else set(TOPICS)
+
+    def wants(self, topic: str, zone_id: Optional[int]) -> bool:
+        if topic not in self.topics:
+            return False
+        return self.zones is None or zone_id is None or zone_id in self.zones
+
+
+class Broadcaster:
+    def __init__(self, queue_size: Optional[int] = None) -> None:
+        self._queue_size = queue_size or settings.ws_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[Subscriber] = set()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"published": 0, "delivered": 0, "slow_consumers_dropped": 0}
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def subscribe(
+        self,
+        zones: Optional[Iterable[int]] = None,
+        topics: Optional[Iterable[str]] = None,
+    ) -> Subscriber:
+        subscriber = Subscriber(self._queue_size, zones, topics)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, topic: str, zone_id: Optional[int], data: dict) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._lock:
+            self._stats["published"] += 1
+        event = {"topic": topic, "zone_id": zone_id, "data": data}
+        try:
+            loop.call_soon_threadsafe(self._fan_out, event)
+        except RuntimeError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "subscribers": len(self._subscribers)}
+
+    def _fan_out(self, event: dict) -> None:
+        delivered = 0
+        dropped = 0
+        for subscriber in list(self._subscribers):
+            if subscriber.dropped or not subscriber.wants(event["topic"], event["zone_id"]):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+                dropped += 1
+        with self._lock:
+            self._stats["delivered"] += delivered
+            self._stats["slow_consumers_dropped"] += dropped
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        subscriber.dropped = True
+        self._subscribers.discard(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+
+def serialize(row) -> dict:
+    if is_dataclass(row):
+        items = asdict(row).items()
+    else:
+        items = ((column.key, getattr(row, column.key)) for column in row.__table__.columns)
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value for key, value in items
+    }
+
+
+broadcaster = Broadcaster()
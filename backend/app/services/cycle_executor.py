@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.profiling import profiler
+from app.services.metrics import CYCLE_TRIGGERS
+from app.services.monitoring import run_monitoring_cycle
+from app.services.pump_engine import PumpEngine
+from app.services.sensor_manager import SensorManager
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_RUNS = 200
+
+
+@dataclass
+class CycleRun:
+    id: str
+    zone_ids: Optional[List[int]]
+    sources: List[str]
+    triggers: int = 1
+    status: str = "queued"
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+    queries: Optional[int] = None
+    result: Optional[Dict[str, int]] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+
+class CycleExecutor:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        sensor_manager: SensorManager,
+        pump_engine: PumpEngine,
+        now: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        self._session_factory = session_factory
+        self._sensor_manager = sensor_manager
+        self._pump_engine = pump_engine
+        self._now = now
+        self._cond = threading.Condition()
+        self._execute_lock = threading.Lock()
+        self._running: Optional[CycleRun] = None
+        self._pending: Optional[CycleRun] = None
+        self._runs: "OrderedDict[str, CycleRun]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._stats = {"runs": 0, "failed": 0, "triggers": 0, "coalesced": 0}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="cycle-executor", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+        with self._cond:
+            pending, self._pending = self._pending, None
+            if pending is not None:
+                pending.status = "cancelled"
+                pending.finished_at = self._now()
+        if pending is not None:
+            pending.done.set()
+
+    def trigger(self, zone_ids: Optional[List[int]] = None, source: str = "manual") -> CycleRun:
+        wanted = None if zone_ids is None else sorted(set(zone_ids))
+        with self._cond:
+            self._stats["triggers"] += 1
+            running = self._running
+            if running is not None and _covers(running.zone_ids, wanted):
+                return self._coalesce(running, source, "running")
+            pending = self._pending
+            if pending is not None:
+                if pending.zone_ids is not None:
+                    pending.zone_ids = (
+                        None if wanted is None else sorted(set(pending.zone_ids) | set(wanted))
+                    )
+                return self._coalesce(pending, source, "pending")
+
+            run = CycleRun(
+                id=uuid.uuid4().hex, zone_ids=wanted, sources=[source], queued_at=self._now()
+            )
+            self._pending = run
+            self._runs[run.id] = run
+            self._trim()
+            self._cond.notify_all()
+        CYCLE_TRIGGERS.inc(source=source, outcome="started")
+        return run
+
+    def run(
+        self,
+        zone_ids: Optional[List[int]] = None,
+        source: str = "manual",
+        timeout: Optional[float] = None,
+    ) -> CycleRun:
+        run = self.trigger(zone_ids, source)
+        if self._thread is None:
+            self.drain()
+        return self.wait(run.id, timeout) or run
+
+    def wait(self, run_id: str, timeout: Optional[float] = None) -> Optional[CycleRun]:
+        with self._cond:
+            run = self._runs.get(run_id)
+        if run is None:
+            return None
+        run.done.wait(timeout)
+        return self.get(run_id)
+
+    def get(self, run_id: str) -> Optional[CycleRun]:
+        with self._cond:
+            run = self._runs.get(run_id)
+            return replace(run) if run is not None else None
+
+    def runs(self) -> List[CycleRun]:
+        with self._cond:
+            return [replace(run) for run in reversed(self._runs.values())]
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            durations = sorted(
+                run.duration_ms for run in self._runs.values() if run.duration_ms is not None
+            )
+            return {
+                **self._stats,
+                "in_flight": self._running.id if self._running else None,
+                "pending": self._pending.id if self._pending else None,
+                "p50_ms": _percentile(durations, 0.5),
+                "p95_ms": _percentile(durations, 0.95),
+                "max_ms": durations[-1] if durations else None,
+            }
+
+    def drain(self) -> int:
+        executed = 0
+        while self._execute_next():
+            executed += 1
+        return executed
+
+    def _coalesce(self, run: CycleRun, source: str, outcome: str) -> CycleRun:
+        run.triggers += 1
+        if source not in run.sources:
+            run.sources.append(source)
+        self._stats["coalesced"] += 1
+        CYCLE_TRIGGERS.inc(source=source, outcome=outcome)
+        return run
+
+    def _execute_next(self) -> bool:
+        with self._execute_lock:
+            with self._cond:
+                run = self._pending
+                if run is None:
+                    return False
+                self._pending = None
+                self._running = run
+                run.status = "running"
+                run.started_at = self._now()
+
+            started = time.perf_counter()
+            result, error, stats = None, "cycle interrupted", None
+            try:
+                db = self._session_factory()
+                try:
+                    with profiler.profile("Monitoring cycle") as stats:
+                        result = run_monitoring_cycle(
+                            db,
+                            self._sensor_manager,
+                            self._pump_engine,
+                            run.zone_ids,
+                            run.started_at,
+                        )
+                except Exception:
+                    db.rollback()
+                    raise
+                finally:
+                    db.close()
+                error = None
+            except Exception as exc:
+                logger.exception("Monitoring cycle %s failed", run.id)
+                error = str(exc)
+            finally:
+                with self._cond:
+                    run.status = "failed" if error is not None else "completed"
+                    run.result = result
+                    run.error = error
+                    run.finished_at = self._now()
+                    run.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+                    run.queries = stats.count if stats is not None else None
+                    self._stats["runs"] += 1
+                    self._stats["failed"] += error is not None
+                    self._running = None
+                    self._cond.notify_all()
+                run.done.set()
+            return True
+
+    def _trim(self) -> None:
+        while len(self._runs) > MAX_FINISHED_RUNS:
+            oldest_id = next(iter(self._runs))
+            if self._runs[oldest_id].finished_at is None:
+                break
+            self._runs.popitem(last=False)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Cycle executor failed to drain")
+
+
+def _covers(running: Optional[List[int]], wanted: Optional[List[int]]) -> bool:
+    if running is None:
+        return True
+    return wanted is not None and set(wanted) <= set(running)
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * fraction))]
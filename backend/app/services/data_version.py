@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import settings
+
+
+class DataVersion:
+    def __init__(self, max_bodies: Optional[int] = None) -> None:
+        if max_bodies is None:
+            max_bodies = settings.response_cache_entries
+        self.max_bodies = max(0, max_bodies)
+        self._epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._version = 0
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def current(self) -> int:
+        return self._version
+
+    def bump(self) -> int:
+        with self._lock:
+            self._version += 1
+            self._bodies.clear()
+            return self._version
+
+    def etag(self, version: int) -> str:
+        return f'W/"{self._epoch}-{version}"'
+
+    def matches(self, if_none_match: Optional[str], version: int) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        etag = self.etag(version)
+        return "*" in tags or etag in tags or etag[2:] in tags
+
+    def body(self, key: str, version: int) -> Optional[bytes]:
+        with self._lock:
+            body = self._bodies.get(key) if version == self._version else None
+            if body is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._bodies.move_to_end(key)
+            return body
+
+    def store(self, key: str, version: int, body: bytes) -> None:
+        with self._lock:
+            if version != self._version or not self.max_bodies:
+                return
+            self._bodies[key] = body
+            self._bodies.move_to_end(key)
+            while len(self._bodies) > self.max_bodies:
+                self._bodies.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._bodies.clear()
+            self._hits = self._misses = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "version": self._version,
+                "etag": self.etag(self._version),
+                "bodies": len(self._bodies),
+                "bytes": sum(len(body) for body in self._bodies.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+data_version = DataVersion()
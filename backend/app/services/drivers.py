@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from types import ModuleType
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loaded: Dict[str, Optional[ModuleType]] = {}
+
+
+def load_driver(name: str) -> Optional[ModuleType]:
+    with _lock:
+        if name not in _loaded:
+            try:
+                _loaded[name] = importlib.import_module(name)
+            except Exception as exc:
+                logger.info("Hardware driver %s unavailable: %s", name, exc)
+                _loaded[name] = None
+        return _loaded[name]
+
+
+def loaded_drivers() -> Dict[str, bool]:
+    with _lock:
+        return {name: module is not None for name, module in _loaded.items()}
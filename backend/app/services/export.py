@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterator, List, Sequence
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    stmt: Select,
+    fmt: str,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        columns = list(result.keys())
+        if fmt == "csv":
+            yield _csv_lines([columns])
+        for batch in result.partitions():
+            if fmt == "csv":
+                yield _csv_lines([[_csv_value(value) for value in row] for row in batch])
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+                    for row in batch
+                )
+    finally:
+        db.close()
+
+
+def _csv_lines(rows: List[Sequence[object]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+def _csv_value(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: object) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models import FleetEvent, FleetNode, FleetZoneState
+
+LOOKUP_CHUNK = 500
+
+_write_lock = threading.Lock()
+
+
+def apply_sync_batch(db: Session, node_id: str, zones: List[dict], events: List[dict]) -> dict:
+    with _write_lock:
+        return _apply(db, node_id, zones, events)
+
+
+def _apply(db: Session, node_id: str, zones: List[dict], events: List[dict]) -> dict:
+    existing = set()
+    keys = [event["key"] for event in events]
+    for offset in range(0, len(keys), LOOKUP_CHUNK):
+        chunk = keys[offset : offset + LOOKUP_CHUNK]
+        existing.update(
+            db.scalars(
+                select(FleetEvent.key).where(
+                    FleetEvent.node_id == node_id, FleetEvent.key.in_(chunk)
+                )
+            )
+        )
+
+    fresh: Dict[str, dict] = {}
+    for event in events:
+        if event["key"] not in existing:
+            fresh.setdefault(event["key"], event)
+
+    if fresh:
+        db.execute(
+            insert(FleetEvent),
+            [
+                {
+                    "node_id": node_id,
+                    "topic": event["topic"],
+                    "key": event["key"],
+                    "zone_id": event["zone_id"],
+                    "value": event["data"].get("value") if event["topic"] == "readings" else None,
+                    "payload": json.dumps(event["data"]),
+                    "created_at": _parse_time(event["data"].get("created_at")),
+                }
+                for event in fresh.values()
+            ],
+        )
+    _update_zone_states(db, node_id, zones, fresh.values())
+
+    node = db.get(FleetNode, node_id)
+    if node is None:
+        node = FleetNode(node_id=node_id, last_seq=0, events_total=0, duplicates_total=0)
+        db.add(node)
+    acked = max((event["seq"] for event in events), default=0)
+    node.last_seen_at = datetime.utcnow()
+    if events:
+        node.last_seq = acked
+    node.events_total = (node.events_total or 0) + len(fresh)
+    node.duplicates_total = (node.duplicates_total or 0) + len(events) - len(fresh)
+    db.commit()
+    return {"acked_seq": acked, "inserted": len(fresh), "duplicates": len(events) - len(fresh)}
+
+
+def fleet_status(db: Session) -> List[dict]:
+    states: Dict[str, List[FleetZoneState]] = {}
+    for state in db.scalars(
+        select(FleetZoneState).order_by(FleetZoneState.node_id, FleetZoneState.zone_id)
+    ):
+        states.setdefault(state.node_id, []).append(state)
+    return [
+        {
+            "node_id": node.node_id,
+            "last_seen_at": node.last_seen_at,
+            "last_seq": node.last_seq,
+            "events_total": node.events_total,
+            "duplicates_total": node.duplicates_total,
+            "zones": states.get(node.node_id, []),
+        }
+        for node in db.scalars(select(FleetNode).order_by(FleetNode.node_id))
+    ]
+
+
+def _update_zone_states(
+    db: Session, node_id: str, zones: List[dict], events: Iterable[dict]
+) -> None:
+    states = {
+        state.zone_id: state
+        for state in db.scalars(select(FleetZoneState).where(FleetZoneState.node_id == node_id))
+    }
+
+    def state_for(zone_id: int) -> FleetZoneState:
+        state = states.get(zone_id)
+        if state is None:
+            state = FleetZoneState(node_id=node_id, zone_id=zone_id)
+            db.add(state)
+            states[zone_id] = state
+        return state
+
+    for zone in zones:
+        state_for(zone["id"]).zone_name = zone["name"]
+
+    for event in events:
+        if event["zone_id"] is None:
+            continue
+        state = state_for(event["zone_id"])
+        created_at = _parse_time(event["data"].get("created_at"))
+        if created_at is None:
+            continue
+        if event["topic"] == "readings":
+            if state.latest_reading_at is None or created_at >= state.latest_reading_at:
+                state.latest_reading_at = created_at
+                state.latest_value = event["data"].get("value")
+        elif event["topic"] == "pump_events":
+            state.last_pump_at = _latest(state.last_pump_at, created_at)
+        elif event["topic"] == "alerts":
+            state.last_alert_at = _latest(state.last_alert_at, created_at)
+
+
+def _latest(current: Optional[datetime], value: datetime) -> datetime:
+    return value if current is None or value > current else current
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromisoformat(value)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Reading
+
+Sample = Tuple[int, int, datetime]
+
+MIN_SLOPE = 1e-3
+MAX_HORIZON_HOURS = 24 * 365
+
+_FIELDS = ("weight", "sum_t", "sum_v", "sum_tt", "sum_tv", "last_t", "last_v")
+
+
+@dataclass(frozen=True)
+class ZoneForecast:
+    zone_id: int
+    samples: int
+    drying_rate_per_hour: Optional[float]
+    predicted_value: Optional[float]
+    hours_to_threshold: Optional[float]
+    threshold_at: Optional[datetime]
+
+
+class DryingForecaster:
+    def __init__(
+        self,
+        window_hours: Optional[float] = None,
+        reset_jump: Optional[int] = None,
+        min_samples: Optional[int] = None,
+    ) -> None:
+        self._tau = window_hours or settings.forecast_window_hours
+        self._reset_jump = reset_jump or settings.forecast_reset_jump
+        self._min_samples = min_samples or settings.forecast_min_samples
+        self._lock = threading.Lock()
+        self._origin: Optional[datetime] = None
+        self._slots: Dict[int, int] = {}
+        self._count = np.zeros(0, dtype=np.int64)
+        self._stats = {name: np.zeros(0) for name in _FIELDS}
+
+    def observe(self, zone_id: int, value: int, created_at: datetime) -> None:
+        self.observe_many([(zone_id, value, created_at)])
+
+    def observe_many(self, samples: Iterable[Sample]) -> None:
+        samples = sorted(samples, key=lambda sample: sample[2])
+        if not samples:
+            return
+        with self._lock:
+            if self._origin is None:
+                self._origin = samples[0][2]
+            slots = np.fromiter((self._slot(zone_id) for zone_id, _, _ in samples), np.int64)
+            values = np.fromiter((value for _, value, _ in samples), np.float64)
+            hours = np.fromiter(
+                (self._hours(created_at) for _, _, created_at in samples), np.float64
+            )
+
+            pending = np.arange(len(samples))
+            while pending.size:
+                _, first = np.unique(slots[pending], return_index=True)
+                batch = pending[first]
+                self._update(slots[batch], values[batch], hours[batch])
+                pending = np.delete(pending, first)
+
+    def reset(self, zone_id: int) -> None:
+        with self._lock:
+            slot = self._slots.get(zone_id)
+            if slot is None:
+                return
+            self._count[slot] = 0
+            for name in _FIELDS:
+                self._stats[name][slot] = 0.0
+
+    def forecast_many(
+        self, zones: Sequence[Tuple[int, int]], now: Optional[datetime] = None
+    ) -> List[ZoneForecast]:
+        now = now or datetime.utcnow()
+        with self._lock:
+            known = [(zone_id, threshold) for zone_id, threshold in zones if zone_id in self._slots]
+            if not known or self._origin is None:
+                return [ZoneForecast(zone_id, 0, None, None, None, None) for zone_id, _ in zones]
+            slots = np.fromiter((self._slots[zone_id] for zone_id, _ in known), np.int64)
+            thresholds = np.fromiter((threshold for _, threshold in known), np.float64)
+            count = self._count[slots]
+            weight, sum_t, sum_v, sum_tt, sum_tv = (
+                self._stats[name][slots] for name in _FIELDS[:5]
+            )
+            now_t = self._hours(now)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = weight * sum_tt - sum_t**2
+            fitted = (count >= self._min_samples) & (denom > 1e-9 * np.maximum(weight, 1) ** 2)
+            slope = np.where(fitted, (weight * sum_tv - sum_t * sum_v) / denom, np.nan)
+            predicted = sum_v / weight + slope * (now_t - sum_t / weight)
+            hours = np.where(
+                slope < -MIN_SLOPE,
+                np.maximum(0.0, (predicted - thresholds) / -slope),
+                np.where(predicted <= thresholds, 0.0, np.inf),
+            )
+
+        by_zone = {}
+        for index, (zone_id, _) in enumerate(known):
+            if not fitted[index]:
+                by_zone[zone_id] = ZoneForecast(zone_id, int(count[index]), None, None, None, None)
+                continue
+            remaining = float(hours[index])
+            finite = remaining <= MAX_HORIZON_HOURS
+            by_zone[zone_id] = ZoneForecast(
+                zone_id=zone_id,
+                samples=int(count[index]),
+                drying_rate_per_hour=round(float(-slope[index]), 3),
+                predicted_value=round(float(predicted[index]), 1),
+                hours_to_threshold=round(remaining, 3) if finite else None,
+                threshold_at=now + timedelta(hours=remaining) if finite else None,
+            )
+        return [
+            by_zone.get(zone_id) or ZoneForecast(zone_id, 0, None, None, None, None)
+            for zone_id, _ in zones
+        ]
+
+    def forecast(
+        self, zone_id: int, threshold: int, now: Optional[datetime] = None
+    ) -> ZoneForecast:
+        return self.forecast_many([(zone_id, threshold)], now)[0]
+
+    def warm(self, db: Session, hours: Optional[float] = None) -> int:
+        since = datetime.utcnow() - timedelta(hours=hours or 2 * self._tau)
+        rows = db.execute(
+            select(Reading.zone_id, Reading.value, Reading.created_at)
+            .where(Reading.created_at >= since, Reading.zone_id.is_not(None))
+            .order_by(Reading.created_at)
+        ).all()
+        self.observe_many(rows)
+        return len(rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._origin = None
+            self._slots = {}
+            self._count = np.zeros(0, dtype=np.int64)
+            self._stats = {name: np.zeros(0) for name in _FIELDS}
+
+    def _slot(self, zone_id: int) -> int:
+        slot = self._slots.get(zone_id)
+        if slot is None:
+            slot = self._slots[zone_id] = len(self._slots)
+            if slot >= self._count.size:
+                capacity = max(64, 2 * self._count.size)
+                self._count = np.resize(self._count, capacity)
+                self._count[slot:] = 0
+                for name in _FIELDS:
+                    grown = np.zeros(capacity)
+                    grown[: self._stats[name].size] = self._stats[name]
+                    self._stats[name] = grown
+        return slot
+
+    def _hours(self, value: datetime) -> float:
+        return (value - self._origin).total_seconds() / 3600
+
+    def _update(self, slots: np.ndarray, values: np.ndarray, hours: np.ndarray) -> None:
+        stats = self._stats
+        seen = self._count[slots] > 0
+        current = ~seen | (hours >= stats["last_t"][slots])
+        slots, values, hours, seen = slots[current], values[current], hours[current], seen[current]
+
+        jumped = seen & (values - stats["last_v"][slots] > self._reset_jump)
+        decay = np.where(
+            seen & ~jumped, np.exp(-(hours - stats["last_t"][slots]) / self._tau), 0.0
+        )
+        stats["weight"][slots] = stats["weight"][slots] * decay + 1.0
+        stats["sum_t"][slots] = stats["sum_t"][slots] * decay + hours
+        stats["sum_v"][slots] = stats["sum_v"][slots] * decay + values
+        stats["sum_tt"][slots] = stats["sum_tt"][slots] * decay + hours**2
+        stats["sum_tv"][slots] = stats["sum_tv"][slots] * decay + hours * values
+        stats["last_t"][slots] = hours
+        stats["last_v"][slots] = values
+        self._count[slots] = np.where(jumped, 1, self._count[slots] + 1)
+
+
+forecaster = DryingForecaster()
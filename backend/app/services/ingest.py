@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Reading
+from app.services.data_version import data_version
+from app.services.forecast import forecaster
+from app.services.outbox import outbox
+from app.services.recent_readings import recent_readings
+from app.services.rollups import apply_readings
+from app.services.zone_cache import zone_cache
+from app.services.zone_state import ensure_state, load_states
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_CHUNK = 500
+
+
+class IngestBufferFull(Exception):
+    pass
+
+
+@dataclass
+class PendingReading:
+    client_id: str
+    zone_id: int
+    value: int
+    created_at: datetime
+
+
+class ReadingIngestBuffer:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: Optional[int] = None,
+        flush_interval_sec: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        max_backoff_sec: Optional[float] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size or settings.ingest_batch_size
+        self._flush_interval_sec = flush_interval_sec or settings.ingest_flush_interval_sec
+        self._max_pending = max_pending or settings.ingest_max_pending
+        self._max_backoff_sec = max_backoff_sec or settings.ingest_max_backoff_sec
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: Deque[PendingReading] = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._failures = 0
+        self._stats: Dict[str, object] = {
+            "submitted": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "rejected": 0,
+            "batches": 0,
+            "failures": 0,
+            "last_flush_ms": 0.0,
+            "last_error": None,
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="reading-ingest", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+    def submit(self, readings: List[PendingReading]) -> int:
+        with self._cond:
+            if len(self._pending) + len(readings) > self._max_pending:
+                raise IngestBufferFull()
+            self._pending.extend(readings)
+            self._stats["submitted"] += len(readings)
+            if len(self._pending) >= self._batch_size:
+                self._cond.notify_all()
+            return len(self._pending)
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending), "backoff_sec": self._backoff()}
+
+    def flush(self) -> int:
+        inserted = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = [
+                        self._pending.popleft()
+                        for _ in range(min(self._batch_size, len(self._pending)))
+                    ]
+                if not batch:
+                    return inserted
+                try:
+                    inserted += self._write_batch(batch)
+                except Exception as exc:
+                    with self._cond:
+                        self._pending.extendleft(reversed(batch))
+                        self._failures += 1
+                        self._stats["failures"] += 1
+                        self._stats["last_error"] = str(exc)
+                    raise
+                with self._cond:
+                    self._failures = 0
+
+    def _backoff(self) -> float:
+        if not self._failures:
+            return self._flush_interval_sec
+        return min(
+            self._max_backoff_sec, self._flush_interval_sec * 2 ** min(self._failures, 16)
+        )
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                if self._failures or len(self._pending) < self._batch_size:
+                    self._cond.wait(timeout=self._backoff())
+                if self._stopped:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush reading ingest buffer")
+
+    def _write_batch(self, batch: List[PendingReading]) -> int:
+        started = time.perf_counter()
+        unique: Dict[str, PendingReading] = {}
+        for item in batch:
+            unique.setdefault(item.client_id, item)
+        duplicates = len(batch) - len(unique)
+
+        db = self._session_factory()
+        try:
+            client_ids = list(unique)
+            for offset in range(0, len(client_ids), LOOKUP_CHUNK):
+                chunk = client_ids[offset : offset + LOOKUP_CHUNK]
+                existing = db.execute(
+                    select(Reading.client_id).where(Reading.client_id.in_(chunk))
+                ).scalars()
+                for client_id in existing:
+                    unique.pop(client_id, None)
+                    duplicates += 1
+
+            rows = [
+                item for item in unique.values() if zone_cache.get(db, item.zone_id) is not None
+            ]
+            rejected = len(unique) - len(rows)
+
+            ids: Dict[str, int] = {}
+            if rows:
+                inserted = db.execute(
+                    insert(Reading).returning(Reading.client_id, Reading.id),
+                    [
+                        {
+                            "client_id": row.client_id,
+                            "zone_id": row.zone_id,
+                            "value": row.value,
+                            "created_at": row.created_at,
+                        }
+                        for row in rows
+                    ],
+                )
+                ids = dict(inserted.all())
+                apply_readings(db, [(row.zone_id, row.value, row.created_at) for row in rows])
+                _update_zone_states(db, rows, ids)
+                outbox.record_many(db, [("readings", row.zone_id, asdict(row)) for row in rows])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        if rows:
+            data_version.bump()
+        forecaster.observe_many((row.zone_id, row.value, row.created_at) for row in rows)
+        recent_readings.append_many(
+            (row.zone_id, ids[row.client_id], row.value, row.created_at) for row in rows
+        )
+
+        with self._cond:
+            self._stats["inserted"] += len(rows)
+            self._stats["duplicates"] += duplicates
+            self._stats["rejected"] += rejected
+            self._stats["batches"] += 1
+            self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return len(rows)
+
+
+def _update_zone_states(db: Session, rows: List[PendingReading], ids: Dict[str, int]) -> None:
+    latest: Dict[int, PendingReading] = {}
+    for row in rows:
+        current = latest.get(row.zone_id)
+        if current is None or row.created_at >= current.created_at:
+            latest[row.zone_id] = row
+
+    states = load_states(db, latest)
+    newer = {
+        zone_id: row
+        for zone_id, row in latest.items()
+        if zone_id not in states
+        or states[zone_id].latest_reading_at is None
+        or row.created_at >= states[zone_id].latest_reading_at
+    }
+    for zone_id, row in newer.items():
+        state = ensure_state(db, states, zone_id)
+        state.latest_reading_id = ids[row.client_id]
+        state.latest_value = row.value
+        state.latest_reading_at = row.created_at
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _key(self.labels, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_key(self.labels, labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines += [
+            f"{self.name}{_format_labels(self.labels, key)} {_number(value)}"
+            for key, value in values
+        ]
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _key(self.labels, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(_key(self.labels, labels))
+            return int(series[-1]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, values in series:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                labels = _format_labels(self.labels + ("le",), key + (_bound(bound),))
+                lines.append(f"{self.name}_bucket{labels} {_number(cumulative)}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_number(values[-2])}")
+            lines.append(f"{self.name}_count{labels} {_number(values[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[Counter | Histogram] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, help_text, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+def _key(names: Tuple[str, ...], labels: Dict[str, object]) -> Tuple[str, ...]:
+    return tuple(str(labels.get(name, "")) for name in names)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == float("inf") else _number(value)
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+registry = Registry()
+
+CYCLE_SECONDS = registry.histogram(
+    "waterpal_cycle_duration_seconds", "Duration of run_monitoring_cycle."
+)
+CYCLE_ZONES = registry.counter(
+    "waterpal_cycle_zones_total", "Zones processed by run_monitoring_cycle."
+)
+CYCLE_TRIGGERS = registry.counter(
+    "waterpal_cycle_triggers_total",
+    "Cycle triggers by source and whether they started or joined a run.",
+    ("source", "outcome"),
+)
+SENSOR_READ_SECONDS = registry.histogram(
+    "waterpal_sensor_read_seconds", "Latency of one filtered channel read.", ("channel",)
+)
+SENSOR_READ_FAILURES = registry.counter(
+    "waterpal_sensor_read_failures_total", "Channel reads that returned no value.", ("channel",)
+)
+PUMP_RUN_SECONDS = registry.histogram(
+    "waterpal_pump_run_seconds",
+    "Wall-clock pump run duration.",
+    ("gpio",),
+    buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 120, 300, 600),
+)
+PUMP_FAILURES = registry.counter(
+    "waterpal_pump_failures_total", "Pump runs that failed to start or stop.", ("gpio",)
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "waterpal_http_request_seconds", "HTTP request latency by route.", ("method", "route")
+)
+HTTP_REQUESTS = registry.counter(
+    "waterpal_http_requests_total",
+    "HTTP requests by route and status.",
+    ("method", "route", "status"),
+)
+SCHEDULER_LAG_SECONDS = registry.histogram(
+    "waterpal_scheduler_lag_seconds", "Delay between planned and actual job start.", ("job",)
+)
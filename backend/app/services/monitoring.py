@@ -1,106 +1,131 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Dict
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import desc
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import AlertEvent, PumpEvent, Reading, Zone
-from app.services.pump_controller import PumpController
+from app.models import AlertEvent, Reading, ZoneState
+from app.services.broadcaster import broadcaster, serialize
+from app.services.data_version import data_version
+from app.services.forecast import forecaster
+from app.services.metrics import CYCLE_SECONDS, CYCLE_ZONES
+from app.services.outbox import outbox
+from app.services.pump_engine import PumpEngine
+from app.services.recent_readings import recent_readings
+from app.services.rollups import apply_readings
 from app.services.sensor_manager import SensorManager
+from app.services.zone_cache import ZoneConfig, zone_cache
+from app.services.zone_state import record_alert, record_reading, save_states, snapshot_states
 
 
 def run_monitoring_cycle(
     db: Session,
     sensor_manager: SensorManager,
-    pump_controller: PumpController,
+    pump_engine: PumpEngine,
+    zone_ids: Optional[Iterable[int]] = None,
+    now: Optional[datetime] = None,
 ) -> Dict[str, int]:
-    now = datetime.utcnow()
-    zones = db.query(Zone).filter(Zone.enabled == True).order_by(Zone.id).all()
-    readings_saved = 0
-    pumps_run = 0
+    started = time.perf_counter()
+    now = now or datetime.utcnow()
+    zones = zone_cache.enabled(db)
+    if zone_ids is not None:
+        wanted = set(zone_ids)
+        zones = tuple(zone for zone in zones if zone.id in wanted)
+
+    values = sensor_manager.read_channels(zone.sensor_channel for zone in zones)
+    sampled = [
+        (zone, values[zone.sensor_channel])
+        for zone in zones
+        if values.get(zone.sensor_channel) is not None
+    ]
+    busy = {zone.id for zone, _ in sampled if pump_engine.is_busy(zone.id, zone.pump_gpio)}
+    states = snapshot_states(db, [zone.id for zone, _ in sampled])
+
+    readings: List[Reading] = []
+    alerts: List[Tuple[ZoneConfig, AlertEvent]] = []
+    to_water: List[ZoneConfig] = []
+    for zone, value in sampled:
+        state = states.setdefault(zone.id, ZoneState(zone_id=zone.id))
+        readings.append(Reading(zone_id=zone.id, value=value, created_at=now))
+
+        alert = _maybe_alert_low_moisture(zone, state, value, now)
+        if alert is not None:
+            alerts.append((zone, alert))
+
+        if zone.id not in busy and _should_water(zone, value, state, now):
+            to_water.append(zone)
+
+    _insert_rows(db, Reading, readings)
+    _insert_rows(db, AlertEvent, [alert for _, alert in alerts])
+    for reading in readings:
+        record_reading(states[reading.zone_id], reading)
+    for zone, alert in alerts:
+        record_alert(states[zone.id], zone, alert)
+    save_states(db, states, {zone.id for zone, _ in alerts}, now)
+
+    samples = [(r.zone_id, r.value, r.created_at) for r in readings]
+    apply_readings(db, samples)
+    events = [("readings", r.zone_id, serialize(r)) for r in readings]
+    events += [("alerts", zone.id, serialize(alert)) for zone, alert in alerts]
+    outbox.record_many(db, events)
 
-    for zone in zones:
-        value = sensor_manager.read_channel(zone.sensor_channel)
-        if value is None:
-            continue
-
-        reading = Reading(zone_id=zone.id, value=value)
-        db.add(reading)
-        readings_saved += 1
+    db.commit()
+    data_version.bump()
+    forecaster.observe_many(samples)
+    recent_readings.append_many((r.zone_id, r.id, r.value, r.created_at) for r in readings)
 
-        _maybe_alert_low_moisture(db, zone, value, now)
+    for topic, zone_id, data in events:
+        broadcaster.publish(topic, zone_id, data)
 
-        last_event = (
-            db.query(PumpEvent)
-            .filter(PumpEvent.zone_id == zone.id)
-            .order_by(desc(PumpEvent.created_at))
-            .first()
-        )
+    for zone in to_water:
+        duration = min(zone.water_duration_sec, settings.max_pump_seconds)
+        pump_engine.submit(zone.id, zone.pump_gpio, duration, "auto", "threshold")
 
-        if not _should_water(zone, value, last_event, now):
-            continue
+    CYCLE_SECONDS.observe(time.perf_counter() - started)
+    CYCLE_ZONES.inc(len(zones))
+    return {"readings_saved": len(readings), "pumps_scheduled": len(to_water)}
 
-        duration = min(zone.water_duration_sec, settings.max_pump_seconds)
-        ran = pump_controller.run(zone.pump_gpio, duration)
-        if ran:
-            pumps_run += 1
-            db.add(
-                PumpEvent(
-                    zone_id=zone.id,
-                    action="auto",
-                    reason="threshold",
-                    duration_sec=duration,
-                )
-            )
-        else:
-            db.add(
-                AlertEvent(
-                    zone_id=zone.id,
-                    alert_type="pump_failed",
-                    message="Pump failed to run during automatic cycle.",
-                )
-            )
 
-    db.commit()
-    return {"readings_saved": readings_saved, "pumps_run": pumps_run}
+def _insert_rows(db: Session, model, rows: List) -> None:
+    if not rows:
+        return
+    columns = [column.key for column in model.__table__.columns if column.key != "id"]
+    inserted = db.execute(
+        insert(model).returning(model.zone_id, model.id),
+        [{key: getattr(row, key) for key in columns} for row in rows],
+    )
+    ids = dict(inserted.all())
+    for row in rows:
+        row.id = ids[row.zone_id]
 
 
-def _should_water(zone: Zone, value: int, last_event: PumpEvent | None, now: datetime) -> bool:
+def _should_water(zone: ZoneConfig, value: int, state: ZoneState, now: datetime) -> bool:
     if value >= zone.threshold:
         return False
 
-    if last_event is None:
-        return True
-
-    cooldown = timedelta(hours=zone.cooldown_hours)
-    if now - last_event.created_at < cooldown:
+    if state.water_cooldown_until is not None and now < state.water_cooldown_until:
         return False
 
     return True
 
 
-def _maybe_alert_low_moisture(db: Session, zone: Zone, value: int, now: datetime) -> None:
+def _maybe_alert_low_moisture(
+    zone: ZoneConfig, state: ZoneState, value: int, now: datetime
+) -> AlertEvent | None:
     if value >= zone.threshold:
-        return
+        return None
 
-    last_alert = (
-        db.query(AlertEvent)
-        .filter(AlertEvent.zone_id == zone.id, AlertEvent.alert_type == "low_moisture")
-        .order_by(desc(AlertEvent.created_at))
-        .first()
-    )
-
-    cooldown = timedelta(hours=zone.cooldown_hours)
-    if last_alert and now - last_alert.created_at < cooldown:
-        return
+    if state.low_moisture_cooldown_until is not None and now < state.low_moisture_cooldown_until:
+        return None
 
-    db.add(
-        AlertEvent(
-            zone_id=zone.id,
-            alert_type="low_moisture",
-            message=f"Moisture reading {value} below threshold {zone.threshold}.",
-        )
+    return AlertEvent(
+        zone_id=zone.id,
+        alert_type="low_moisture",
+        message=f"Moisture reading {value} below threshold {zone.threshold}.",
+        created_at=now,
+        acknowledged=False,
     )
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+import urllib.request
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import OutboxEntry
+from app.services.zone_cache import zone_cache
+
+logger = logging.getLogger(__name__)
+
+Sender = Callable[[bytes], dict]
+
+
+class Outbox:
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+
+    def record(self, db: Session, topic: str, zone_id: Optional[int], data: dict) -> None:
+        self.record_many(db, [(topic, zone_id, data)])
+
+    def record_many(
+        self, db: Session, events: Iterable[Tuple[str, Optional[int], dict]]
+    ) -> None:
+        if not self.enabled:
+            return
+        rows = [
+            {
+                "topic": topic,
+                "key": data.get("client_id") or f"{topic}:{data['id']}:{data.get('created_at')}",
+                "zone_id": zone_id,
+                "payload": json.dumps(data, default=_default),
+                "created_at": datetime.utcnow(),
+            }
+            for topic, zone_id, data in events
+        ]
+        if rows:
+            db.execute(insert(OutboxEntry), rows)
+
+
+def http_sender(url: str, timeout: Optional[float] = None) -> Sender:
+    endpoint = url.rstrip("/") + "/api/fleet/sync"
+
+    def send(body: bytes) -> dict:
+        request = urllib.request.Request(
+            endpoint,
+            data=body,
+            method="POST",
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        timeout_sec = timeout or settings.sync_timeout_sec
+        with urllib.request.urlopen(request, timeout=timeout_sec) as response:
+            return json.loads(response.read())
+
+    return send
+
+
+class OutboxSyncer:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        send: Sender,
+        node_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        interval_sec: Optional[float] = None,
+        max_backoff_sec: Optional[float] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._send = send
+        self._node_id = node_id or settings.node_id
+        self._batch_size = batch_size or settings.sync_batch_size
+        self._interval_sec = interval_sec or settings.sync_interval_sec
+        self._max_backoff_sec = max_backoff_sec or settings.sync_max_backoff_sec
+        self._cond = threading.Condition()
+        self._sync_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._failures = 0
+        self._stats: Dict[str, object] = {
+            "sent": 0,
+            "batches": 0,
+            "failures": 0,
+            "last_success_at": None,
+            "last_error": None,
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="outbox-sync", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=self._interval_sec + 10)
+            self._thread = None
+
+    def stats(self) -> Dict[str, object]:
+        db = self._session_factory()
+        try:
+            pending = db.scalar(select(func.count()).select_from(OutboxEntry))
+        finally:
+            db.close()
+        with self._cond:
+            return {**self._stats, "pending": pending, "backoff_sec": self._backoff()}
+
+    def sync_once(self) -> int:
+        sent = 0
+        with self._sync_lock:
+            while True:
+                db = self._session_factory()
+                try:
+                    entries = db.scalars(
+                        select(OutboxEntry).order_by(OutboxEntry.id).limit(self._batch_size)
+                    ).all()
+                    if not entries:
+                        return sent
+                    body = gzip.compress(
+                        json.dumps(self._batch(db, entries)).encode(), compresslevel=6
+                    )
+                    acked = int(self._send(body)["acked_seq"])
+                    ids = [entry.id for entry in entries if entry.id <= acked]
+                    if ids:
+                        db.execute(delete(OutboxEntry).where(OutboxEntry.id.in_(ids)))
+                    db.commit()
+                finally:
+                    db.close()
+
+                sent += len(ids)
+                with self._cond:
+                    self._stats["sent"] += len(ids)
+                    self._stats["batches"] += 1
+                    self._stats["last_success_at"] = datetime.utcnow().isoformat()
+                if len(ids) < len(entries) or len(entries) < self._batch_size:
+                    return sent
+
+    def _batch(self, db: Session, entries) -> dict:
+        return {
+            "node_id": self._node_id,
+            "zones": [{"id": zone.id, "name": zone.name} for zone in zone_cache.all(db)],
+            "events": [
+                {
+                    "seq": entry.id,
+                    "topic": entry.topic,
+                    "key": entry.key,
+                    "zone_id": entry.zone_id,
+                    "data": json.loads(entry.payload),
+                }
+                for entry in entries
+            ],
+        }
+
+    def _backoff(self) -> float:
+        if not self._failures:
+            return self._interval_sec
+        return min(self._max_backoff_sec, self._interval_sec * 2 ** min(self._failures, 16))
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.sync_once()
+                with self._cond:
+                    self._failures = 0
+            except Exception as exc:
+                logger.warning("Outbox sync failed: %s", exc)
+                with self._cond:
+                    self._failures += 1
+                    self._stats["failures"] += 1
+                    self._stats["last_error"] = str(exc)
+            with self._cond:
+                if self._stopped:
+                    return
+                self._cond.wait(timeout=self._backoff())
+                if self._stopped:
+                    return
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Unserializable value {value!r}")
+
+
+outbox = Outbox(settings.node_mode == "edge")
@@ -1,35 +1,45 @@
 from __future__ import annotations
 
-from time import sleep
 from typing import Optional
 
 from app.config import settings
-
-try:
-    from gpiozero import OutputDevice  # type: ignore
-except Exception:  # pragma: no cover
-    OutputDevice = None
+from app.services.drivers import load_driver
+from app.services.simulation import SoilSimulator
 
 
 class PumpController:
-    def __init__(self) -> None:
-        self._outputs: dict[int, OutputDevice] = {}
+    def __init__(self, simulator: Optional[SoilSimulator] = None) -> None:
+        self._outputs: dict[int, object] = {}
+        self._simulator = simulator
 
-    def run(self, gpio_pin: Optional[int], duration_sec: int) -> bool:
+    def start(self, gpio_pin: Optional[int]) -> bool:
         if gpio_pin is None:
             return False
-        if settings.simulate_pumps or OutputDevice is None:
+        if settings.simulate_pumps or load_driver("gpiozero") is None:
+            return self._simulator.pump_on(gpio_pin) if self._simulator else True
+
+        try:
+            self._device(gpio_pin).on()
             return True
+        except Exception:
+            return False
+
+    def stop(self, gpio_pin: Optional[int]) -> bool:
+        if gpio_pin is None:
+            return False
+        if settings.simulate_pumps or load_driver("gpiozero") is None:
+            return self._simulator.pump_off(gpio_pin) if self._simulator else True
 
         try:
-            device = self._outputs.get(gpio_pin)
-            if device is None:
-                device = OutputDevice(gpio_pin, active_high=True, initial_value=False)
-                self._outputs[gpio_pin] = device
-
-            device.on()
-            sleep(duration_sec)
-            device.off()
+            self._device(gpio_pin).off()
             return True
         except Exception:
             return False
+
+    def _device(self, gpio_pin: int):
+        device = self._outputs.get(gpio_pin)
+        if device is None:
+            gpiozero = load_driver("gpiozero")
+            device = gpiozero.OutputDevice(gpio_pin, active_high=True, initial_value=False)
+            self._outputs[gpio_pin] = device
+        return device
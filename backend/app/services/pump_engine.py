@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import AlertEvent, PumpEvent
+from app.services.broadcaster import broadcaster, serialize
+from app.services.data_version import data_version
+from app.services.forecast import forecaster
+from app.services.metrics import PUMP_FAILURES, PUMP_RUN_SECONDS
+from app.services.outbox import outbox
+from app.services.pump_controller import PumpController
+from app.services.zone_cache import zone_cache
+from app.services.zone_state import ensure_state, load_states, record_alert, record_pump_event
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 500
+
+
+@dataclass
+class PumpJob:
+    id: str
+    zone_id: int
+    gpio_pin: Optional[int]
+    duration_sec: int
+    action: str
+    reason: str
+    status: str = "queued"
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    event_id: Optional[int] = None
+
+
+class PumpEngine:
+    def __init__(
+        self,
+        pump_controller: PumpController,
+        session_factory: Callable[[], Session],
+        max_active: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        now: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        self._controller = pump_controller
+        self._session_factory = session_factory
+        self._max_active = max(1, max_active or settings.max_simultaneous_pumps)
+        self._clock = clock
+        self._now = now
+        self._cond = threading.Condition()
+        self._queue: Deque[PumpJob] = deque()
+        self._running: Dict[str, PumpJob] = {}
+        self._deadlines: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._jobs: "OrderedDict[str, PumpJob]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="pump-engine", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            running = list(self._running.values())
+            self._running.clear()
+            self._queue.clear()
+            self._deadlines.clear()
+            self._cond.notify_all()
+        for job in running:
+            self._controller.stop(job.gpio_pin)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def submit(
+        self,
+        zone_id: int,
+        gpio_pin: Optional[int],
+        duration_sec: int,
+        action: str,
+        reason: str,
+    ) -> PumpJob:
+        job = PumpJob(
+            id=uuid.uuid4().hex,
+            zone_id=zone_id,
+            gpio_pin=gpio_pin,
+            duration_sec=duration_sec,
+            action=action,
+            reason=reason,
+            queued_at=self._now(),
+        )
+        with self._cond:
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._cond.notify_all()
+        self._dispatch()
+        return job
+
+    def get(self, job_id: str) -> Optional[PumpJob]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[PumpJob]:
+        with self._cond:
+            return list(self._jobs.values())
+
+    def is_busy(self, zone_id: int, gpio_pin: Optional[int] = None) -> bool:
+        with self._cond:
+            return any(
+                job.zone_id == zone_id or (gpio_pin is not None and job.gpio_pin == gpio_pin)
+                for job in (*self._running.values(), *self._queue)
+            )
+
+    def next_deadline(self) -> Optional[float]:
+        with self._cond:
+            return self._deadlines[0][0] if self._deadlines else None
+
+    def tick(self) -> None:
+        now = self._clock()
+        finished: List[PumpJob] = []
+        with self._cond:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, _, job_id = heapq.heappop(self._deadlines)
+                job = self._running.pop(job_id, None)
+                if job is not None:
+                    finished.append(job)
+
+        for job in finished:
+            self._complete(job, self._controller.stop(job.gpio_pin))
+
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        claimed: List[PumpJob] = []
+        with self._cond:
+            pins = {job.gpio_pin for job in self._running.values()}
+            waiting: Deque[PumpJob] = deque()
+            while self._queue and len(self._running) < self._max_active:
+                job = self._queue.popleft()
+                if job.gpio_pin is not None and job.gpio_pin in pins:
+                    waiting.append(job)
+                    continue
+                pins.add(job.gpio_pin)
+                self._running[job.id] = job
+                claimed.append(job)
+            self._queue.extendleft(reversed(waiting))
+
+        results = [(job, self._controller.start(job.gpio_pin)) for job in claimed]
+
+        started: List[PumpJob] = []
+        failed: List[PumpJob] = []
+        orphaned: List[PumpJob] = []
+        with self._cond:
+            for job, ok in results:
+                if not ok:
+                    self._running.pop(job.id, None)
+                    failed.append(job)
+                elif self._running.get(job.id) is not job:
+                    orphaned.append(job)
+                else:
+                    job.status = "running"
+                    job.started_at = self._now()
+                    started.append(job)
+                    self._sequence += 1
+                    deadline = self._clock() + job.duration_sec
+                    heapq.heappush(self._deadlines, (deadline, self._sequence, job.id))
+            self._cond.notify_all()
+
+        for job in orphaned:
+            self._controller.stop(job.gpio_pin)
+        for job in started:
+            broadcaster.publish("pump_jobs", job.zone_id, serialize(job))
+        for job in failed:
+            self._complete(job, False)
+        if failed:
+            self._dispatch()
+
+    def _complete(self, job: PumpJob, ran: bool) -> None:
+        job.status = "completed" if ran else "failed"
+        job.finished_at = self._now()
+        if job.started_at is not None:
+            PUMP_RUN_SECONDS.observe(
+                (job.finished_at - job.started_at).total_seconds(), gpio=job.gpio_pin
+            )
+        if not ran:
+            PUMP_FAILURES.inc(gpio=job.gpio_pin)
+        try:
+            job.event_id = self._record(job, ran)
+        except Exception:
+            logger.exception("Failed to record pump job %s", job.id)
+        broadcaster.publish("pump_jobs", job.zone_id, serialize(job))
+
+        with self._cond:
+            while len(self._jobs) > MAX_FINISHED_JOBS:
+                oldest_id = next(iter(self._jobs))
+                if self._jobs[oldest_id].finished_at is None:
+                    break
+                self._jobs.popitem(last=False)
+
+    def _record(self, job: PumpJob, ran: bool) -> Optional[int]:
+        pumped = ran or job.started_at is not None
+        db = self._session_factory()
+        try:
+            zone = zone_cache.get(db, job.zone_id)
+            rows: List[PumpEvent | AlertEvent] = []
+            if pumped or job.action == "manual":
+                rows.append(
+                    PumpEvent(
+                        zone_id=job.zone_id,
+                        action=job.action,
+                        reason=job.reason,
+                        duration_sec=job.duration_sec if pumped else None,
+                        created_at=job.finished_at,
+                    )
+                )
+            if not ran and (pumped or job.action != "manual"):
+                rows.append(
+                    AlertEvent(
+                        zone_id=job.zone_id,
+                        alert_type="pump_failed",
+                        message=(
+                            "Pump failed to stop after watering."
+                            if pumped
+                            else "Pump failed to run during automatic cycle."
+                        ),
+                        created_at=job.finished_at,
+                    )
+                )
+            db.add_all(rows)
+            db.flush()
+            if zone is not None:
+                state = ensure_state(db, load_states(db, [zone.id]), zone.id)
+                for row in rows:
+                    if isinstance(row, PumpEvent):
+                        record_pump_event(state, zone, row)
+                    else:
+                        record_alert(state, zone, row)
+            published = []
+            for row in rows:
+                topic = "pump_events" if isinstance(row, PumpEvent) else "alerts"
+                data = serialize(row)
+                outbox.record(db, topic, job.zone_id, data)
+                published.append((topic, data))
+            db.commit()
+            data_version.bump()
+            if pumped:
+                forecaster.reset(job.zone_id)
+            for topic, data in published:
+                broadcaster.publish(topic, job.zone_id, data)
+            return next((data["id"] for topic, data in published if topic == "pump_events"), None)
+        finally:
+            db.close()
+
+    def _loop(self) -> None:
+        while True:
+            self.tick()
+            with self._cond:
+                if self._stopped:
+                    return
+                if self._deadlines:
+                    delay = self._deadlines[0][0] - self._clock()
+                    if delay > 0:
+                        self._cond.wait(timeout=delay)
+                else:
+                    self._cond.wait()
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import logging
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Reading, Zone
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+NO_FLOOR = -(2**63)
+
+RecentRow = Tuple[int, int, int, datetime]
+
+
+def to_micros(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+class _Ring:
+    __slots__ = ("ids", "values", "stamps", "floor")
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.values = array("i")
+        self.stamps = array("q")
+        self.floor = NO_FLOOR
+
+    def insert(self, reading_id: int, value: int, stamp: int, capacity: int) -> None:
+        if self.stamps and (stamp, reading_id) <= (self.stamps[-1], self.ids[-1]):
+            index = bisect_left(self.stamps, stamp)
+            while (
+                index < len(self.stamps)
+                and self.stamps[index] == stamp
+                and self.ids[index] < reading_id
+            ):
+                index += 1
+            if (
+                index < len(self.stamps)
+                and self.stamps[index] == stamp
+                and self.ids[index] == reading_id
+            ):
+                return
+            if index == 0 and len(self.stamps) >= capacity:
+                self.floor = max(self.floor, stamp)
+                return
+            self.ids.insert(index, reading_id)
+            self.values.insert(index, value)
+            self.stamps.insert(index, stamp)
+        else:
+            self.ids.append(reading_id)
+            self.values.append(value)
+            self.stamps.append(stamp)
+        excess = len(self.stamps) - capacity
+        if excess > 0:
+            self.drop(excess)
+
+    def drop(self, count: int) -> None:
+        self.floor = max(self.floor, self.stamps[count - 1])
+        del self.ids[:count]
+        del self.values[:count]
+        del self.stamps[:count]
+
+    def nbytes(self) -> int:
+        return sum(
+            column.buffer_info()[1] * column.itemsize
+            for column in (self.ids, self.values, self.stamps)
+        )
+
+
+class RecentReadings:
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        self.capacity = max(1, capacity or settings.recent_readings_per_zone)
+        self._lock = threading.Lock()
+        self._rings: Dict[int, _Ring] = {}
+        self._ready = True
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def start_warm(self, session_factory: Callable[[], Session]) -> threading.Thread:
+        with self._lock:
+            self._ready = False
+        thread = threading.Thread(
+            target=self._warm_from,
+            args=(session_factory,),
+            name="recent-readings-warm",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def append_many(self, rows: Iterable[RecentRow]) -> None:
+        with self._lock:
+            for zone_id, reading_id, value, created_at in rows:
+                ring = self._rings.get(zone_id)
+                if ring is None:
+                    ring = self._rings[zone_id] = _Ring()
+                ring.insert(reading_id, value, to_micros(created_at), self.capacity)
+
+    def window(
+        self,
+        zone_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 500,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> Optional[List[RecentRow]]:
+        with self._lock:
+            bounds = self._bounds(zone_id, start, end, limit, before)
+            if bounds is None:
+                return None
+            ring, first, stop = bounds
+            return [
+                (zone_id, ring.ids[index], ring.values[index], from_micros(ring.stamps[index]))
+                for index in range(stop - 1, first - 1, -1)
+            ]
+
+    def window_columns(
+        self,
+        zone_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 500,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        with self._lock:
+            bounds = self._bounds(zone_id, start, end, limit, before)
+            if bounds is None:
+                return None
+            ring, first, stop = bounds
+            return (
+                np.array(ring.ids[first:stop], dtype=np.int64),
+                np.array(ring.stamps[first:stop], dtype=np.int64),
+                np.array(ring.values[first:stop], dtype=np.int32),
+            )
+
+    def latest(self, zone_id: int) -> Optional[RecentRow]:
+        with self._lock:
+            ring = self._rings.get(zone_id)
+            if ring is None or not ring.stamps or not self._ready:
+                return None
+            return zone_id, ring.ids[-1], ring.values[-1], from_micros(ring.stamps[-1])
+
+    def latest_all(self) -> Optional[List[RecentRow]]:
+        with self._lock:
+            if not self._ready:
+                return None
+            return [
+                (zone_id, ring.ids[-1], ring.values[-1], from_micros(ring.stamps[-1]))
+                for zone_id, ring in sorted(self._rings.items())
+                if ring.stamps
+            ]
+
+    def warm(self, db: Session) -> int:
+        latest = (
+            select(Reading.id)
+            .where(Reading.zone_id == Zone.id)
+            .order_by(Reading.created_at.desc(), Reading.id.desc())
+            .limit(self.capacity + 1)
+            .correlate(Zone)
+        )
+        rows = db.execute(
+            select(Reading.zone_id, Reading.id, Reading.value, Reading.created_at)
+            .join(Zone, Reading.id.in_(latest))
+            .order_by(Reading.zone_id, Reading.created_at, Reading.id)
+        ).all()
+        zone_ids = db.execute(select(Zone.id)).scalars().all()
+
+        rings = {zone_id: _Ring() for zone_id in zone_ids}
+        for zone_id, reading_id, value, created_at in rows:
+            ring = rings.setdefault(zone_id, _Ring())
+            ring.ids.append(reading_id)
+            ring.values.append(value)
+            ring.stamps.append(to_micros(created_at))
+        for ring in rings.values():
+            if len(ring.stamps) > self.capacity:
+                ring.drop(1)
+        with self._lock:
+            for zone_id, pending in self._rings.items():
+                ring = rings.setdefault(zone_id, _Ring())
+                for reading_id, value, stamp in zip(pending.ids, pending.values, pending.stamps):
+                    ring.insert(reading_id, value, stamp, self.capacity)
+            self._rings = rings
+            self._ready = True
+        return sum(len(ring.stamps) for ring in rings.values())
+
+    def trim(self, before: datetime) -> int:
+        cutoff = to_micros(before)
+        dropped = 0
+        with self._lock:
+            for ring in self._rings.values():
+                count = min(bisect_left(ring.stamps, cutoff), len(ring.stamps) - 1)
+                if count > 0:
+                    ring.drop(count)
+                    dropped += count
+        return dropped
+
+    def remove(self, zone_id: int) -> None:
+        with self._lock:
+            self._rings.pop(zone_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rings = {}
+            self._ready = True
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            zones = {
+                zone_id: {"readings": len(ring.stamps), "bytes": ring.nbytes()}
+                for zone_id, ring in sorted(self._rings.items())
+            }
+        return {
+            "ready": self._ready,
+            "capacity": self.capacity,
+            "zones": len(zones),
+            "readings": sum(zone["readings"] for zone in zones.values()),
+            "bytes": sum(zone["bytes"] for zone in zones.values()),
+            "per_zone": zones,
+        }
+
+    def _bounds(
+        self,
+        zone_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        limit: int,
+        before: Optional[Tuple[datetime, int]],
+    ) -> Optional[Tuple[_Ring, int, int]]:
+        ring = self._rings.get(zone_id)
+        if ring is None or not self._ready:
+            return None
+        low = NO_FLOOR if start is None else to_micros(start)
+        stop = len(ring.stamps) if end is None else bisect_right(ring.stamps, to_micros(end))
+        if before is not None:
+            stamp, reading_id = to_micros(before[0]), before[1]
+            index = bisect_left(ring.stamps, stamp, 0, stop)
+            while index < stop and ring.stamps[index] == stamp and ring.ids[index] < reading_id:
+                index += 1
+            stop = index
+        first = max(
+            bisect_left(ring.stamps, low, 0, stop),
+            bisect_right(ring.stamps, ring.floor, 0, stop),
+            stop - limit,
+        )
+        if stop - first < limit and ring.floor != NO_FLOOR and low <= ring.floor:
+            return None
+        return ring, first, stop
+
+    def _warm_from(self, session_factory: Callable[[], Session]) -> None:
+        db = session_factory()
+        try:
+            self.warm(db)
+        except Exception:
+            logger.exception("Failed to warm recent readings")
+        finally:
+            db.close()
+
+
+recent_readings = RecentReadings()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy.orm import Session
+
+from app.db.profiling import profiler
+from app.services.pump_controller import PumpController
+from app.services.pump_engine import PumpEngine
+from app.services.sampling import SamplingScheduler
+from app.services.sensor_manager import SensorManager
+from app.services.simulation import SoilSimulator, VirtualClock
+
+
+@dataclass
+class ReplayReport:
+    cycles: int = 0
+    readings: int = 0
+    pumps: int = 0
+    cycle_ms: List[float] = field(default_factory=list)
+    cycle_queries: List[int] = field(default_factory=list)
+    cycle_at: List[datetime] = field(default_factory=list)
+    wall_sec: float = 0.0
+
+
+def replay(
+    session_factory: Callable[[], Session],
+    simulator: SoilSimulator,
+    clock: VirtualClock,
+    until: datetime,
+    samples: int = 1,
+) -> ReplayReport:
+    sensors = SensorManager(samples=samples, simulate=True, simulator=simulator)
+    pump_engine = PumpEngine(
+        PumpController(simulator), session_factory, clock=clock.monotonic, now=clock.now
+    )
+    scheduler = SamplingScheduler(session_factory, sensors, pump_engine, now=clock.now)
+    report = ReplayReport()
+    started = time.perf_counter()
+    try:
+        while clock.now() < until:
+            tick_started = time.perf_counter()
+            with profiler.profile() as stats:
+                result = scheduler.tick()
+            if result["zones_sampled"]:
+                report.cycles += 1
+                report.readings += result["readings_saved"]
+                report.pumps += result["pumps_scheduled"]
+                report.cycle_ms.append((time.perf_counter() - tick_started) * 1000)
+                report.cycle_queries.append(stats.count if stats is not None else 0)
+                report.cycle_at.append(clock.now())
+            pump_engine.tick()
+
+            schedules = scheduler.schedules()
+            if not schedules:
+                break
+            wake_at = min(schedules[0].next_due_at, until)
+            deadline = pump_engine.next_deadline()
+            if deadline is not None:
+                pump_due = clock.now() + timedelta(seconds=deadline - clock.monotonic())
+                wake_at = min(wake_at, pump_due)
+            clock.advance_to(max(wake_at, clock.now() + timedelta(seconds=1)))
+        pump_engine.tick()
+    finally:
+        pump_engine.shutdown()
+        sensors.shutdown()
+    report.wall_sec = time.perf_counter() - started
+    return report
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import (
+    AlertEvent,
+    PumpEvent,
+    Reading,
+    ReadingRollupDaily,
+    ReadingRollupHourly,
+    ZoneState,
+)
+from app.services.data_version import data_version
+from app.services.recent_readings import recent_readings
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    name: str
+    model: type
+    column: str
+    max_age_days: int
+    filters: tuple = field(default_factory=tuple)
+
+
+def default_policies() -> List[RetentionPolicy]:
+    return [
+        RetentionPolicy(
+            "readings",
+            Reading,
+            "created_at",
+            settings.readings_retention_days,
+            (Reading.id.not_in(_state_refs(ZoneState.latest_reading_id)),),
+        ),
+        RetentionPolicy(
+            "pump_events",
+            PumpEvent,
+            "created_at",
+            settings.pump_events_retention_days,
+            (PumpEvent.id.not_in(_state_refs(ZoneState.last_pump_event_id)),),
+        ),
+        RetentionPolicy(
+            "alert_events",
+            AlertEvent,
+            "created_at",
+            settings.alerts_retention_days,
+            (AlertEvent.acknowledged == True,),
+        ),
+        RetentionPolicy(
+            "reading_rollups_hourly",
+            ReadingRollupHourly,
+            "bucket_start",
+            settings.hourly_rollups_retention_days,
+        ),
+        RetentionPolicy(
+            "reading_rollups_daily",
+            ReadingRollupDaily,
+            "bucket_start",
+            settings.daily_rollups_retention_days,
+        ),
+    ]
+
+
+def run_retention(
+    session_factory: Callable[[], Session],
+    policies: Optional[List[RetentionPolicy]] = None,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+    pause_sec: float = 0.05,
+) -> Dict[str, object]:
+    policies = default_policies() if policies is None else policies
+    batch_size = batch_size or settings.retention_batch_size
+    now = now or datetime.utcnow()
+    started = time.perf_counter()
+
+    pruned: Dict[str, int] = {}
+    for policy in policies:
+        if policy.max_age_days <= 0:
+            continue
+        cutoff = now - timedelta(days=policy.max_age_days)
+        pruned[policy.name] = _prune(session_factory, policy, cutoff, batch_size, pause_sec)
+        if policy.model is Reading:
+            recent_readings.trim(cutoff)
+
+    if any(pruned.values()):
+        data_version.bump()
+
+    db = session_factory()
+    try:
+        bytes_reclaimed = incremental_vacuum(db)
+    finally:
+        db.close()
+
+    return {
+        "pruned": pruned,
+        "rows_pruned": sum(pruned.values()),
+        "bytes_reclaimed": bytes_reclaimed,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def incremental_vacuum(db: Session) -> int:
+    page_size = db.execute(text("PRAGMA page_size")).scalar()
+    pages_before = db.execute(text("PRAGMA page_count")).scalar()
+    db.commit()
+    # pysqlite steps a PRAGMA only once per execute(), which frees a single
+    # page; executescript() runs it to completion.
+    db.connection().connection.driver_connection.executescript("PRAGMA incremental_vacuum;")
+    pages_after = db.execute(text("PRAGMA page_count")).scalar()
+    return max(pages_before - pages_after, 0) * page_size
+
+
+def _prune(
+    session_factory: Callable[[], Session],
+    policy: RetentionPolicy,
+    cutoff: datetime,
+    batch_size: int,
+    pause_sec: float,
+) -> int:
+    model = policy.model
+    pk_columns = list(model.__table__.primary_key.columns)
+    column = getattr(model, policy.column)
+    total = 0
+
+    while True:
+        db = session_factory()
+        try:
+            batch = (
+                select(*pk_columns)
+                .where(column < cutoff, *policy.filters)
+                .limit(batch_size)
+            )
+            keys = db.execute(batch).all()
+            if not keys:
+                return total
+            if len(pk_columns) == 1:
+                condition = pk_columns[0].in_([key[0] for key in keys])
+            else:
+                condition = tuple_(*pk_columns).in_([tuple(key) for key in keys])
+            db.execute(delete(model).where(condition))
+            db.commit()
+        finally:
+            db.close()
+
+        total += len(keys)
+        if len(keys) < batch_size:
+            return total
+        if pause_sec:
+            time.sleep(pause_sec)
+
+
+def _state_refs(column):
+    return select(column).where(column.is_not(None))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import Reading, ReadingRollupDaily, ReadingRollupHourly
+
+BUCKETS: Dict[str, Type] = {
+    "1h": ReadingRollupHourly,
+    "1d": ReadingRollupDaily,
+}
+
+_BUCKET_FORMATS = {
+    "1h": "%Y-%m-%d %H:00:00.000000",
+    "1d": "%Y-%m-%d 00:00:00.000000",
+}
+
+_UPSERT_COLUMNS = ("zone_id", "bucket_start", "count", "value_sum", "min_value", "max_value")
+
+
+def _upsert(model):
+    stmt = insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[model.zone_id, model.bucket_start],
+        set_={
+            "count": model.count + stmt.excluded.count,
+            "value_sum": model.value_sum + stmt.excluded.value_sum,
+            "min_value": func.min(model.min_value, stmt.excluded.min_value),
+            "max_value": func.max(model.max_value, stmt.excluded.max_value),
+        },
+    )
+    compiled = stmt.values({key: bindparam(key) for key in _UPSERT_COLUMNS}).compile(
+        dialect=sqlite.dialect(paramstyle="named")
+    )
+    columns = model.__table__.columns
+    return text(str(compiled)).bindparams(
+        *(bindparam(key, type_=columns[key].type) for key in _UPSERT_COLUMNS)
+    )
+
+
+_UPSERTS = {bucket: _upsert(model) for bucket, model in BUCKETS.items()}
+
+
+def bucket_start(created_at: datetime, bucket: str) -> datetime:
+    if bucket == "1h":
+        return created_at.replace(minute=0, second=0, microsecond=0)
+    return created_at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def apply_readings(db: Session, readings: Iterable[Tuple[int, int, datetime]]) -> None:
+    readings = list(readings)
+    if not readings:
+        return
+
+    for bucket in BUCKETS:
+        groups: Dict[Tuple[int, datetime], List[int]] = {}
+        for zone_id, value, created_at in readings:
+            key = (zone_id, bucket_start(created_at, bucket))
+            stats = groups.get(key)
+            if stats is None:
+                groups[key] = [1, value, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = min(stats[2], value)
+                stats[3] = max(stats[3], value)
+
+        db.execute(
+            _UPSERTS[bucket],
+            [
+                {
+                    "zone_id": zone_id,
+                    "bucket_start": start,
+                    "count": count,
+                    "value_sum": value_sum,
+                    "min_value": min_value,
+                    "max_value": max_value,
+                }
+                for (zone_id, start), (count, value_sum, min_value, max_value) in groups.items()
+            ],
+        )
+
+
+def backfill_rollups(db: Session, zone_id: Optional[int] = None) -> int:
+    for bucket, model in BUCKETS.items():
+        delete = db.query(model)
+        if zone_id is not None:
+            delete = delete.filter(model.zone_id == zone_id)
+        delete.delete(synchronize_session=False)
+
+        start = func.strftime(_BUCKET_FORMATS[bucket], Reading.created_at)
+        source = select(
+            Reading.zone_id,
+            start,
+            func.count(Reading.id),
+            func.sum(Reading.value),
+            func.min(Reading.value),
+            func.max(Reading.value),
+        ).where(Reading.zone_id.is_not(None))
+        if zone_id is not None:
+            source = source.where(Reading.zone_id == zone_id)
+        source = source.group_by(Reading.zone_id, start)
+
+        db.execute(
+            insert(model).from_select(
+                ["zone_id", "bucket_start", "count", "value_sum", "min_value", "max_value"],
+                source,
+            )
+        )
+
+    db.commit()
+    return db.query(func.count()).select_from(ReadingRollupHourly).scalar()
+
+
+def rollups_missing(db: Session) -> bool:
+    if db.query(ReadingRollupHourly.zone_id).first() is not None:
+        return False
+    return db.query(Reading.id).first() is not None
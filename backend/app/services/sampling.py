@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import ZoneState
+from app.services.cycle_executor import CycleExecutor
+from app.services.forecast import ZoneForecast, forecaster
+from app.services.metrics import SCHEDULER_LAG_SECONDS
+from app.services.pump_engine import PumpEngine
+from app.services.sensor_manager import SensorManager
+from app.services.zone_cache import ZoneConfig, zone_cache
+from app.services.zone_state import load_states
+
+logger = logging.getLogger(__name__)
+
+RATE_SMOOTHING = 0.5
+LEAD_FRACTION = 0.5
+FAR_MARGIN_HYSTERESES = 4
+
+
+@dataclass
+class ZoneSchedule:
+    zone_id: int
+    next_due_at: datetime
+    interval_sec: float
+    last_value: Optional[int] = None
+    last_sampled_at: Optional[datetime] = None
+    drying_rate_per_hour: Optional[float] = None
+    predicted_threshold_at: Optional[datetime] = None
+
+
+def next_interval(
+    zone: ZoneConfig,
+    value: Optional[int],
+    drying_rate_per_hour: Optional[float],
+    min_sec: float,
+    max_sec: float,
+) -> float:
+    if value is None:
+        return min_sec
+    margin = value - zone.threshold - zone.hysteresis
+    if margin <= 0:
+        return min_sec
+    if drying_rate_per_hour is None or drying_rate_per_hour <= 0:
+        fraction = min(1.0, margin / max(1, FAR_MARGIN_HYSTERESES * zone.hysteresis))
+        return min_sec + (max_sec - min_sec) * fraction
+    seconds = margin / drying_rate_per_hour * 3600 * LEAD_FRACTION
+    return max(min_sec, min(max_sec, seconds))
+
+
+class SamplingScheduler:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        sensor_manager: SensorManager,
+        pump_engine: PumpEngine,
+        min_interval_sec: Optional[float] = None,
+        max_interval_sec: Optional[float] = None,
+        batch_window_sec: Optional[float] = None,
+        retry_sec: Optional[float] = None,
+        now: Callable[[], datetime] = datetime.utcnow,
+        executor: Optional[CycleExecutor] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._executor = executor or CycleExecutor(
+            session_factory, sensor_manager, pump_engine, now=now
+        )
+        self._min_sec = min_interval_sec or settings.sample_min_interval_minutes * 60
+        self._max_sec = max(
+            self._min_sec, max_interval_sec or settings.sample_max_interval_minutes * 60
+        )
+        self._batch_window_sec = (
+            settings.sample_batch_window_sec if batch_window_sec is None else batch_window_sec
+        )
+        self._retry_sec = retry_sec or settings.sample_retry_sec
+        self._now = now
+        self._cond = threading.Condition()
+        self._tick_lock = threading.Lock()
+        self._failures = 0
+        self._schedules: Dict[int, ZoneSchedule] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="sampling-scheduler", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def schedules(self) -> List[ZoneSchedule]:
+        with self._cond:
+            return sorted(
+                (replace(schedule) for schedule in self._schedules.values()),
+                key=lambda schedule: (schedule.next_due_at, schedule.zone_id),
+            )
+
+    def wake(self, zone_id: Optional[int] = None) -> None:
+        now = self._now()
+        with self._cond:
+            for schedule in self._schedules.values():
+                if zone_id is None or schedule.zone_id == zone_id:
+                    schedule.next_due_at = now
+            self._cond.notify_all()
+
+    def forget(self, zone_id: Optional[int] = None) -> None:
+        with self._cond:
+            if zone_id is None:
+                self._schedules.clear()
+            else:
+                self._schedules.pop(zone_id, None)
+
+    def tick(self) -> Dict[str, int]:
+        with self._tick_lock:
+            db = self._session_factory()
+            try:
+                zones = self._sync(db)
+                horizon = self._now() + timedelta(seconds=self._batch_window_sec)
+                with self._cond:
+                    due = [
+                        zone for zone in zones if self._schedules[zone.id].next_due_at <= horizon
+                    ]
+                    planned = min(
+                        (self._schedules[zone.id].next_due_at for zone in due), default=None
+                    )
+                if not due:
+                    return {"zones_sampled": 0, "readings_saved": 0, "pumps_scheduled": 0}
+
+                zone_ids = [zone.id for zone in due]
+                now = self._now()
+                SCHEDULER_LAG_SECONDS.observe(
+                    max(0.0, (now - planned).total_seconds()), job="sampling"
+                )
+                run = self._executor.run(zone_ids, "sampling")
+                result = run.result or {"readings_saved": 0, "pumps_scheduled": 0}
+                states = load_states(db, zone_ids)
+                forecasts = forecaster.forecast_many(
+                    [(zone.id, zone.threshold) for zone in due], now
+                )
+                with self._cond:
+                    for zone, forecast in zip(due, forecasts):
+                        self._observe(zone, states.get(zone.id), forecast, now)
+                return {"zones_sampled": len(due), **result}
+            finally:
+                db.close()
+
+    def _sync(self, db: Session) -> List[ZoneConfig]:
+        zones = list(zone_cache.enabled(db))
+        enabled = {zone.id for zone in zones}
+        with self._cond:
+            for zone_id in list(self._schedules):
+                if zone_id not in enabled:
+                    del self._schedules[zone_id]
+            new = [zone for zone in zones if zone.id not in self._schedules]
+        if not new:
+            return zones
+
+        states = load_states(db, [zone.id for zone in new])
+        now = self._now()
+        with self._cond:
+            for zone in new:
+                state = states.get(zone.id)
+                if state is None or state.latest_reading_at is None:
+                    self._schedules[zone.id] = ZoneSchedule(zone.id, now, self._min_sec)
+                    continue
+                interval = next_interval(
+                    zone, state.latest_value, None, self._min_sec, self._max_sec
+                )
+                self._schedules[zone.id] = ZoneSchedule(
+                    zone_id=zone.id,
+                    next_due_at=state.latest_reading_at + timedelta(seconds=interval),
+                    interval_sec=interval,
+                    last_value=state.latest_value,
+                    last_sampled_at=state.latest_reading_at,
+                )
+        return zones
+
+    def _observe(
+        self,
+        zone: ZoneConfig,
+        state: Optional[ZoneState],
+        forecast: ZoneForecast,
+        now: datetime,
+    ) -> None:
+        schedule = self._schedules.get(zone.id)
+        if schedule is None:
+            return
+        sampled = (
+            state is not None
+            and state.latest_reading_at is not None
+            and (
+                schedule.last_sampled_at is None
+                or state.latest_reading_at > schedule.last_sampled_at
+            )
+        )
+        if sampled:
+            schedule.drying_rate_per_hour = (
+                forecast.drying_rate_per_hour
+                if forecast.drying_rate_per_hour is not None
+                else _drying_rate(schedule, state)
+            )
+            schedule.last_value = state.latest_value
+            schedule.last_sampled_at = state.latest_reading_at
+            interval = next_interval(
+                zone,
+                schedule.last_value,
+                schedule.drying_rate_per_hour,
+                self._min_sec,
+                self._max_sec,
+            )
+        else:
+            interval = self._min_sec
+        schedule.interval_sec = interval
+        schedule.next_due_at = now + timedelta(seconds=interval)
+        schedule.predicted_threshold_at = forecast.threshold_at
+        if forecast.threshold_at is not None and forecast.threshold_at > now:
+            planned = max(
+                forecast.threshold_at, now + timedelta(seconds=self._batch_window_sec)
+            )
+            schedule.next_due_at = min(schedule.next_due_at, planned)
+
+    def _delay(self) -> float:
+        if self._failures:
+            return min(self._min_sec, self._retry_sec * 2 ** min(self._failures - 1, 16))
+        if not self._schedules:
+            return self._max_sec
+        next_due = min(schedule.next_due_at for schedule in self._schedules.values())
+        return (next_due - self._now()).total_seconds()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.tick()
+                failed = False
+            except Exception:
+                logger.exception("Sampling pass failed")
+                failed = True
+            with self._cond:
+                self._failures = self._failures + 1 if failed else 0
+                if self._stopped:
+                    return
+                delay = self._delay()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                if self._stopped:
+                    return
+
+
+def _drying_rate(schedule: ZoneSchedule, state: ZoneState) -> Optional[float]:
+    if schedule.last_value is None or schedule.last_sampled_at is None:
+        return schedule.drying_rate_per_hour
+    hours = (state.latest_reading_at - schedule.last_sampled_at).total_seconds() / 3600
+    if hours <= 0:
+        return schedule.drying_rate_per_hour
+    rate = (schedule.last_value - state.latest_value) / hours
+    if rate < 0:
+        return None
+    if schedule.drying_rate_per_hour is None:
+        return rate
+    return RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * schedule.drying_rate_per_hour
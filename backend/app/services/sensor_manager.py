@@ -1,71 +1,281 @@
 from __future__ import annotations
 
-import random
-from typing import Optional
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from app.config import settings
+from app.services.drivers import load_driver
+from app.services.metrics import SENSOR_READ_FAILURES, SENSOR_READ_SECONDS
+from app.services.simulation import SoilSimulator
 
-try:
-    import smbus2  # type: ignore
-except Exception:  # pragma: no cover
-    smbus2 = None
+ADS1115_CONVERSION_REGISTER = 0x00
+ADS1115_CONFIG_REGISTER = 0x01
+ADS1115_OS = 0x8000
+ADS1115_MUX_SINGLE_ENDED = 0x4000
+ADS1115_PGA_4_096V = 0x0200
+ADS1115_MODE_SINGLE_SHOT = 0x0100
+ADS1115_DR_128SPS = 0x0080
+ADS1115_COMP_DISABLE = 0x0003
+ADS1115_CONVERSION_SEC = 1 / 128
+ADS1115_READY_TIMEOUT_SEC = 0.05
+ADS1115_POLL_SEC = 0.0005
 
-try:
-    import explorerhat  # type: ignore
-except Exception:  # pragma: no cover
-    explorerhat = None
+CHANNELS_PER_ADC = 4
+
+
+def parse_adcs(spec: str) -> List[Tuple[int, int]]:
+    adcs: List[Tuple[int, int]] = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        bus, address = item.split(":")
+        adcs.append((int(bus), int(address, 0)))
+    return adcs
+
+
+def filter_samples(samples: Sequence[int], mode: str, trim_fraction: float = 0.2) -> int:
+    if mode == "median":
+        return int(round(statistics.median(samples)))
+    if mode == "trimmed_mean":
+        ordered = sorted(samples)
+        trim = int(len(ordered) * trim_fraction)
+        kept = ordered[trim : len(ordered) - trim] or ordered
+        return int(round(statistics.fmean(kept)))
+    return int(round(statistics.fmean(samples)))
+
+
+class ChannelStats:
+    def __init__(self) -> None:
+        self.reads = 0
+        self.failures = 0
+        self.last_latency_ms = 0.0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.last_value: Optional[int] = None
+        self.last_stdev = 0.0
+        self.last_spread = 0
+
+    def record(self, latency_ms: float, samples: List[int], value: Optional[int]) -> None:
+        self.reads += 1
+        self.last_latency_ms = latency_ms
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        if value is None:
+            self.failures += 1
+            return
+        self.last_value = value
+        self.last_stdev = statistics.pstdev(samples) if len(samples) > 1 else 0.0
+        self.last_spread = max(samples) - min(samples)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "reads": self.reads,
+            "failures": self.failures,
+            "last_latency_ms": round(self.last_latency_ms, 3),
+            "avg_latency_ms": round(self.total_latency_ms / self.reads, 3) if self.reads else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 3),
+            "last_value": self.last_value,
+            "last_stdev": round(self.last_stdev, 2),
+            "last_spread": self.last_spread,
+        }
 
 
 class SensorManager:
-    def __init__(self, i2c_bus: int = 1, adc_address: int = 0x48) -> None:
-        self.i2c_bus = i2c_bus
-        self.adc_address = adc_address
-        self._use_explorerhat = explorerhat is not None and not settings.simulate_sensors
-        self._bus = (
-            smbus2.SMBus(i2c_bus)
-            if smbus2 and not settings.simulate_sensors and not self._use_explorerhat
+    def __init__(
+        self,
+        i2c_bus: int = 1,
+        adc_address: int = 0x48,
+        adcs: Optional[List[Tuple[int, int]]] = None,
+        samples: Optional[int] = None,
+        filter_mode: Optional[str] = None,
+        ads_mode: Optional[str] = None,
+        simulate: Optional[bool] = None,
+        bus_factory: Optional[Callable[[int], object]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        simulator: Optional[SoilSimulator] = None,
+    ) -> None:
+        self.adcs = adcs or parse_adcs(settings.sensor_adcs) or [(i2c_bus, adc_address)]
+        self.i2c_bus, self.adc_address = self.adcs[0]
+        self.samples = max(1, samples or settings.sensor_samples)
+        self.filter_mode = filter_mode or settings.sensor_filter
+        self.ads_mode = ads_mode or settings.sensor_ads_mode
+        self._simulate = settings.simulate_sensors if simulate is None else simulate
+        self._simulator = simulator or (SoilSimulator() if self._simulate else None)
+        self._sleep = sleep
+        self._bus_factory = bus_factory
+        self._explorerhat = None
+        self._hardware_ready = False
+        self._buses: Dict[int, object] = {}
+        self._workers: Dict[int, ThreadPoolExecutor] = {}
+        self._bus_locks = {bus: threading.Lock() for bus, _ in self.adcs}
+        self._stats: Dict[int, ChannelStats] = {}
+        self._lock = threading.Lock()
+
+    def read_channel(self, channel: int) -> Optional[int]:
+        started = time.perf_counter()
+        samples = self._acquire(channel)
+        value = (
+            filter_samples(samples, self.filter_mode, settings.sensor_trim_fraction)
+            if samples
             else None
         )
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats.setdefault(channel, ChannelStats()).record(latency_ms, samples, value)
+        SENSOR_READ_SECONDS.observe(latency_ms / 1000, channel=channel)
+        if value is None:
+            SENSOR_READ_FAILURES.inc(channel=channel)
+        return value
 
-    def read_channel(self, channel: int) -> Optional[int]:
-        if self._use_explorerhat:
-            return self._read_explorerhat(channel)
+    def read_channels(self, channels: Iterable[int]) -> Dict[int, Optional[int]]:
+        groups: Dict[int, List[int]] = {}
+        for channel in dict.fromkeys(channels):
+            groups.setdefault(self._bus_for(channel), []).append(channel)
+
+        if len(groups) <= 1:
+            return self._read_group([channel for group in groups.values() for channel in group])
+
+        futures = [
+            self._worker(bus).submit(self._read_group, group) for bus, group in groups.items()
+        ]
+        results: Dict[int, Optional[int]] = {}
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    def stats(self) -> Dict[int, Dict[str, float]]:
+        with self._lock:
+            return {channel: stats.as_dict() for channel, stats in sorted(self._stats.items())}
+
+    def shutdown(self) -> None:
+        for worker in self._workers.values():
+            worker.shutdown(wait=True)
+        self._workers.clear()
 
-        if settings.simulate_sensors:
-            base = 15000 + channel * 1200
-            return base + random.randint(-400, 400)
+    def _read_group(self, channels: List[int]) -> Dict[int, Optional[int]]:
+        return {channel: self.read_channel(channel) for channel in channels}
 
-        if self._bus is None:
-            return None
+    def _worker(self, bus: int) -> ThreadPoolExecutor:
+        with self._lock:
+            worker = self._workers.get(bus)
+            if worker is None:
+                worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"i2c-{bus}")
+                self._workers[bus] = worker
+            return worker
 
-        return self._read_ads1115(channel)
+    def _bus_for(self, channel: int) -> int:
+        index = channel // CHANNELS_PER_ADC
+        if index < len(self.adcs):
+            return self.adcs[index][0]
+        return -1
 
-    def _read_explorerhat(self, channel: int) -> Optional[int]:
-        if channel not in (0, 1, 2, 3) or explorerhat is None:
-            return None
+    def _open_hardware(self) -> None:
+        with self._lock:
+            if self._hardware_ready:
+                return
+            factory = self._bus_factory
+            if factory is None:
+                self._explorerhat = load_driver("explorerhat")
+                smbus2 = load_driver("smbus2") if self._explorerhat is None else None
+                factory = smbus2.SMBus if smbus2 is not None else None
+            if factory is not None:
+                for bus, _ in self.adcs:
+                    if bus not in self._buses:
+                        self._buses[bus] = factory(bus)
+            self._hardware_ready = True
+
+    def _acquire(self, channel: int) -> List[int]:
+        if self._simulate:
+            return self._simulator.samples(channel, self.samples)
+
+        if not self._hardware_ready:
+            self._open_hardware()
+        if self._explorerhat is not None:
+            with self._bus_locks[self.i2c_bus]:
+                return self._read_explorerhat(channel)
+
+        index, mux = divmod(channel, CHANNELS_PER_ADC)
+        if index >= len(self.adcs) or channel < 0:
+            return []
+        bus_number, address = self.adcs[index]
+        bus = self._buses.get(bus_number)
+        if bus is None:
+            return []
 
         try:
-            volts = explorerhat.analog.read(channel)
-            return int(round(volts * 1000))
-        except Exception:
-            return None
+            with self._bus_locks[bus_number]:
+                if self.ads_mode == "continuous":
+                    return self._read_ads1115_continuous(bus, address, mux)
+                return self._read_ads1115_single(bus, address, mux)
+        except OSError:
+            return []
 
-    def _read_ads1115(self, channel: int) -> Optional[int]:
+    def _read_explorerhat(self, channel: int) -> List[int]:
         if channel not in (0, 1, 2, 3):
-            return None
-
-        config = 0x8000
-        config |= 0x4000 | (channel << 12)
-        config |= 0x0200
-        config |= 0x0080
-        config |= 0x0003
-
-        if not self._bus:
-            return None
-
-        self._bus.write_i2c_block_data(self.adc_address, 0x01, [config >> 8, config & 0xFF])
-        raw = self._bus.read_i2c_block_data(self.adc_address, 0x00, 2)
-        value = (raw[0] << 8) | raw[1]
-        if value & 0x8000:
-            value -= 1 << 16
-        return value
+            return []
+
+        try:
+            return [
+                int(round(self._explorerhat.analog.read(channel) * 1000))
+                for _ in range(self.samples)
+            ]
+        except Exception:
+            return []
+
+    def _read_ads1115_single(self, bus, address: int, mux: int) -> List[int]:
+        config = _ads1115_config(mux) | ADS1115_OS | ADS1115_MODE_SINGLE_SHOT
+        samples: List[int] = []
+        for _ in range(self.samples):
+            bus.write_i2c_block_data(
+                address, ADS1115_CONFIG_REGISTER, [config >> 8, config & 0xFF]
+            )
+            if not self._wait_ready(bus, address):
+                return []
+            samples.append(_read_conversion(bus, address))
+        return samples
+
+    def _read_ads1115_continuous(self, bus, address: int, mux: int) -> List[int]:
+        config = _ads1115_config(mux)
+        bus.write_i2c_block_data(address, ADS1115_CONFIG_REGISTER, [config >> 8, config & 0xFF])
+        # The first result after a MUX change still belongs to the previous
+        # input, so let one full conversion go by before sampling.
+        self._sleep(ADS1115_CONVERSION_SEC * 2)
+        samples: List[int] = []
+        for index in range(self.samples):
+            if index:
+                self._sleep(ADS1115_CONVERSION_SEC)
+            samples.append(_read_conversion(bus, address))
+        return samples
+
+    def _wait_ready(self, bus, address: int) -> bool:
+        self._sleep(ADS1115_CONVERSION_SEC)
+        deadline = time.perf_counter() + ADS1115_READY_TIMEOUT_SEC
+        while True:
+            raw = bus.read_i2c_block_data(address, ADS1115_CONFIG_REGISTER, 2)
+            if raw[0] & (ADS1115_OS >> 8):
+                return True
+            if time.perf_counter() > deadline:
+                return False
+            self._sleep(ADS1115_POLL_SEC)
+
+
+def _ads1115_config(mux: int) -> int:
+    return (
+        ADS1115_MUX_SINGLE_ENDED
+        | (mux << 12)
+        | ADS1115_PGA_4_096V
+        | ADS1115_DR_128SPS
+        | ADS1115_COMP_DISABLE
+    )
+
+
+def _read_conversion(bus, address: int) -> int:
+    raw = bus.read_i2c_block_data(address, ADS1115_CONVERSION_REGISTER, 2)
+    value = (raw[0] << 8) | raw[1]
+    if value & 0x8000:
+        value -= 1 << 16
+    return value
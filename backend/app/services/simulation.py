@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import math
+import random
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Mapping, Optional, Union
+
+from app.config import settings
+
+FAULT_KINDS = ("dropout", "stuck", "spike")
+SPIKE_FACTOR = 20
+MAX_STEP_SEC = 3600
+
+GpioChannels = Union[Mapping[int, List[int]], Callable[[], Mapping[int, List[int]]]]
+
+
+@dataclass(frozen=True)
+class SoilParams:
+    dry_value: int = 9000
+    wet_value: int = 30000
+    drying_per_hour: float = 300.0
+    pump_gain_per_sec: float = 250.0
+    noise: float = 120.0
+    dropout_rate: float = 0.0
+
+
+@dataclass
+class _Soil:
+    params: SoilParams
+    value: float
+    updated_at: datetime
+    rng: random.Random
+    pump_started_at: Optional[datetime] = None
+    fault: Optional[str] = None
+    fault_until: Optional[datetime] = None
+    stuck_value: Optional[int] = None
+
+
+class VirtualClock:
+    def __init__(self, start: Optional[datetime] = None) -> None:
+        self._start = start or datetime(2026, 1, 1)
+        self._elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def now(self) -> datetime:
+        with self._lock:
+            return self._start + timedelta(seconds=self._elapsed)
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self._elapsed
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self._elapsed += max(0.0, seconds)
+
+    def advance_to(self, when: datetime) -> None:
+        self.advance((when - self.now()).total_seconds())
+
+
+class SoilSimulator:
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        now: Callable[[], datetime] = datetime.utcnow,
+        params: Optional[SoilParams] = None,
+        channel_params: Optional[Mapping[int, SoilParams]] = None,
+        gpio_channels: Optional[GpioChannels] = None,
+    ) -> None:
+        self.seed = settings.simulation_seed if seed is None else seed
+        self._now = now
+        self._params = params or SoilParams()
+        self._channel_params = dict(channel_params or {})
+        self._gpio_channels = gpio_channels or {}
+        self._soils: Dict[int, _Soil] = {}
+        self._pumps: Dict[int, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def samples(self, channel: int, count: int) -> List[int]:
+        with self._lock:
+            soil = self._soil(channel)
+            now = self._now()
+            self._advance(soil, now)
+            if soil.fault_until is not None and now >= soil.fault_until:
+                soil.fault = soil.fault_until = soil.stuck_value = None
+            if soil.fault == "dropout" or soil.rng.random() < soil.params.dropout_rate:
+                return []
+            if soil.fault == "stuck":
+                return [soil.stuck_value] * count
+            noise = soil.params.noise * (SPIKE_FACTOR if soil.fault == "spike" else 1)
+            return [int(round(soil.value + soil.rng.gauss(0, noise))) for _ in range(count)]
+
+    def moisture(self, channel: int) -> float:
+        with self._lock:
+            soil = self._soil(channel)
+            self._advance(soil, self._now())
+            return soil.value
+
+    def pump_on(self, gpio_pin: int) -> bool:
+        with self._lock:
+            now = self._now()
+            channels = list(self._resolve(gpio_pin))
+            for channel in channels:
+                soil = self._soil(channel)
+                self._advance(soil, now)
+                soil.pump_started_at = now
+            self._pumps[gpio_pin] = channels
+        return True
+
+    def pump_off(self, gpio_pin: int) -> bool:
+        with self._lock:
+            now = self._now()
+            for channel in self._pumps.pop(gpio_pin, []):
+                soil = self._soil(channel)
+                self._advance(soil, now)
+                soil.pump_started_at = None
+        return True
+
+    def inject_fault(self, channel: int, kind: str, duration_sec: float) -> None:
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"Unknown fault kind: {kind}")
+        with self._lock:
+            soil = self._soil(channel)
+            now = self._now()
+            self._advance(soil, now)
+            soil.fault = kind
+            soil.fault_until = now + timedelta(seconds=duration_sec)
+            soil.stuck_value = int(round(soil.value))
+
+    def _resolve(self, gpio_pin: int) -> List[int]:
+        mapping = self._gpio_channels
+        if callable(mapping):
+            mapping = mapping()
+        return mapping.get(gpio_pin, [])
+
+    def _soil(self, channel: int) -> _Soil:
+        soil = self._soils.get(channel)
+        if soil is None:
+            rng = random.Random(f"{self.seed}:{channel}")
+            params = self._channel_params.get(channel)
+            if params is None:
+                params = replace(
+                    self._params,
+                    drying_per_hour=self._params.drying_per_hour * rng.uniform(0.6, 1.4),
+                )
+            start = rng.uniform(0.4, 0.9)
+            soil = _Soil(
+                params=params,
+                value=params.dry_value + (params.wet_value - params.dry_value) * start,
+                updated_at=self._now(),
+                rng=rng,
+            )
+            self._soils[channel] = soil
+        return soil
+
+    def _advance(self, soil: _Soil, now: datetime) -> None:
+        params = soil.params
+        span = params.wet_value - params.dry_value
+        while soil.updated_at < now:
+            step = min(MAX_STEP_SEC, (now - soil.updated_at).total_seconds())
+            middle = soil.updated_at + timedelta(seconds=step / 2)
+            rate = params.drying_per_hour / span * _diurnal(middle)
+            soil.value = params.dry_value + (soil.value - params.dry_value) * math.exp(
+                -rate * step / 3600
+            )
+            if soil.pump_started_at is not None:
+                soil.value += params.pump_gain_per_sec * step
+            soil.value = min(float(params.wet_value), max(float(params.dry_value), soil.value))
+            soil.updated_at += timedelta(seconds=step)
+
+
+def _diurnal(when: datetime) -> float:
+    hour = when.hour + when.minute / 60
+    return 0.25 + 1.5 * max(0.0, math.sin(math.pi * (hour - 6) / 12))
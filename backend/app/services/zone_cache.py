@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Zone
+
+
+@dataclass(frozen=True)
+class ZoneConfig:
+    id: int
+    name: str
+    threshold: int
+    hysteresis: int
+    cooldown_hours: int
+    water_duration_sec: int
+    sensor_channel: int
+    pump_gpio: Optional[int]
+    enabled: bool
+
+    @classmethod
+    def from_zone(cls, zone: Zone) -> "ZoneConfig":
+        return cls(
+            id=zone.id,
+            name=zone.name,
+            threshold=zone.threshold,
+            hysteresis=zone.hysteresis,
+            cooldown_hours=zone.cooldown_hours,
+            water_duration_sec=zone.water_duration_sec,
+            sensor_channel=zone.sensor_channel,
+            pump_gpio=zone.pump_gpio,
+            enabled=bool(zone.enabled),
+        )
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    version: int
+    zones: Tuple[ZoneConfig, ...]
+    by_id: Dict[int, ZoneConfig]
+
+
+class ZoneCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[_Snapshot] = None
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def all(self, db: Session) -> Tuple[ZoneConfig, ...]:
+        return self._current(db).zones
+
+    async def all_async(self, db: AsyncSession) -> Tuple[ZoneConfig, ...]:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            with self._lock:
+                self._hits += 1
+            return snapshot.zones
+        return await db.run_sync(self.all)
+
+    def enabled(self, db: Session) -> Tuple[ZoneConfig, ...]:
+        return tuple(zone for zone in self._current(db).zones if zone.enabled)
+
+    def get(self, db: Session, zone_id: int) -> Optional[ZoneConfig]:
+        return self._current(db).by_id.get(zone_id)
+
+    def put(self, zone: Zone) -> None:
+        config = ZoneConfig.from_zone(zone)
+        with self._lock:
+            self._version += 1
+            if self._snapshot is not None:
+                by_id = dict(self._snapshot.by_id)
+                by_id[config.id] = config
+                self._snapshot = _build(self._version, by_id)
+
+    def remove(self, zone_id: int) -> None:
+        with self._lock:
+            self._version += 1
+            if self._snapshot is not None:
+                by_id = dict(self._snapshot.by_id)
+                by_id.pop(zone_id, None)
+                self._snapshot = _build(self._version, by_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, int]:
+        snapshot = self._snapshot
+        with self._lock:
+            return {
+                "version": self._version,
+                "hits": self._hits,
+                "misses": self._misses,
+                "zones": len(snapshot.zones) if snapshot else 0,
+                "loaded": snapshot is not None,
+            }
+
+    def _current(self, db: Session) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            with self._lock:
+                self._hits += 1
+            return snapshot
+
+        with self._lock:
+            self._misses += 1
+            version = self._version
+        zones = db.query(Zone).order_by(Zone.id).all()
+        snapshot = _build(version, {zone.id: ZoneConfig.from_zone(zone) for zone in zones})
+        with self._lock:
+            if self._version == version:
+                self._snapshot = snapshot
+        return snapshot
+
+
+def _build(version: int, by_id: Dict[int, ZoneConfig]) -> _Snapshot:
+    zones = tuple(by_id[zone_id] for zone_id in sorted(by_id))
+    return _Snapshot(version=version, zones=zones, by_id=dict(by_id))
+
+
+zone_cache = ZoneCache()
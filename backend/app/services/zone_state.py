@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import bindparam, case, desc, or_, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import AlertEvent, PumpEvent, Reading, Zone, ZoneState
+from app.services.zone_cache import ZoneConfig
+
+ALERT_TYPES = ("low_moisture", "pump_failed")
+
+READING_COLUMNS = ("latest_reading_id", "latest_value", "latest_reading_at")
+LOW_MOISTURE_COLUMNS = (
+    "last_low_moisture_alert_id",
+    "last_low_moisture_alert_at",
+    "low_moisture_cooldown_until",
+)
+_SAVE_KEYS = ("zone_id", *READING_COLUMNS, *LOW_MOISTURE_COLUMNS, "updated_at")
+
+
+def _save_statement():
+    table = ZoneState.__table__
+    stmt = insert(table)
+    excluded = stmt.excluded
+    newer_reading = or_(
+        table.c.latest_reading_at.is_(None),
+        excluded.latest_reading_at >= table.c.latest_reading_at,
+    )
+    new_alert = excluded.last_low_moisture_alert_id.is_not(None)
+    set_ = {
+        key: case((guard, excluded[key]), else_=table.c[key])
+        for guard, keys in ((newer_reading, READING_COLUMNS), (new_alert, LOW_MOISTURE_COLUMNS))
+        for key in keys
+    }
+    set_["updated_at"] = excluded.updated_at
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.zone_id], set_=set_)
+    compiled = stmt.values({key: bindparam(key) for key in _SAVE_KEYS}).compile(
+        dialect=sqlite.dialect(paramstyle="named")
+    )
+    return text(str(compiled)).bindparams(
+        *(bindparam(key, type_=table.c[key].type) for key in _SAVE_KEYS)
+    )
+
+
+_SAVE_STATES = _save_statement()
+
+
+def get_state(db: Session, zone: Zone) -> ZoneState:
+    state = zone.state
+    if state is None:
+        state = ZoneState(zone_id=zone.id)
+        zone.state = state
+        db.add(state)
+    return state
+
+
+def load_states(db: Session, zone_ids: Optional[Iterable[int]] = None) -> Dict[int, ZoneState]:
+    query = db.query(ZoneState)
+    if zone_ids is not None:
+        query = query.filter(ZoneState.zone_id.in_(list(zone_ids)))
+    return {state.zone_id: state for state in query}
+
+
+def snapshot_states(db: Session, zone_ids: Iterable[int]) -> Dict[int, ZoneState]:
+    columns = ZoneState.__table__.columns
+    rows = db.execute(select(*columns).where(ZoneState.zone_id.in_(list(zone_ids)))).mappings()
+    return {row["zone_id"]: ZoneState(**row) for row in rows}
+
+
+def save_states(
+    db: Session, states: Dict[int, ZoneState], alerted: Set[int], now: datetime
+) -> None:
+    if not states:
+        return
+    rows = []
+    for zone_id, state in states.items():
+        row = {key: getattr(state, key) for key in READING_COLUMNS}
+        for key in LOW_MOISTURE_COLUMNS:
+            row[key] = getattr(state, key) if zone_id in alerted else None
+        rows.append({"zone_id": zone_id, **row, "updated_at": now})
+    db.execute(_SAVE_STATES, rows)
+
+
+def ensure_state(db: Session, states: Dict[int, ZoneState], zone_id: int) -> ZoneState:
+    state = states.get(zone_id)
+    if state is None:
+        state = ZoneState(zone_id=zone_id)
+        db.add(state)
+        states[zone_id] = state
+    return state
+
+
+def record_reading(state: ZoneState, reading: Reading) -> None:
+    if state.latest_reading_at is not None and reading.created_at < state.latest_reading_at:
+        return
+    state.latest_reading_id = reading.id
+    state.latest_value = reading.value
+    state.latest_reading_at = reading.created_at
+
+
+def record_pump_event(state: ZoneState, zone: Zone | ZoneConfig, event: PumpEvent) -> None:
+    if state.last_pump_at is not None and event.created_at < state.last_pump_at:
+        return
+    state.last_pump_event_id = event.id
+    state.last_pump_at = event.created_at
+    state.water_cooldown_until = _cooldown_deadline(zone, event.created_at)
+
+
+def record_alert(state: ZoneState, zone: Zone | ZoneConfig, alert: AlertEvent) -> None:
+    if alert.alert_type == "low_moisture":
+        if (
+            state.last_low_moisture_alert_at is not None
+            and alert.created_at < state.last_low_moisture_alert_at
+        ):
+            return
+        state.last_low_moisture_alert_id = alert.id
+        state.last_low_moisture_alert_at = alert.created_at
+        state.low_moisture_cooldown_until = _cooldown_deadline(zone, alert.created_at)
+    elif alert.alert_type == "pump_failed":
+        if (
+            state.last_pump_failed_alert_at is not None
+            and alert.created_at < state.last_pump_failed_alert_at
+        ):
+            return
+        state.last_pump_failed_alert_id = alert.id
+        state.last_pump_failed_alert_at = alert.created_at
+
+
+def refresh_cooldowns(state: ZoneState, zone: Zone | ZoneConfig) -> None:
+    state.water_cooldown_until = _cooldown_deadline(zone, state.last_pump_at)
+    state.low_moisture_cooldown_until = _cooldown_deadline(
+        zone, state.last_low_moisture_alert_at
+    )
+
+
+def backfill_zone_states(db: Session) -> int:
+    zones = db.query(Zone).filter(~Zone.state.has()).all()
+    for zone in zones:
+        state = get_state(db, zone)
+
+        reading = (
+            db.query(Reading)
+            .filter(Reading.zone_id == zone.id)
+            .order_by(desc(Reading.created_at))
+            .first()
+        )
+        if reading is not None:
+            record_reading(state, reading)
+
+        event = (
+            db.query(PumpEvent)
+            .filter(PumpEvent.zone_id == zone.id)
+            .order_by(desc(PumpEvent.created_at))
+            .first()
+        )
+        if event is not None:
+            record_pump_event(state, zone, event)
+
+        for alert_type in ALERT_TYPES:
+            alert = (
+                db.query(AlertEvent)
+                .filter(AlertEvent.zone_id == zone.id, AlertEvent.alert_type == alert_type)
+                .order_by(desc(AlertEvent.created_at))
+                .first()
+            )
+            if alert is not None:
+                record_alert(state, zone, alert)
+
+    db.commit()
+    return len(zones)
+
+
+def _cooldown_deadline(zone: Zone | ZoneConfig, since: Optional[datetime]) -> Optional[datetime]:
+    if since is None:
+        return None
+    return since + timedelta(hours=zone.cooldown_hours)
@@ -0,0 +1,131 @@
+"""Latency of read endpoints under many concurrent clients.
+
+Starts uvicorn against a seeded temporary database and drives it with
+concurrent httpx clients. Run from the backend directory:
+
+    python -m benchmarks.bench_concurrency --clients 100 --requests 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from app.db.session import make_engine
+from benchmarks.seed import seed
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def drive(base_url: str, paths, clients: int, requests: int):
+    latencies = {path: [] for path in paths}
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        for index in counter:
+            path = paths[index % len(paths)]
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies[path].append((time.perf_counter() - started) * 1000)
+            if not ok:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=50)
+    parser.add_argument("--readings", type=int, default=50000)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--paths", default="/api/readings?limit=100,/api/status,/api/alerts")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    paths = args.paths.split(",")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "waterpal.db")
+        engine = make_engine(f"sqlite:///{db_path}")
+        seed(engine, args.zones, args.readings)
+        engine.dispose()
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(BACKEND_DIR),
+            "DATABASE_URL": f"sqlite:///{db_path}",
+            "SIMULATE_SENSORS": "true",
+            "SIMULATE_PUMPS": "true",
+            "READ_INTERVAL_HOURS": "1000",
+            "SAMPLE_MIN_INTERVAL_MINUTES": "60000",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--log-level", "warning"],
+            cwd=tmp,
+            env=env,
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            for _ in range(100):
+                try:
+                    if httpx.get(f"{base_url}/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            latencies, errors, elapsed = asyncio.run(
+                drive(base_url, paths, args.clients, args.requests)
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = {
+        "clients": args.clients,
+        "requests": args.requests,
+        "errors": errors,
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "endpoints": {
+            path: {
+                "p50_ms": round(statistics.median(values), 1),
+                "p95_ms": round(percentile(values, 0.95), 1),
+                "p99_ms": round(percentile(values, 0.99), 1),
+            }
+            for path, values in latencies.items()
+            if values
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
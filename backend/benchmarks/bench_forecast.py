@@ -0,0 +1,80 @@
+"""Time the vectorized drying-rate forecaster against a per-zone Python fit.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_forecast --zones 5000 --samples 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.services.forecast import DryingForecaster
+
+
+def _samples(zones: int, samples: int):
+    start = datetime(2026, 1, 1)
+    rates = [random.uniform(0, 400) for _ in range(zones)]
+    return [
+        (
+            zone_id,
+            int(30000 - rates[zone_id] * hour + random.gauss(0, 50)),
+            start + timedelta(hours=hour),
+        )
+        for hour in range(samples)
+        for zone_id in range(zones)
+    ]
+
+
+def _python_fit(rows, thresholds, now):
+    series = {}
+    for zone_id, value, created_at in rows:
+        series.setdefault(zone_id, []).append(((created_at - now).total_seconds() / 3600, value))
+    results = {}
+    for zone_id, points in series.items():
+        n = len(points)
+        mean_t = sum(t for t, _ in points) / n
+        mean_v = sum(v for _, v in points) / n
+        cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+        var = sum((t - mean_t) ** 2 for t, _ in points)
+        slope = cov / var if var else 0.0
+        predicted = mean_v - slope * mean_t
+        results[zone_id] = (predicted - thresholds[zone_id]) / -slope if slope < 0 else None
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=24)
+    args = parser.parse_args()
+
+    random.seed(1)
+    rows = _samples(args.zones, args.samples)
+    now = rows[-1][2]
+    thresholds = {zone_id: 16000 for zone_id in range(args.zones)}
+
+    model = DryingForecaster(window_hours=24, reset_jump=500, min_samples=3)
+    started = time.perf_counter()
+    model.observe_many(rows)
+    observe_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    model.forecast_many(list(thresholds.items()), now)
+    forecast_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    _python_fit(rows, thresholds, now)
+    python_ms = (time.perf_counter() - started) * 1000
+
+    print(f"zones={args.zones} samples/zone={args.samples}")
+    print(f"vectorized observe:  {observe_ms:8.1f} ms")
+    print(f"vectorized forecast: {forecast_ms:8.1f} ms")
+    print(f"python refit:        {python_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Payload size and encode time of the /api/readings response formats.
+
+Each window of N synthetic readings is encoded as the row JSON page (the
+jsonable_encoder + JSONResponse path FastAPI takes for response models), as
+columnar JSON and as msgpack. The report holds the median encode time, the
+raw size and the gzip size at the configured GZIP_LEVEL. Run from the backend
+directory:
+
+    python -m benchmarks.bench_formats --points 10000,100000 --zones 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.formats import encode_columnar, encode_msgpack, series_from_rows
+from app.api.schemas import Page, ReadingOut
+from app.config import settings
+
+
+class Row(NamedTuple):
+    id: int
+    zone_id: int
+    value: int
+    created_at: datetime
+
+
+def make_rows(points: int, zones: int) -> List[Row]:
+    start = datetime(2026, 1, 1)
+    rows = [
+        Row(i + 1, i % zones + 1, 15000 + (i * 37) % 4000, start + timedelta(seconds=30 * i))
+        for i in range(points)
+    ]
+    rows.reverse()
+    return rows
+
+
+def measure(encode: Callable[[], bytes], iterations: int) -> Dict:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        body = encode()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "encode_ms": round(statistics.median(timings), 2),
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, compresslevel=settings.gzip_level)),
+    }
+
+
+def run(points: int, zones: int, iterations: int) -> Dict:
+    rows = make_rows(points, zones)
+    items = [ReadingOut.model_validate(row, from_attributes=True) for row in rows]
+    page = Page[ReadingOut](items=items, next_cursor=None)
+    return {
+        "rows_json": measure(lambda: JSONResponse(jsonable_encoder(page)).body, iterations),
+        "columnar_json": measure(
+            lambda: encode_columnar(series_from_rows(rows), None), iterations
+        ),
+        "msgpack": measure(lambda: encode_msgpack(series_from_rows(rows), None), iterations),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", default="10000,100000")
+    parser.add_argument("--zones", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {
+        points: run(points, args.zones, args.iterations)
+        for points in (int(value) for value in args.points.split(","))
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
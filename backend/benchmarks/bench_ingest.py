@@ -0,0 +1,101 @@
+"""Compare per-row ORM inserts with the bulk write-behind ingest path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_ingest --readings 20000 --zones 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.init_db import init_db
+from app.models import Reading, Zone
+from app.services.ingest import PendingReading, ReadingIngestBuffer
+
+
+def _setup(path: str, zones: int):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    init_db(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    db.add_all(
+        Zone(
+            name=f"Zone {i}",
+            threshold=16000,
+            hysteresis=800,
+            cooldown_hours=4,
+            water_duration_sec=10,
+            sensor_channel=i % 4,
+            enabled=True,
+        )
+        for i in range(zones)
+    )
+    db.commit()
+    db.close()
+    return engine, session_factory
+
+
+def _samples(readings: int, zones: int):
+    start = datetime(2026, 1, 1)
+    return [
+        (f"bench:{i}", i % zones + 1, 15000 + i % 700, start + timedelta(seconds=i))
+        for i in range(readings)
+    ]
+
+
+def bench_orm(session_factory, samples, commit_every: int) -> float:
+    db = session_factory()
+    started = time.perf_counter()
+    for index, (client_id, zone_id, value, created_at) in enumerate(samples, start=1):
+        db.add(Reading(client_id=client_id, zone_id=zone_id, value=value, created_at=created_at))
+        if index % commit_every == 0:
+            db.commit()
+    db.commit()
+    elapsed = time.perf_counter() - started
+    db.close()
+    return elapsed
+
+
+def bench_bulk(session_factory, samples, batch_size: int) -> float:
+    buffer = ReadingIngestBuffer(session_factory, batch_size=batch_size, max_pending=len(samples))
+    pending = [PendingReading(*sample) for sample in samples]
+    started = time.perf_counter()
+    buffer.submit(pending)
+    buffer.flush()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readings", type=int, default=20000)
+    parser.add_argument("--zones", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--orm-commit-every", type=int, default=1)
+    args = parser.parse_args()
+
+    samples = _samples(args.readings, args.zones)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name in ("orm", "bulk"):
+            engine, session_factory = _setup(os.path.join(tmp, f"{name}.db"), args.zones)
+            if name == "orm":
+                elapsed = bench_orm(session_factory, samples, args.orm_commit_every)
+            else:
+                elapsed = bench_bulk(session_factory, samples, args.batch_size)
+            engine.dispose()
+            results[name] = elapsed
+            print(f"{name:>5}: {elapsed:8.3f}s  {args.readings / elapsed:10.0f} readings/s")
+
+    print(f"speedup: {results['orm'] / results['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Replay months of simulated watering against a real SQLite database.
+
+Zones get their own sensor channel and pump, soil dries on a virtual clock and
+the pump wets it, so the sampling scheduler, run_monitoring_cycle and the pump
+engine all run against realistic data. The report holds weekly cycle latency
+percentiles and queries per cycle, so slowdowns as history grows show up as a
+trend. Pass --database to keep the generated dataset. Run from the backend
+directory:
+
+    python -m benchmarks.bench_replay --days 90 --zones 20 --seed 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.init_db import init_db
+from app.db.profiling import profiler
+from app.db.session import make_engine
+from app.models import Reading, Zone
+from app.services.replay import ReplayReport, replay
+from app.services.simulation import FAULT_KINDS, SoilSimulator, VirtualClock
+
+START = datetime(2026, 4, 1)
+FIRST_GPIO = 100
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def weekly(report: ReplayReport) -> List[Dict]:
+    weeks: Dict[int, List[int]] = {}
+    for index, at in enumerate(report.cycle_at):
+        weeks.setdefault((at - START).days // 7, []).append(index)
+    return [
+        {
+            "week": week,
+            "cycles": len(indexes),
+            "p50_ms": round(percentile([report.cycle_ms[i] for i in indexes], 0.5), 2),
+            "p95_ms": round(percentile([report.cycle_ms[i] for i in indexes], 0.95), 2),
+            "queries": round(statistics.mean(report.cycle_queries[i] for i in indexes), 1),
+        }
+        for week, indexes in sorted(weeks.items())
+    ]
+
+
+def run(url: str, days: int, zones: int, seed: int, faults: int) -> Dict:
+    engine = make_engine(url)
+    init_db(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Zone),
+            [
+                {
+                    "name": f"Zone {i}",
+                    "threshold": 16000,
+                    "hysteresis": 800,
+                    "cooldown_hours": 4,
+                    "water_duration_sec": 10,
+                    "sensor_channel": i,
+                    "pump_gpio": FIRST_GPIO + i,
+                    "enabled": True,
+                }
+                for i in range(zones)
+            ],
+        )
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    clock = VirtualClock(START)
+    simulator = SoilSimulator(
+        seed=seed,
+        now=clock.now,
+        gpio_channels={FIRST_GPIO + i: [i] for i in range(zones)},
+    )
+    for index in range(faults):
+        simulator.inject_fault(index % zones, FAULT_KINDS[index % len(FAULT_KINDS)], 6 * 3600)
+
+    profiling = profiler.enabled
+    profiler.enabled = True
+    try:
+        report = replay(session_factory, simulator, clock, START + timedelta(days=days))
+    finally:
+        profiler.enabled = profiling
+
+    with session_factory() as db:
+        stored = db.execute(select(func.count()).select_from(Reading)).scalar_one()
+    engine.dispose()
+    return {
+        "days": days,
+        "zones": zones,
+        "seed": seed,
+        "wall_sec": round(report.wall_sec, 2),
+        "simulated_per_wall_sec": round(days * 86400 / report.wall_sec),
+        "cycles": report.cycles,
+        "readings": report.readings,
+        "readings_stored": stored,
+        "pumps": report.pumps,
+        "weeks": weekly(report),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--faults", type=int, default=0)
+    parser.add_argument("--database")
+    args = parser.parse_args()
+
+    if args.database:
+        result = run(f"sqlite:///{args.database}", args.days, args.zones, args.seed, args.faults)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'waterpal.db')}"
+            result = run(url, args.days, args.zones, args.seed, args.faults)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Time a cold process start: importing app.main plus running on_startup.
+
+Each boot runs in a fresh interpreter against the same database file, so the
+first boot applies every migration and later boots take the current-schema
+fast path. Run from the backend directory:
+
+    python -m benchmarks.bench_startup --boots 5 --zones 100 --readings 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.seed import seed
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+from app.db.profiling import profiler
+with profiler.profile() as stats:
+    main.on_startup()
+booted = time.perf_counter()
+main.on_shutdown()
+drivers = sorted(name for name in ("smbus2", "explorerhat", "gpiozero") if name in sys.modules)
+print(json.dumps({
+    "import_ms": round((imported - started) * 1000, 1),
+    "startup_ms": round((booted - imported) * 1000, 1),
+    "queries": stats.count,
+    "drivers_imported": drivers,
+}))
+"""
+
+
+def boot(url: str) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": url,
+        "DB_PROFILING": "true",
+        "SIMULATE_SENSORS": "true",
+        "SIMULATE_PUMPS": "true",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--boots", type=int, default=5)
+    parser.add_argument("--zones", type=int, default=0)
+    parser.add_argument("--readings", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'waterpal.db')}"
+        first = boot(url)
+        if args.zones:
+            from app.db.session import make_engine
+
+            engine = make_engine(url)
+            seed(engine, args.zones, args.readings)
+            engine.dispose()
+        warm = [boot(url) for _ in range(args.boots)]
+
+    summary = {
+        "first_boot": first,
+        "current_schema": {
+            key: round(statistics.median(run[key] for run in warm), 1)
+            for key in ("import_ms", "startup_ms", "queries")
+        },
+        "drivers_imported": sorted({name for run in warm for name in run["drivers_imported"]}),
+    }
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
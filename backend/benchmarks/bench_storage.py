@@ -0,0 +1,122 @@
+"""Mixed read/write throughput for the default and tuned SQLite profiles.
+
+Writer threads insert readings one transaction at a time, as the scheduler,
+pump engine and ingest flushes do. Reader threads concurrently page through
+recent readings, as the API does. Run from the backend directory:
+
+    python -m benchmarks.bench_storage --seconds 10 --readers 8 --writers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import desc, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import make_engine
+from app.models import Reading
+from benchmarks.seed import seed
+
+
+def run_profile(tuned: bool, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'waterpal.db')}", tuned=tuned)
+        seed(engine, args.zones, args.readings)
+        session_factory = sessionmaker(autoflush=False, bind=engine)
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        read_latencies = []
+
+        def reader(zone_offset: int) -> None:
+            zone_id = zone_offset % args.zones + 1
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    with session_factory() as db:
+                        db.scalars(
+                            select(Reading)
+                            .where(Reading.zone_id == zone_id)
+                            .order_by(desc(Reading.created_at), desc(Reading.id))
+                            .limit(100)
+                        ).all()
+                except (OperationalError, PoolTimeoutError):
+                    with lock:
+                        counts["errors"] += 1
+                    continue
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    counts["reads"] += 1
+                    read_latencies.append(elapsed)
+
+        def writer(zone_offset: int) -> None:
+            index = 0
+            while not stop.is_set():
+                index += 1
+                try:
+                    with session_factory() as db:
+                        db.add(
+                            Reading(
+                                zone_id=(zone_offset + index) % args.zones + 1,
+                                value=15000 + index % 900,
+                                created_at=datetime.utcnow(),
+                            )
+                        )
+                        db.commit()
+                except (OperationalError, PoolTimeoutError):
+                    with lock:
+                        counts["errors"] += 1
+                    continue
+                with lock:
+                    counts["writes"] += 1
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    ordered = sorted(read_latencies) or [0.0]
+    return {
+        "reads_per_sec": round(counts["reads"] / args.seconds, 1),
+        "writes_per_sec": round(counts["writes"] / args.seconds, 1),
+        "errors": counts["errors"],
+        "read_p50_ms": round(statistics.median(ordered), 2),
+        "read_p99_ms": round(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=50)
+    parser.add_argument("--readings", type=int, default=50000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    report = {"default": run_profile(False, args), "tuned": run_profile(True, args)}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Cycle, status and history latency at several data scales.
+
+Each scale (zones x readings) is seeded into a temporary SQLite database.
+run_monitoring_cycle runs in simulate mode and the read endpoints are driven
+through TestClient. The data version is bumped before every timed request so
+the endpoints are measured against the database rather than the response
+cache; endpoints served from that cache are reported a second time with a
+"[cached]" suffix. The report holds latency percentiles, queries per call
+and peak traced memory per operation. Save a baseline and compare later runs
+against it from the backend directory:
+
+    python -m benchmarks.bench_suite --scales 10x10000,100x100000 --output base.json
+    python -m benchmarks.bench_suite --scales 10x10000,100x100000 --compare base.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.router import get_async_db, get_db
+from app.db.session import make_async_engine, make_engine
+from app.main import app
+from app.services.data_version import data_version
+from app.services.monitoring import run_monitoring_cycle
+from app.services.pump_engine import PumpEngine
+from app.services.sensor_manager import SensorManager
+from app.services.zone_cache import zone_cache
+from benchmarks.seed import seed
+
+ENDPOINTS = (
+    "/api/zones",
+    "/api/status",
+    "/api/readings?limit=500",
+    "/api/readings?zone_id=1&limit=500",
+    "/api/alerts",
+)
+CACHED_ENDPOINTS = ("/api/zones", "/api/status", "/api/alerts")
+
+
+class SimulatedPumps:
+    def start(self, gpio_pin) -> bool:
+        return gpio_pin is not None
+
+    def stop(self, gpio_pin) -> bool:
+        return gpio_pin is not None
+
+
+class QueryCounter:
+    def __init__(self, *engines) -> None:
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+@contextmanager
+def _client(session_factory, async_session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.state.session_factory = session_factory
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+
+
+def measure(
+    call: Callable[[], object],
+    counter: QueryCounter,
+    iterations: int,
+    setup: Optional[Callable[[], object]] = None,
+) -> Dict:
+    setup = setup or (lambda: None)
+    setup()
+    call()
+    latencies: List[float] = []
+    for _ in range(iterations):
+        setup()
+        started = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    setup()
+    before = counter.count
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 2),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))], 2),
+        "queries": counter.count - before,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_scale(zones: int, readings: int, iterations: int) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'waterpal.db')}"
+        engine = make_engine(url)
+        started = time.perf_counter()
+        seed(engine, zones, readings)
+        seed_sec = time.perf_counter() - started
+
+        async_engine = make_async_engine(url, poolclass=NullPool)
+        session_factory = sessionmaker(autoflush=False, bind=engine)
+        async_session_factory = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+        counter = QueryCounter(engine, async_engine.sync_engine)
+        zone_cache.invalidate()
+
+        sensors = SensorManager(simulate=True)
+        pumps = PumpEngine(SimulatedPumps(), session_factory, max_active=zones)
+
+        def cycle() -> None:
+            db = session_factory()
+            try:
+                run_monitoring_cycle(db, sensors, pumps)
+            finally:
+                db.close()
+
+        results = {"seed_sec": round(seed_sec, 1)}
+        try:
+            results["run_monitoring_cycle"] = measure(cycle, counter, iterations)
+            with _client(session_factory, async_session_factory) as client:
+                for path in ENDPOINTS:
+
+                    def get(path=path) -> None:
+                        response = client.get(path)
+                        response.raise_for_status()
+
+                    results[path] = measure(get, counter, iterations, data_version.bump)
+                    if path in CACHED_ENDPOINTS:
+                        results[f"{path} [cached]"] = measure(get, counter, iterations)
+        finally:
+            pumps.shutdown()
+            sensors.shutdown()
+            zone_cache.invalidate()
+            engine.dispose()
+        return results
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    regressions = []
+    for scale, operations in report["scales"].items():
+        for name, current in operations.items():
+            previous = baseline.get("scales", {}).get(scale, {}).get(name)
+            if not isinstance(current, dict) or not isinstance(previous, dict):
+                continue
+            if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{scale} {name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms"
+                )
+            if current["queries"] > previous["queries"]:
+                regressions.append(
+                    f"{scale} {name}: queries {previous['queries']} -> {current['queries']}"
+                )
+    return regressions
+
+
+def parse_scales(value: str) -> List[Tuple[int, int]]:
+    scales = []
+    for item in value.split(","):
+        zones, readings = item.lower().split("x")
+        scales.append((int(zones), int(readings)))
+    return scales
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="10x10000,100x100000")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = {
+        "iterations": args.iterations,
+        "scales": {
+            f"{zones}x{readings}": run_scale(zones, readings, args.iterations)
+            for zones, readings in parse_scales(args.scales)
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
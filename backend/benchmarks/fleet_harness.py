@@ -0,0 +1,189 @@
+"""Simulate a fleet of edge nodes catching up with one aggregator.
+
+Every edge is a separate process with its own SQLite database. Edges run
+monitoring cycles while the aggregator is still down, which builds up an
+outbox backlog, and then drain it in batches. A share of acknowledgements
+is dropped on purpose so that edges resend batches the aggregator already
+stored. The report compares events generated on the edges with events
+stored at the aggregator. Run from the backend directory:
+
+    python -m benchmarks.fleet_harness --edges 24 --cycles 200 --offline-sec 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.init_db import init_db
+from app.db.session import make_engine
+from app.models import OutboxEntry, Zone
+from app.services.monitoring import run_monitoring_cycle
+from app.services.outbox import OutboxSyncer, http_sender, outbox
+from app.services.pump_engine import PumpEngine
+from app.services.sensor_manager import SensorManager
+from app.services.zone_cache import zone_cache
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class SimulatedPumps:
+    def start(self, gpio_pin) -> bool:
+        return gpio_pin is not None
+
+    def stop(self, gpio_pin) -> bool:
+        return gpio_pin is not None
+
+
+def run_edge(index: int, args, base_url: str, tmp: str, results) -> None:
+    outbox.enabled = True
+    zone_cache.invalidate()
+    engine = make_engine(f"sqlite:///{os.path.join(tmp, f'edge-{index:02d}.db')}")
+    init_db(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Zone),
+            [
+                {
+                    "name": f"Edge {index} zone {zone}",
+                    "threshold": 16000,
+                    "hysteresis": 800,
+                    "cooldown_hours": 4,
+                    "water_duration_sec": 10,
+                    "sensor_channel": zone % 4,
+                    "pump_gpio": 17 + zone,
+                    "enabled": True,
+                }
+                for zone in range(args.zones)
+            ],
+        )
+    session_factory = sessionmaker(autoflush=False, bind=engine)
+    sensors = SensorManager(simulate=True)
+    pumps = PumpEngine(SimulatedPumps(), session_factory, max_active=args.zones)
+
+    started = datetime.utcnow() - timedelta(minutes=15 * args.cycles)
+    db = session_factory()
+    try:
+        for cycle in range(args.cycles):
+            run_monitoring_cycle(
+                db, sensors, pumps, now=started + timedelta(minutes=15 * cycle)
+            )
+        generated = db.scalar(select(func.count()).select_from(OutboxEntry))
+    finally:
+        db.close()
+        pumps.shutdown()
+        sensors.shutdown()
+
+    send = http_sender(base_url, timeout=60)
+    rng = random.Random(index)
+
+    def lossy(body: bytes) -> dict:
+        ack = send(body)
+        if rng.random() < args.drop_acks:
+            raise TimeoutError("ack dropped by harness")
+        return ack
+
+    syncer = OutboxSyncer(
+        session_factory, lossy, node_id=f"edge-{index:02d}", batch_size=args.batch_size
+    )
+    sync_started = time.perf_counter()
+    failures = 0
+    while True:
+        try:
+            syncer.sync_once()
+            break
+        except Exception:
+            failures += 1
+            time.sleep(min(5.0, 0.2 * 2 ** min(failures, 5)))
+    results.put(
+        {
+            "edge": index,
+            "generated": generated,
+            "failures": failures,
+            "drain_sec": round(time.perf_counter() - sync_started, 2),
+        }
+    )
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=24)
+    parser.add_argument("--zones", type=int, default=8)
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--drop-acks", type=float, default=0.1)
+    parser.add_argument("--offline-sec", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = multiprocessing.Queue()
+        edges = [
+            multiprocessing.Process(target=run_edge, args=(index, args, base_url, tmp, results))
+            for index in range(args.edges)
+        ]
+        started = time.perf_counter()
+        for edge in edges:
+            edge.start()
+
+        time.sleep(args.offline_sec)
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(BACKEND_DIR),
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'aggregator.db')}",
+            "NODE_MODE": "aggregator",
+            "SIMULATE_SENSORS": "true",
+            "SIMULATE_PUMPS": "true",
+            "SAMPLE_MIN_INTERVAL_MINUTES": "60000",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--log-level", "warning"],
+            cwd=tmp,
+            env=env,
+        )
+        try:
+            reports = [results.get() for _ in edges]
+            for edge in edges:
+                edge.join()
+            elapsed = time.perf_counter() - started
+            nodes = httpx.get(f"{base_url}/api/fleet/status", timeout=60).json()
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    generated = sum(report["generated"] for report in reports)
+    stored = sum(node["events_total"] for node in nodes)
+    report = {
+        "edges": args.edges,
+        "events_generated": generated,
+        "events_stored": stored,
+        "duplicates_rejected": sum(node["duplicates_total"] for node in nodes),
+        "lost": generated - stored,
+        "sync_failures": sum(report["failures"] for report in reports),
+        "max_drain_sec": max(report["drain_sec"] for report in reports),
+        "elapsed_sec": round(elapsed, 1),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
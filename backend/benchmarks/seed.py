@@ -0,0 +1,87 @@
+"""Bulk seeding of zones, readings, pump events and alerts for benchmarks."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.init_db import init_db
+from app.models import AlertEvent, PumpEvent, Reading, Zone
+from app.services.rollups import backfill_rollups
+from app.services.zone_state import backfill_zone_states
+
+CHUNK = 50000
+
+
+def seed(engine, zones: int, readings: int, step: timedelta = timedelta(minutes=1)) -> None:
+    init_db(engine)
+    start = datetime.utcnow() - step * readings
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Zone),
+            [
+                {
+                    "name": f"Zone {i}",
+                    "threshold": 16000,
+                    "hysteresis": 800,
+                    "cooldown_hours": 4,
+                    "water_duration_sec": 10,
+                    "sensor_channel": i % 4,
+                    "pump_gpio": 17 + i % 8,
+                    "enabled": True,
+                }
+                for i in range(zones)
+            ],
+        )
+    _insert_chunked(
+        engine,
+        Reading,
+        readings,
+        lambda i: {
+            "zone_id": i % zones + 1,
+            "value": 15000 + i % 900,
+            "created_at": start + step * i,
+        },
+    )
+    _insert_chunked(
+        engine,
+        PumpEvent,
+        readings // 200,
+        lambda i: {
+            "zone_id": i % zones + 1,
+            "action": "auto",
+            "reason": "threshold",
+            "duration_sec": 10,
+            "created_at": start + step * i * 200,
+        },
+    )
+    _insert_chunked(
+        engine,
+        AlertEvent,
+        readings // 100,
+        lambda i: {
+            "zone_id": i % zones + 1,
+            "alert_type": "low_moisture",
+            "message": "dry",
+            "created_at": start + step * i * 100,
+            "acknowledged": i % 2 == 0,
+        },
+    )
+
+    db = sessionmaker(bind=engine)()
+    try:
+        backfill_zone_states(db)
+        backfill_rollups(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _insert_chunked(engine, model, count: int, row) -> None:
+    for offset in range(0, count, CHUNK):
+        with engine.begin() as connection:
+            connection.execute(
+                insert(model), [row(i) for i in range(offset, min(count, offset + CHUNK))]
+            )
@@ -0,0 +1,236 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.router import get_async_db, get_db
+from app.db.init_db import init_db
+from app.db.profiling import profiler
+from app.db.session import make_async_engine, make_engine
+from app.main import app
+from app.models import Zone
+from app.services.cycle_executor import CycleExecutor
+from app.services.data_version import data_version
+from app.services.forecast import forecaster
+from app.services.ingest import ReadingIngestBuffer
+from app.services.recent_readings import recent_readings
+from app.services.pump_engine import PumpEngine
+from app.services.sampling import SamplingScheduler
+from app.services.zone_cache import zone_cache
+
+
+class FakeSensorManager:
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+        self.passes = []
+
+    def read_channel(self, channel):
+        return self.values.get(channel)
+
+    def read_channels(self, channels):
+        channels = list(channels)
+        self.passes.append(channels)
+        return {channel: self.read_channel(channel) for channel in channels}
+
+
+class FakePumpController:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.active = set()
+        self.started = []
+
+    def start(self, gpio_pin):
+        if not self.ok or gpio_pin is None:
+            return False
+        self.active.add(gpio_pin)
+        self.started.append(gpio_pin)
+        return True
+
+    def stop(self, gpio_pin):
+        self.active.discard(gpio_pin)
+        return gpio_pin is not None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture(autouse=True)
+def reset_zone_cache():
+    zone_cache.invalidate()
+    yield
+    zone_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def reset_forecaster():
+    forecaster.clear()
+    yield
+    forecaster.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_recent_readings():
+    recent_readings.clear()
+    yield
+    recent_readings.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_data_version():
+    data_version.clear()
+    yield
+    data_version.clear()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "waterpal.db"
+
+
+@pytest.fixture
+def engine(db_path):
+    engine = make_engine(f"sqlite:///{db_path}")
+    init_db(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine, db_path):
+    return make_async_engine(f"sqlite:///{db_path}", poolclass=NullPool)
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def pump_engine(session_factory, clock):
+    engine = PumpEngine(FakePumpController(), session_factory, max_active=2, clock=clock)
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+def ingest_buffer(session_factory):
+    return ReadingIngestBuffer(session_factory, batch_size=100)
+
+
+@pytest.fixture
+def sensor_manager():
+    return FakeSensorManager()
+
+
+@pytest.fixture
+def cycle_executor(session_factory, sensor_manager, pump_engine):
+    executor = CycleExecutor(session_factory, sensor_manager, pump_engine)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def sampling_scheduler(session_factory, sensor_manager, pump_engine, cycle_executor):
+    return SamplingScheduler(
+        session_factory,
+        sensor_manager,
+        pump_engine,
+        min_interval_sec=900,
+        max_interval_sec=4 * 3600,
+        batch_window_sec=60,
+        executor=cycle_executor,
+    )
+
+
+@pytest.fixture
+def client(
+    async_engine,
+    session_factory,
+    pump_engine,
+    ingest_buffer,
+    cycle_executor,
+    sampling_scheduler,
+):
+    async_session_factory = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    profiling = profiler.enabled
+    profiler.enabled = True
+    with TestClient(app) as test_client:
+        app.state.recent_readings_warm.join()
+        recent_readings.clear()
+        app.state.session_factory = session_factory
+        app.state.pump_engine.shutdown()
+        app.state.pump_engine = pump_engine
+        app.state.ingest_buffer.shutdown()
+        app.state.ingest_buffer = ingest_buffer
+        app.state.sampling_scheduler.shutdown()
+        app.state.sampling_scheduler = sampling_scheduler
+        app.state.cycle_executor.shutdown()
+        app.state.cycle_executor = cycle_executor
+        yield test_client
+    profiler.enabled = profiling
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+def assert_max_queries(client, path, max_queries, method="get", **kwargs):
+    response = client.request(method.upper(), path, **kwargs)
+    count = int(response.headers["X-DB-Query-Count"])
+    assert count <= max_queries, f"{method.upper()} {path} ran {count} queries (max {max_queries})"
+    return response
+
+
+def make_zone(db, **overrides):
+    fields = dict(
+        name="Zone",
+        threshold=16000,
+        hysteresis=800,
+        cooldown_hours=4,
+        water_duration_sec=10,
+        sensor_channel=0,
+        pump_gpio=17,
+        enabled=True,
+    )
+    fields.update(overrides)
+    zone = Zone(**fields)
+    db.add(zone)
+    db.commit()
+    db.refresh(zone)
+    zone_cache.invalidate()
+    return zone
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.services.broadcaster import Broadcaster, broadcaster
+
+
+def test_websocket_receives_filtered_events(client):
+    with client.websocket_connect("/ws?zones=1&topics=readings") as websocket:
+        assert websocket.receive_json() == {"message": "connected"}
+
+        broadcaster.publish("alerts", 1, {"id": 1})
+        broadcaster.publish("readings", 2, {"id": 2})
+        broadcaster.publish("readings", 1, {"id": 3})
+
+        event = websocket.receive_json()
+        assert event == {"topic": "readings", "zone_id": 1, "data": {"id": 3}}
+
+        websocket.send_json({"action": "subscribe", "zones": [2], "topics": ["alerts"]})
+        assert websocket.receive_json()["zones"] == [2]
+        broadcaster.publish("alerts", 2, {"id": 4})
+        assert websocket.receive_json()["data"] == {"id": 4}
+
+
+def test_slow_consumer_is_dropped_without_blocking_publisher():
+    async def scenario():
+        hub = Broadcaster(queue_size=2)
+        hub.bind_loop(asyncio.get_running_loop())
+        slow = hub.subscribe()
+        fast = hub.subscribe(topics=["alerts"])
+
+        for index in range(5):
+            hub.publish("readings", 1, {"id": index})
+        await asyncio.sleep(0)
+
+        assert slow.dropped
+        assert await slow.queue.get() is None
+        assert not fast.dropped
+        assert hub.stats()["slow_consumers_dropped"] == 1
+        assert hub.stats()["subscribers"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,128 @@
+import threading
+
+from conftest import FakeSensorManager, make_zone
+
+from app.models import Reading
+from app.services.cycle_executor import CycleExecutor
+
+
+class GatedSensorManager(FakeSensorManager):
+    def __init__(self, values):
+        super().__init__(values)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def read_channels(self, channels):
+        self.entered.set()
+        self.release.wait(5)
+        return super().read_channels(channels)
+
+
+def test_concurrent_triggers_share_one_cycle(db, session_factory, pump_engine):
+    zones = [make_zone(db, name=f"Zone {i}", sensor_channel=i) for i in range(3)]
+    sensors = GatedSensorManager({0: 20000, 1: 20000, 2: 20000})
+    executor = CycleExecutor(session_factory, sensors, pump_engine)
+    executor.start()
+    try:
+        first = executor.trigger(source="api")
+        assert sensors.entered.wait(5)
+        joined = executor.trigger(source="api")
+        subset = executor.trigger([zones[0].id], source="sampling")
+        assert joined.id == subset.id == first.id
+
+        sensors.release.set()
+        run = executor.wait(first.id, 5)
+    finally:
+        executor.shutdown()
+
+    assert run.status == "completed"
+    assert run.triggers == 3
+    assert run.sources == ["api", "sampling"]
+    assert run.result == {"readings_saved": 3, "pumps_scheduled": 0}
+    assert len(sensors.passes) == 1
+    assert db.query(Reading).count() == 3
+    assert executor.stats()["runs"] == 1
+
+
+def test_uncovered_triggers_merge_into_one_pending_run(db, session_factory, pump_engine):
+    zones = [make_zone(db, name=f"Zone {i}", sensor_channel=i) for i in range(3)]
+    sensors = GatedSensorManager({0: 20000, 1: 20000, 2: 20000})
+    executor = CycleExecutor(session_factory, sensors, pump_engine)
+    executor.start()
+    try:
+        first = executor.trigger([zones[0].id], source="sampling")
+        assert sensors.entered.wait(5)
+        second = executor.trigger([zones[1].id])
+        third = executor.trigger([zones[2].id])
+        assert second.id == third.id != first.id
+        assert third.zone_ids == [zones[1].id, zones[2].id]
+
+        sensors.release.set()
+        run = executor.wait(third.id, 5)
+    finally:
+        executor.shutdown()
+
+    assert run.result["readings_saved"] == 2
+    assert sensors.passes == [[0], [1, 2]]
+    assert executor.stats()["coalesced"] == 1
+
+
+def test_run_cycle_api_triggers_and_polls(client, db, cycle_executor):
+    make_zone(db, sensor_channel=0)
+
+    response = client.post("/api/run-cycle", params={"wait": "false"})
+    assert response.status_code == 202
+    run_id = response.json()["id"]
+    assert client.get(f"/api/cycles/{run_id}").json()["status"] == "queued"
+
+    cycle_executor.drain()
+    run = client.get(f"/api/cycles/{run_id}", params={"wait": 1}).json()
+    assert run["status"] == "completed"
+    assert run["duration_ms"] >= 0
+    assert run["queries"] > 0
+
+    response = client.post("/api/run-cycle")
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert [item["id"] for item in client.get("/api/cycles").json()][1] == run_id
+    assert client.get("/api/cycles/stats").json()["runs"] == 2
+    assert client.get("/api/cycles/missing").status_code == 404
+
+
+def test_failed_cycle_is_reported(session_factory, pump_engine):
+    class BrokenSensors(FakeSensorManager):
+        def read_channels(self, channels):
+            raise RuntimeError("bus error")
+
+    executor = CycleExecutor(session_factory, BrokenSensors(), pump_engine)
+
+    run = executor.run()
+
+    assert run.status == "failed"
+    assert run.error == "bus error"
+    assert executor.stats()["failed"] == 1
+
+
+def test_session_failure_does_not_wedge_the_executor(db, session_factory, pump_engine):
+    make_zone(db, sensor_channel=0)
+    calls = []
+
+    def flaky_sessions():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return session_factory()
+
+    executor = CycleExecutor(flaky_sessions, FakeSensorManager({0: 20000}), pump_engine)
+    executor.start()
+    try:
+        failed = executor.run(timeout=5)
+        retried = executor.run(timeout=5)
+    finally:
+        executor.shutdown()
+
+    assert failed.status == "failed"
+    assert failed.error == "database is locked"
+    assert retried.status == "completed"
+    assert retried.id != failed.id
+    assert executor.stats()["in_flight"] is None
@@ -0,0 +1,62 @@
+from conftest import FakeSensorManager, assert_max_queries, make_zone
+
+from app.models import AlertEvent
+from app.services.data_version import DataVersion
+from app.services.monitoring import run_monitoring_cycle
+
+
+def test_conditional_get_returns_304_without_queries(client, db):
+    make_zone(db)
+
+    for path in ("/api/zones", "/api/status", "/api/alerts"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        again = assert_max_queries(client, path, 0, headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+        cached = assert_max_queries(client, path, 0)
+        assert cached.status_code == 200
+        assert cached.content == response.content
+
+
+def test_writes_bump_the_version(client, db, pump_engine):
+    zone = make_zone(db, sensor_channel=0)
+    etag = client.get("/api/status").headers["etag"]
+
+    run_monitoring_cycle(db, FakeSensorManager({0: 12000}), pump_engine)
+    response = client.get("/api/status", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["latest_reading"]["value"] == 12000
+
+    etag = client.get("/api/alerts").headers["etag"]
+    alert = db.query(AlertEvent).one()
+    client.post(f"/api/alerts/{alert.id}/ack")
+    response = client.get("/api/alerts", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["acknowledged"] is True
+
+    etag = response.headers["etag"]
+    client.patch(f"/api/zones/{zone.id}", json={"threshold": 12345})
+    assert client.get("/api/zones", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_body_cache_is_per_version_and_bounded():
+    cache = DataVersion(max_bodies=2)
+    version = cache.current
+    for key in ("a", "b", "c"):
+        cache.store(key, version, key.encode())
+
+    assert cache.body("a", version) is None
+    assert cache.body("c", version) == b"c"
+    assert cache.matches(cache.etag(version), version)
+    assert cache.matches(f"W/\"other\", {cache.etag(version)}", version)
+
+    cache.bump()
+    assert cache.body("c", version) is None
+    assert not cache.matches(cache.etag(version), cache.current)
+    cache.store("c", version, b"stale")
+    assert cache.stats()["bodies"] == 0
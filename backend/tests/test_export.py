@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from conftest import make_zone
+
+from app.models import AlertEvent, PumpEvent, Reading
+
+
+def test_export_readings_ndjson_streams_all_rows(client, db):
+    zone = make_zone(db)
+    other = make_zone(db, name="Other", sensor_channel=1)
+    start = datetime(2026, 1, 1)
+    db.add_all(
+        Reading(zone_id=zone.id, value=i, created_at=start + timedelta(minutes=i))
+        for i in range(2500)
+    )
+    db.add(Reading(zone_id=other.id, value=1, created_at=start))
+    db.commit()
+
+    response = client.get("/api/readings/export", params={"zone_id": zone.id})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 2500
+    assert rows[0]["value"] == 0
+    assert rows[-1]["created_at"] == (start + timedelta(minutes=2499)).isoformat()
+
+
+def test_export_alerts_csv_with_filters(client, db):
+    zone = make_zone(db)
+    db.add(AlertEvent(zone_id=zone.id, alert_type="low_moisture", message="dry, very"))
+    db.add(AlertEvent(zone_id=zone.id, alert_type="pump_failed", message="pump"))
+    db.commit()
+
+    response = client.get(
+        "/api/alerts/export", params={"format": "csv", "alert_type": "low_moisture"}
+    )
+
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0][:4] == ["id", "zone_id", "alert_type", "message"]
+    assert len(rows) == 2
+    assert rows[1][3] == "dry, very"
+
+
+def test_export_pump_events_accepts_aware_start(client, db):
+    zone = make_zone(db)
+    start = datetime(2026, 1, 1, 12)
+    db.add_all(
+        PumpEvent(
+            zone_id=zone.id,
+            action="manual",
+            reason="manual",
+            duration_sec=5,
+            created_at=start + timedelta(hours=i),
+        )
+        for i in range(3)
+    )
+    db.commit()
+
+    response = client.get(
+        "/api/pump-events/export", params={"start": "2026-01-01T14:30:00+01:00"}
+    )
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["created_at"] for row in rows] == ["2026-01-01T14:00:00"]
@@ -0,0 +1,127 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import FakeSensorManager, make_zone
+from sqlalchemy import func, select
+
+from app.main import app
+from app.models import FleetEvent, OutboxEntry
+from app.services.monitoring import run_monitoring_cycle
+from app.services.outbox import OutboxSyncer, outbox
+
+
+@pytest.fixture
+def edge(monkeypatch):
+    monkeypatch.setattr(outbox, "enabled", True)
+
+
+@pytest.fixture
+def aggregator(client, monkeypatch):
+    monkeypatch.setattr(app.state, "node_mode", "aggregator", raising=False)
+
+    def send(body):
+        response = client.post(
+            "/api/fleet/sync", content=body, headers={"Content-Encoding": "gzip"}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    return send
+
+
+def _pending(db):
+    return db.scalar(select(func.count()).select_from(OutboxEntry))
+
+
+def test_edge_cycle_appends_to_outbox_and_syncs(
+    edge, aggregator, client, db, session_factory, pump_engine
+):
+    zone = make_zone(db, name="Bench", sensor_channel=0)
+    run_monitoring_cycle(db, FakeSensorManager({0: 12000}), pump_engine)
+    assert _pending(db) == 2
+
+    syncer = OutboxSyncer(session_factory, aggregator, node_id="greenhouse-1", batch_size=100)
+    assert syncer.sync_once() == 2
+    assert _pending(db) == 0
+
+    nodes = client.get("/api/fleet/status").json()
+    assert [node["node_id"] for node in nodes] == ["greenhouse-1"]
+    assert nodes[0]["events_total"] == 2
+    assert nodes[0]["zones"][0]["zone_id"] == zone.id
+    assert nodes[0]["zones"][0]["zone_name"] == "Bench"
+    assert nodes[0]["zones"][0]["latest_value"] == 12000
+    assert nodes[0]["zones"][0]["last_alert_at"] is not None
+
+
+def test_lost_acks_and_outages_do_not_duplicate(
+    edge, aggregator, client, db, session_factory, pump_engine
+):
+    make_zone(db, sensor_channel=0)
+    for _ in range(5):
+        run_monitoring_cycle(db, FakeSensorManager({0: 20000}), pump_engine)
+
+    calls = []
+
+    def flaky(body):
+        calls.append(body)
+        if len(calls) == 1:
+            raise ConnectionError("aggregator unreachable")
+        ack = aggregator(body)
+        if len(calls) == 2:
+            raise TimeoutError("ack lost")
+        return ack
+
+    syncer = OutboxSyncer(session_factory, flaky, node_id="edge", batch_size=2)
+    with pytest.raises(ConnectionError):
+        syncer.sync_once()
+    with pytest.raises(TimeoutError):
+        syncer.sync_once()
+    assert _pending(db) == 5
+
+    assert syncer.sync_once() == 5
+    assert _pending(db) == 0
+    assert db.scalar(select(func.count()).select_from(FleetEvent)) == 5
+    node = client.get("/api/fleet/status").json()[0]
+    assert node["events_total"] == 5
+    assert node["duplicates_total"] == 2
+
+
+def _queue_readings(db, zone_id, first, count):
+    start = datetime(2026, 1, 1)
+    outbox.record_many(
+        db,
+        (
+            (
+                "readings",
+                zone_id,
+                {"id": i, "zone_id": zone_id, "value": 15000, "created_at": start + timedelta(i)},
+            )
+            for i in range(first, first + count)
+        ),
+    )
+    db.commit()
+
+
+def test_drained_outbox_does_not_reuse_acked_seqs(edge, aggregator, client, db, session_factory):
+    zone = make_zone(db)
+    syncer = OutboxSyncer(session_factory, aggregator, node_id="edge", batch_size=100)
+    _queue_readings(db, zone.id, 0, 500)
+    assert syncer.sync_once() == 500
+
+    _queue_readings(db, zone.id, 500, 250)
+    assert min(db.scalars(select(OutboxEntry.id))) == 501
+    assert syncer.sync_once() == 250
+
+    assert _pending(db) == 0
+    assert db.scalar(select(func.count()).select_from(FleetEvent)) == 750
+    node = client.get("/api/fleet/status").json()[0]
+    assert node["events_total"] == 750
+    assert node["last_seq"] == 750
+
+
+def test_sync_rejected_outside_aggregator_mode(client):
+    body = gzip.compress(json.dumps({"node_id": "x", "events": []}).encode())
+    response = client.post("/api/fleet/sync", content=body, headers={"Content-Encoding": "gzip"})
+    assert response.status_code == 404
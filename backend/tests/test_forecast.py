@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+from conftest import make_zone
+
+from app.services.forecast import DryingForecaster, forecaster
+from app.services.sampling import SamplingScheduler
+
+START = datetime(2026, 5, 1, 6, 0)
+
+
+def _series(zone_id, start_value, rate, hours):
+    return [
+        (zone_id, start_value - rate * hour, START + timedelta(hours=hour))
+        for hour in range(hours)
+    ]
+
+
+def test_fits_every_zone_in_one_pass():
+    model = DryingForecaster(window_hours=24, reset_jump=500, min_samples=3)
+    model.observe_many(_series(1, 20000, 100, 10) + _series(2, 30000, 0, 10))
+
+    drying, flat, unknown = model.forecast_many(
+        [(1, 16000), (2, 16000), (3, 16000)], START + timedelta(hours=9)
+    )
+
+    assert drying.samples == 10
+    assert drying.drying_rate_per_hour == 100
+    assert drying.predicted_value == 19100
+    assert drying.hours_to_threshold == 31
+    assert drying.threshold_at == START + timedelta(hours=40)
+    assert flat.drying_rate_per_hour == 0
+    assert flat.threshold_at is None
+    assert unknown.samples == 0
+    assert unknown.drying_rate_per_hour is None
+
+
+def test_watering_jump_restarts_the_fit():
+    model = DryingForecaster(window_hours=24, reset_jump=500, min_samples=3)
+    model.observe_many(_series(1, 17000, 100, 5))
+    model.observe(1, 25000, START + timedelta(hours=5))
+
+    forecast = model.forecast(1, 16000, START + timedelta(hours=5))
+
+    assert forecast.samples == 1
+    assert forecast.drying_rate_per_hour is None
+
+
+def test_out_of_order_samples_are_ignored():
+    model = DryingForecaster(window_hours=24, reset_jump=500, min_samples=3)
+    model.observe_many(_series(1, 20000, 100, 4))
+    model.observe(1, 10000, START + timedelta(hours=1))
+
+    assert model.forecast(1, 16000, START + timedelta(hours=3)).samples == 4
+
+
+def test_scheduler_plans_sample_at_predicted_threshold(
+    db, session_factory, sensor_manager, pump_engine
+):
+    now = START + timedelta(hours=3)
+    zone = make_zone(db, sensor_channel=0)
+    forecaster.observe_many(_series(zone.id, 16400, 100, 3))
+    scheduler = SamplingScheduler(
+        session_factory, sensor_manager, pump_engine, 7200, 14400, 60, now=lambda: now
+    )
+    sensor_manager.values = {0: 16100}
+
+    scheduler.tick()
+
+    schedule = scheduler.schedules()[0]
+    assert schedule.predicted_threshold_at == now + timedelta(hours=1)
+    assert schedule.next_due_at == now + timedelta(hours=1)
+
+
+def test_forecast_endpoint(client, db):
+    zone = make_zone(db)
+    now = datetime.utcnow()
+    forecaster.observe_many(
+        (zone.id, 20000 - 100 * hour, now - timedelta(hours=5 - hour)) for hour in range(6)
+    )
+
+    response = client.get(f"/api/zones/{zone.id}/forecast")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["zone_id"] == zone.id
+    assert data["threshold"] == zone.threshold
+    assert data["samples"] == 6
+    assert data["drying_rate_per_hour"] == 100
+    assert data["threshold_at"]
+    assert client.get("/api/zones/9999/forecast").status_code == 404
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from conftest import make_zone
+
+from app.api.formats import COLUMNAR, MSGPACK, encode_msgpack, negotiate
+from app.models import Reading
+from app.services.recent_readings import recent_readings
+
+START = datetime(2026, 1, 1)
+START_MS = int((START - datetime(1970, 1, 1)).total_seconds() * 1000)
+
+
+def _seed(db, zone, count):
+    rows = [
+        Reading(zone_id=zone.id, value=1000 + i, created_at=START + timedelta(minutes=i))
+        for i in range(count)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def _columnar_pages(client, **params):
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        page = client.get("/api/readings", params=query, headers={"Accept": COLUMNAR}).json()
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_columnar_pages_from_db_and_ring_match(client, db):
+    zone = make_zone(db)
+    rows = _seed(db, zone, 25)
+
+    from_db = _columnar_pages(client, zone_id=zone.id, limit=10)
+    recent_readings.append_many((r.zone_id, r.id, r.value, r.created_at) for r in rows)
+    from_ring = _columnar_pages(client, zone_id=zone.id, limit=10)
+
+    assert from_db == from_ring
+    assert [len(page["zones"][str(zone.id)]["t"]) for page in from_db] == [10, 10, 5]
+    first = from_db[0]["zones"][str(zone.id)]
+    assert first["t"] == [START_MS + minute * 60000 for minute in range(15, 25)]
+    assert first["v"] == list(range(1015, 1025))
+
+
+def test_columnar_groups_all_zones_and_allows_large_windows(client, db):
+    zones = [make_zone(db, name=f"Zone {i}") for i in range(2)]
+    for zone in zones:
+        _seed(db, zone, 3)
+
+    response = client.get("/api/readings", params={"limit": 6000}, headers={"Accept": COLUMNAR})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == COLUMNAR
+    assert sorted(response.json()["zones"]) == sorted(str(zone.id) for zone in zones)
+    assert client.get("/api/readings", params={"limit": 6000}).status_code == 422
+
+
+def test_msgpack_encoding_is_byte_exact():
+    series = {7: (np.array([1, 2], dtype=np.int64), np.array([300, -1], dtype=np.int32))}
+
+    body = encode_msgpack(series, None)
+
+    stamps = b"\xd3" + (1).to_bytes(8, "big") + b"\xd3" + (2).to_bytes(8, "big")
+    values = b"\xd2" + (300).to_bytes(4, "big") + b"\xd2" + b"\xff" * 4
+    assert body == (
+        b"\x82\xa5zones\x81\xa17\x82\xa1t\x92" + stamps + b"\xa1v\x92" + values
+        + b"\xabnext_cursor\xc0"
+    )
+    assert negotiate("application/x-msgpack;q=0.9, */*") == MSGPACK
+    assert negotiate("application/json") is None
+
+
+def test_negotiation_honours_quality_values():
+    assert negotiate("application/msgpack;q=0, application/json") is None
+    assert negotiate(f"{COLUMNAR}; q=0, application/msgpack") == MSGPACK
+    assert negotiate("application/msgpack;q=0.5, application/json;q=0.8") is None
+    assert negotiate(f"application/json;q=0.5, {COLUMNAR};q=0.9") == COLUMNAR
+    assert negotiate(f"application/msgpack, {COLUMNAR}") == COLUMNAR
+    assert negotiate("application/msgpack;q=bogus") is None
+
+
+def test_msgpack_response_and_gzip(client, db):
+    zone = make_zone(db)
+    _seed(db, zone, 500)
+
+    packed = client.get("/api/readings", params={"zone_id": zone.id}, headers={"Accept": MSGPACK})
+    assert packed.headers["content-type"] == MSGPACK
+    assert packed.content.startswith(b"\x82\xa5zones")
+
+    rows = client.get("/api/readings", params={"zone_id": zone.id})
+    assert rows.headers["content-encoding"] == "gzip"
+    assert len(rows.json()["items"]) == 500
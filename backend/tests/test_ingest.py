@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import pytest
+from conftest import make_zone
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.models import Reading, ReadingRollupHourly, ZoneState
+from app.services import ingest
+from app.services.ingest import PendingReading
+
+
+def test_bulk_ingest_json_and_ndjson_deduplicates(client, db, ingest_buffer):
+    zone = make_zone(db)
+    items = [
+        {"id": f"node-1:{i}", "zone_id": zone.id, "value": 1000 + i,
+         "created_at": f"2026-05-01T10:{i:02d}:00Z"}
+        for i in range(50)
+    ]
+
+    response = client.post("/api/readings/bulk", json=items)
+    assert response.status_code == 202
+    assert response.json()["accepted"] == 50
+
+    ndjson = "\n".join(json.dumps(item) for item in items[40:] + [items[0]])
+    response = client.post(
+        "/api/readings/bulk",
+        content=ndjson,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 202
+
+    assert ingest_buffer.flush() == 50
+    stats = client.get("/api/readings/bulk/stats").json()
+    assert stats["inserted"] == 50
+    assert stats["duplicates"] == 11
+    assert stats["pending"] == 0
+
+    assert db.query(Reading).count() == 50
+    assert db.query(ReadingRollupHourly).one().count == 50
+    state = db.get(ZoneState, zone.id)
+    assert state.latest_value == 1049
+
+
+def test_bulk_ingest_rejects_unknown_zones_and_bad_payloads(client, db, ingest_buffer):
+    response = client.post(
+        "/api/readings/bulk", json=[{"id": "x", "zone_id": 999, "value": 1}]
+    )
+    assert response.status_code == 202
+    ingest_buffer.flush()
+    assert ingest_buffer.stats()["rejected"] == 1
+
+    response = client.post("/api/readings/bulk", json=[{"id": "y", "value": 1}])
+    assert response.status_code == 422
+    response = client.post(
+        "/api/readings/bulk", json=[{"id": "z", "zone_id": 1, "value": 2**31}]
+    )
+    assert response.status_code == 422
+
+
+def test_failed_flush_keeps_the_batch_queued(db, ingest_buffer, monkeypatch):
+    zone = make_zone(db)
+    ingest_buffer.submit(
+        [PendingReading(f"n:{i}", zone.id, 1000 + i, datetime(2026, 5, 1, 10, i)) for i in range(3)]
+    )
+    apply_readings = ingest.apply_readings
+
+    def busy(*args):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(ingest, "apply_readings", busy)
+    with pytest.raises(OperationalError):
+        ingest_buffer.flush()
+    stats = ingest_buffer.stats()
+    assert stats["pending"] == 3
+    assert stats["failures"] == 1
+    assert stats["backoff_sec"] > settings.ingest_flush_interval_sec
+    assert db.query(Reading).count() == 0
+
+    monkeypatch.setattr(ingest, "apply_readings", apply_readings)
+    assert ingest_buffer.flush() == 3
+    assert [row.value for row in db.query(Reading).order_by(Reading.id)] == [1000, 1001, 1002]
+    assert ingest_buffer.stats()["backoff_sec"] == settings.ingest_flush_interval_sec
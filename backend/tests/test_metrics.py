@@ -0,0 +1,43 @@
+from conftest import FakeSensorManager, make_zone
+
+from app.services.metrics import CYCLE_SECONDS, Counter, Histogram
+from app.services.monitoring import run_monitoring_cycle
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("events_total", "Events.", ("name",))
+    counter.inc(name='say "hi"')
+    counter.inc(2, name='say "hi"')
+
+    assert counter.render()[-1] == 'events_total{name="say \\"hi\\""} 3'
+
+
+def test_metrics_endpoint_reports_routes_and_cycles(client, db, pump_engine):
+    make_zone(db)
+    before = CYCLE_SECONDS.count()
+    run_monitoring_cycle(db, FakeSensorManager({0: 20000}), pump_engine)
+    client.get("/api/zones")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert CYCLE_SECONDS.count() == before + 1
+    assert 'waterpal_http_requests_total{method="GET",route="/api/zones",status="200"}' in (
+        response.text
+    )
+    assert "waterpal_cycle_duration_seconds_bucket" in response.text
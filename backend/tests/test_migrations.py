@@ -0,0 +1,81 @@
+from sqlalchemy import text
+
+from app.db.init_db import init_db
+from app.db.migrations import LATEST_VERSION, current_version
+from app.db.profiling import profiler
+from app.db.session import make_engine
+
+
+def _columns(engine, table):
+    with engine.connect() as connection:
+        return {row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def test_current_schema_is_checked_with_one_query(engine, monkeypatch):
+    monkeypatch.setattr(profiler, "enabled", True)
+    assert current_version(engine) == LATEST_VERSION
+
+    with profiler.profile() as stats:
+        assert init_db(engine) == LATEST_VERSION
+
+    assert stats.count == 1
+
+
+def test_unversioned_database_is_upgraded(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE zones (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL,"
+                " threshold INTEGER NOT NULL, hysteresis INTEGER NOT NULL,"
+                " cooldown_hours INTEGER NOT NULL, sensor_channel INTEGER NOT NULL,"
+                " pump_gpio INTEGER, enabled BOOLEAN)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE readings (id INTEGER PRIMARY KEY, zone_id INTEGER,"
+                " value INTEGER NOT NULL, created_at DATETIME)"
+            )
+        )
+        connection.execute(text("INSERT INTO zones VALUES (1, 'Old', 16000, 800, 4, 0, 17, 1)"))
+        connection.execute(text("INSERT INTO readings VALUES (1, 1, 15000, '2026-01-01')"))
+
+    assert current_version(engine) == 0
+    assert init_db(engine) == LATEST_VERSION
+
+    assert "water_duration_sec" in _columns(engine, "zones")
+    assert "client_id" in _columns(engine, "readings")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT latest_value FROM zone_state")).scalar() == 15000
+        versions = connection.execute(text("SELECT version FROM schema_version")).scalars()
+        assert list(versions) == list(range(1, LATEST_VERSION + 1))
+    engine.dispose()
+
+
+def test_outbox_is_rebuilt_with_autoincrement_ids(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'edge.db'}")
+    init_db(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE sync_outbox"))
+        connection.execute(
+            text(
+                "CREATE TABLE sync_outbox (id INTEGER PRIMARY KEY, topic VARCHAR NOT NULL,"
+                " key VARCHAR NOT NULL, zone_id INTEGER, payload TEXT NOT NULL,"
+                " created_at DATETIME)"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO sync_outbox VALUES (7, 'readings', 'k', 1, '{}', NULL)")
+        )
+        connection.execute(text("DELETE FROM schema_version WHERE version >= 9"))
+
+    assert init_db(engine) == LATEST_VERSION
+
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM sync_outbox"))
+        connection.execute(
+            text("INSERT INTO sync_outbox (topic, key, payload) VALUES ('readings', 'n', '{}')")
+        )
+        assert connection.execute(text("SELECT id FROM sync_outbox")).scalar() == 8
+    engine.dispose()
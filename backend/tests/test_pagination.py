@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from conftest import make_zone
+
+from app.models import Reading
+
+
+def _seed(db, zone, count):
+    start = datetime(2026, 1, 1)
+    db.add_all(
+        Reading(zone_id=zone.id, value=i, created_at=start + timedelta(minutes=i // 2))
+        for i in range(count)
+    )
+    db.commit()
+
+
+def test_keyset_pages_cover_all_rows_without_overlap(client, db):
+    zone = make_zone(db)
+    _seed(db, zone, 25)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"zone_id": zone.id, "limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/readings", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_invalid_cursor_and_page_size_bounds(client):
+    assert client.get("/api/readings", params={"cursor": "bogus"}).status_code == 400
+    assert client.get("/api/alerts", params={"limit": 100000}).status_code == 422
+
+
+def test_keyset_query_uses_index(db):
+    plan = db.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT * FROM readings "
+            "WHERE (created_at, id) < ('2026-01-01 00:00:00', 5) "
+            "ORDER BY created_at DESC, id DESC LIMIT 10"
+        )
+    ).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_readings_created_id" in detail
+    assert "TEMP B-TREE" not in detail
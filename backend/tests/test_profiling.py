@@ -0,0 +1,39 @@
+import logging
+
+from conftest import make_zone
+from sqlalchemy import text
+
+from app.db.profiling import profiler
+
+
+def test_request_reports_query_count_and_time(client, db):
+    make_zone(db)
+
+    response = client.get("/api/readings")
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) == 1
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+
+
+def test_profile_counts_queries_outside_requests(db, monkeypatch):
+    monkeypatch.setattr(profiler, "enabled", True)
+
+    with profiler.profile() as stats:
+        db.execute(text("SELECT 1")).all()
+        with profiler.profile() as inner:
+            db.execute(text("SELECT 2")).all()
+
+    assert inner.count == 1
+    assert stats.count == 2
+
+
+def test_slow_queries_are_logged_with_plan(client, db, monkeypatch, caplog):
+    make_zone(db)
+    monkeypatch.setattr(profiler, "slow_query_ms", 0)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.profiling"):
+        client.get("/api/readings?zone_id=1")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("Slow query" in message and "ix_readings" in message for message in messages)
@@ -0,0 +1,132 @@
+import threading
+from datetime import timedelta
+
+from conftest import FakePumpController, make_zone
+
+from app.models import AlertEvent, PumpEvent, ZoneState
+from app.services.pump_engine import PumpEngine
+
+
+def test_engine_limits_concurrent_pumps(db, session_factory, clock):
+    controller = FakePumpController()
+    engine = PumpEngine(controller, session_factory, max_active=2, clock=clock)
+    zones = [make_zone(db, name=f"Zone {i}", pump_gpio=10 + i) for i in range(3)]
+
+    jobs = [engine.submit(zone.id, zone.pump_gpio, 10, "auto", "threshold") for zone in zones]
+
+    assert [job.status for job in jobs] == ["running", "running", "queued"]
+    assert controller.active == {10, 11}
+
+    clock.advance(10)
+    engine.tick()
+
+    assert [job.status for job in jobs] == ["completed", "completed", "running"]
+    assert controller.active == {12}
+    assert db.query(PumpEvent).count() == 2
+
+    clock.advance(10)
+    engine.tick()
+
+    assert jobs[2].status == "completed"
+    assert controller.active == set()
+    assert db.query(PumpEvent).count() == 3
+
+
+def test_engine_records_failures(db, session_factory, clock):
+    engine = PumpEngine(FakePumpController(ok=False), session_factory, clock=clock)
+    zone = make_zone(db)
+
+    auto = engine.submit(zone.id, zone.pump_gpio, 10, "auto", "threshold")
+    manual = engine.submit(zone.id, zone.pump_gpio, 10, "manual", "manual")
+
+    assert auto.status == "failed"
+    assert manual.status == "failed"
+    assert db.query(AlertEvent).one().alert_type == "pump_failed"
+    assert db.query(PumpEvent).one().duration_sec is None
+
+
+def test_manual_water_returns_job_immediately(client, db, pump_engine, clock):
+    zone = make_zone(db)
+
+    response = client.post(f"/api/zones/{zone.id}/water", json={"duration_sec": 5})
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "running"
+    assert job["event_id"] is None
+
+    clock.advance(5)
+    pump_engine.tick()
+
+    job = client.get(f"/api/pump-jobs/{job['id']}").json()
+    assert job["status"] == "completed"
+    db.expire_all()
+    assert db.get(ZoneState, zone.id).last_pump_event_id == job["event_id"]
+
+
+def test_jobs_sharing_a_pin_run_one_at_a_time(db, session_factory, clock):
+    controller = FakePumpController()
+    engine = PumpEngine(controller, session_factory, max_active=3, clock=clock)
+    zones = [make_zone(db, name=f"Zone {i}", pump_gpio=17) for i in range(2)]
+
+    first = engine.submit(zones[0].id, 17, 10, "auto", "threshold")
+    second = engine.submit(zones[1].id, 17, 5, "auto", "threshold")
+
+    assert (first.status, second.status) == ("running", "queued")
+    assert engine.is_busy(zones[1].id + 100, 17)
+
+    clock.advance(10)
+    engine.tick()
+
+    assert (first.status, second.status) == ("completed", "running")
+    assert controller.started == [17, 17]
+
+
+def test_manual_water_rejects_a_busy_pump(client, db, pump_engine):
+    zone = make_zone(db)
+
+    assert client.post(f"/api/zones/{zone.id}/water", json={}).status_code == 202
+    response = client.post(f"/api/zones/{zone.id}/water", json={})
+
+    assert response.status_code == 409
+    assert len(pump_engine.jobs()) == 1
+
+
+def test_pump_start_runs_outside_the_engine_lock(db, session_factory, clock):
+    class ProbingController(FakePumpController):
+        def start(self, gpio_pin):
+            probe = threading.Thread(target=engine.jobs)
+            probe.start()
+            probe.join(1)
+            self.blocked = probe.is_alive()
+            return super().start(gpio_pin)
+
+    controller = ProbingController()
+    engine = PumpEngine(controller, session_factory, clock=clock)
+    zone = make_zone(db)
+
+    job = engine.submit(zone.id, zone.pump_gpio, 10, "manual", "manual")
+
+    assert job.status == "running"
+    assert controller.blocked is False
+
+
+def test_stop_failure_after_watering_keeps_the_cooldown(db, session_factory, clock):
+    class StuckController(FakePumpController):
+        def stop(self, gpio_pin):
+            return False
+
+    engine = PumpEngine(StuckController(), session_factory, clock=clock)
+    zone = make_zone(db)
+
+    job = engine.submit(zone.id, zone.pump_gpio, 10, "auto", "threshold")
+    clock.advance(10)
+    engine.tick()
+
+    assert job.status == "failed"
+    assert db.query(AlertEvent).one().alert_type == "pump_failed"
+    event = db.query(PumpEvent).one()
+    assert (event.id, event.duration_sec) == (job.event_id, 10)
+    state = db.get(ZoneState, zone.id)
+    assert state.last_pump_failed_alert_id is not None
+    assert state.water_cooldown_until == event.created_at + timedelta(hours=zone.cooldown_hours)
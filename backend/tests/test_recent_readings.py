@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+from conftest import assert_max_queries, make_zone
+
+from app.models import Reading
+from app.services.recent_readings import RecentReadings, recent_readings
+
+START = datetime(2026, 5, 1, 6, 0)
+
+
+def _rows(zone_id, count, first_id=1):
+    return [
+        (zone_id, first_id + i, 20000 - i, START + timedelta(minutes=i)) for i in range(count)
+    ]
+
+
+def test_ring_keeps_last_readings_in_order():
+    ring = RecentReadings(capacity=5)
+    ring.append_many(_rows(1, 8))
+    ring.append_many([(1, 100, 5, START + timedelta(minutes=5, seconds=30))])
+
+    rows = ring.window(1, limit=10, start=START + timedelta(minutes=4))
+
+    assert [row[1] for row in rows] == [8, 7, 100, 6, 5]
+    assert ring.latest(1) == (1, 8, 19993, START + timedelta(minutes=7))
+    assert ring.stats()["per_zone"][1] == {"readings": 5, "bytes": 5 * (8 + 4 + 8)}
+
+
+def test_window_refuses_ranges_older_than_the_ring():
+    ring = RecentReadings(capacity=5)
+    ring.append_many(_rows(1, 8))
+
+    assert ring.window(1, limit=10) is None
+    assert ring.window(1, start=START + timedelta(minutes=2), limit=10) is None
+    assert len(ring.window(1, limit=4)) == 4
+    assert ring.window(2, limit=4) is None
+
+
+def test_warm_loads_latest_readings_per_zone(db):
+    zone = make_zone(db)
+    other = make_zone(db, name="Other", sensor_channel=1)
+    db.add_all(
+        Reading(zone_id=zone.id, value=i, created_at=START + timedelta(minutes=i))
+        for i in range(10)
+    )
+    db.commit()
+    ring = RecentReadings(capacity=4)
+
+    assert ring.warm(db) == 4
+    assert [row[2] for row in ring.window(zone.id, limit=4)] == [9, 8, 7, 6]
+    assert ring.window(other.id, limit=10) == []
+
+
+def test_recent_reads_skip_the_database(client, db, sampling_scheduler, sensor_manager):
+    zone = make_zone(db)
+    sensor_manager.values = {0: 21000}
+    sampling_scheduler.tick()
+
+    page = assert_max_queries(client, f"/api/readings?zone_id={zone.id}", 0).json()
+    assert [item["value"] for item in page["items"]] == [21000]
+    latest = assert_max_queries(client, "/api/readings/latest", 0).json()
+    assert latest == page["items"]
+    stats = client.get("/api/readings/recent/stats").json()
+    assert stats["readings"] == 1
+    assert recent_readings.latest(zone.id)[2] == 21000
+
+
+def test_warm_merges_readings_appended_while_loading(db, session_factory):
+    zone = make_zone(db)
+    reading = Reading(zone_id=zone.id, value=1, created_at=START)
+    db.add(reading)
+    db.commit()
+    ring = RecentReadings(capacity=10)
+    ring.append_many(
+        [
+            (zone.id, reading.id, 1, START),
+            (zone.id, reading.id + 1, 2, START + timedelta(minutes=1)),
+        ]
+    )
+
+    ring.start_warm(session_factory).join()
+
+    assert ring.ready
+    assert [row[2] for row in ring.window(zone.id, limit=10)] == [2, 1]
+
+
+def test_aware_bounds_are_served_from_the_ring(client, db):
+    zone = make_zone(db)
+    recent_readings.append_many(_rows(zone.id, 10))
+    params = f"zone_id={zone.id}&start=2026-05-01T06:03:00Z&end=2026-05-01T08:05:00%2B02:00"
+
+    page = assert_max_queries(client, f"/api/readings?{params}", 0).json()
+    assert [item["value"] for item in page["items"]] == [19995, 19996, 19997]
+    columns = client.get(
+        f"/api/readings?{params}", headers={"Accept": "application/vnd.waterpal.columnar+json"}
+    )
+    assert columns.status_code == 200
+    assert columns.json()["zones"][str(zone.id)]["v"] == [19997, 19996, 19995]
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from conftest import make_zone
+
+from app.models import AlertEvent, Reading, ZoneState
+from app.services.retention import RetentionPolicy, default_policies, run_retention
+
+
+def test_retention_prunes_in_batches(db, session_factory):
+    zone = make_zone(db)
+    now = datetime(2026, 6, 1)
+    db.add_all(
+        Reading(zone_id=zone.id, value=i, created_at=now - timedelta(days=40, minutes=i))
+        for i in range(25)
+    )
+    db.add(Reading(zone_id=zone.id, value=1, created_at=now - timedelta(days=1)))
+    db.commit()
+
+    policy = RetentionPolicy("readings", Reading, "created_at", 30)
+    report = run_retention(session_factory, [policy], batch_size=10, now=now, pause_sec=0)
+
+    assert report["pruned"] == {"readings": 25}
+    assert report["bytes_reclaimed"] >= 0
+    assert db.query(Reading).count() == 1
+
+
+def test_default_policies_keep_referenced_and_unacknowledged_rows(db, session_factory):
+    zone = make_zone(db)
+    old = datetime.utcnow() - timedelta(days=400)
+    reading = Reading(zone_id=zone.id, value=1, created_at=old)
+    db.add(reading)
+    db.add(AlertEvent(zone_id=zone.id, alert_type="low_moisture", message="a", created_at=old))
+    db.add(
+        AlertEvent(
+            zone_id=zone.id,
+            alert_type="low_moisture",
+            message="b",
+            created_at=old,
+            acknowledged=True,
+        )
+    )
+    db.flush()
+    db.add(ZoneState(zone_id=zone.id, latest_reading_id=reading.id))
+    db.commit()
+
+    report = run_retention(session_factory, default_policies(), pause_sec=0)
+
+    assert report["pruned"]["readings"] == 0
+    assert report["pruned"]["alert_events"] == 1
+    assert "reading_rollups_hourly" not in report["pruned"]
+    assert db.query(AlertEvent).one().message == "a"
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from conftest import make_zone
+
+from app.models import Reading, ReadingRollupDaily, ReadingRollupHourly
+from app.services.rollups import apply_readings, backfill_rollups
+
+
+def _seed(db, zone):
+    rows = [
+        (zone.id, 100, datetime(2026, 5, 1, 10, 5)),
+        (zone.id, 300, datetime(2026, 5, 1, 10, 55)),
+        (zone.id, 200, datetime(2026, 5, 1, 11, 15)),
+    ]
+    db.add_all(Reading(zone_id=z, value=v, created_at=t) for z, v, t in rows)
+    db.commit()
+    return rows
+
+
+def test_incremental_rollups_match_backfill(db):
+    zone = make_zone(db)
+    rows = _seed(db, zone)
+
+    apply_readings(db, rows[:2])
+    apply_readings(db, rows[2:])
+    db.commit()
+    incremental = sorted(
+        (r.bucket_start, r.count, r.value_sum, r.min_value, r.max_value)
+        for r in db.query(ReadingRollupHourly)
+    )
+
+    backfill_rollups(db)
+    backfilled = sorted(
+        (r.bucket_start, r.count, r.value_sum, r.min_value, r.max_value)
+        for r in db.query(ReadingRollupHourly)
+    )
+
+    assert incremental == backfilled == [
+        (datetime(2026, 5, 1, 10), 2, 400, 100, 300),
+        (datetime(2026, 5, 1, 11), 1, 200, 200, 200),
+    ]
+    daily = db.query(ReadingRollupDaily).one()
+    assert (daily.count, daily.min_value, daily.max_value) == (3, 100, 300)
+
+
+def test_aggregate_endpoint(client, db):
+    zone = make_zone(db)
+    apply_readings(db, _seed(db, zone))
+    db.commit()
+
+    response = client.get(
+        "/api/readings/aggregate",
+        params={"zone_id": zone.id, "bucket": "1h", "start": "2026-05-01T10:30:00"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["avg"] for item in data] == [200.0, 200.0]
+    assert data[0]["count"] == 2
+    assert client.get("/api/readings/aggregate", params={"bucket": "5m"}).status_code == 422
+
+
+def test_aggregate_endpoint_accepts_aware_bounds(client, db):
+    zone = make_zone(db)
+    apply_readings(db, _seed(db, zone))
+    db.commit()
+
+    response = client.get(
+        "/api/readings/aggregate",
+        params={
+            "zone_id": zone.id,
+            "start": "2026-05-01T12:30:00+02:00",
+            "end": "2026-05-01T10:00:00-01:00",
+        },
+    )
+
+    assert response.status_code == 200
+    assert [item["bucket_start"] for item in response.json()] == [
+        "2026-05-01T10:00:00",
+        "2026-05-01T11:00:00",
+    ]
@@ -0,0 +1,111 @@
+import time
+from datetime import datetime, timedelta
+
+from conftest import make_zone
+
+from app.services.sampling import SamplingScheduler, next_interval
+from app.services.zone_cache import ZoneConfig
+
+ZONE = ZoneConfig(
+    id=1,
+    name="Zone",
+    threshold=16000,
+    hysteresis=800,
+    cooldown_hours=4,
+    water_duration_sec=10,
+    sensor_channel=0,
+    pump_gpio=17,
+    enabled=True,
+)
+
+
+class FakeNow:
+    def __init__(self):
+        self.now = datetime(2026, 5, 1, 6, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **delta):
+        self.now += timedelta(**delta)
+
+
+def test_next_interval_tracks_distance_and_drying_rate():
+    assert next_interval(ZONE, 16500, None, 900, 14400) == 900
+    assert next_interval(ZONE, 30000, None, 900, 14400) == 14400
+    assert next_interval(ZONE, 30000, 0.0, 900, 14400) == 14400
+    assert next_interval(ZONE, 18800, 1000.0, 900, 14400) == 3600
+    assert next_interval(ZONE, 18800, 100000.0, 900, 14400) == 900
+
+
+def test_due_zones_are_sampled_in_one_pass(db, session_factory, sensor_manager, pump_engine):
+    now = FakeNow()
+    scheduler = SamplingScheduler(
+        session_factory, sensor_manager, pump_engine, 900, 14400, 60, now=now
+    )
+    wet = make_zone(db, name="Wet", sensor_channel=0)
+    near = make_zone(db, name="Near", sensor_channel=1)
+    sensor_manager.values = {0: 30000, 1: 16500}
+
+    result = scheduler.tick()
+
+    assert result["zones_sampled"] == 2
+    assert sensor_manager.passes == [[0, 1]]
+    schedules = {schedule.zone_id: schedule for schedule in scheduler.schedules()}
+    assert schedules[wet.id].next_due_at == now.now + timedelta(hours=4)
+    assert schedules[near.id].next_due_at == now.now + timedelta(minutes=15)
+
+    now.advance(minutes=15)
+    assert scheduler.tick()["zones_sampled"] == 1
+    assert sensor_manager.passes[-1] == [1]
+
+
+def test_drying_zone_is_sampled_sooner(db, session_factory, sensor_manager, pump_engine):
+    now = FakeNow()
+    scheduler = SamplingScheduler(
+        session_factory, sensor_manager, pump_engine, 900, 14400, 60, now=now
+    )
+    zone = make_zone(db, sensor_channel=0)
+    sensor_manager.values = {0: 30000}
+    scheduler.tick()
+
+    now.advance(hours=4)
+    sensor_manager.values = {0: 20000}
+    scheduler.tick()
+
+    schedule = scheduler.schedules()[0]
+    assert schedule.zone_id == zone.id
+    assert schedule.drying_rate_per_hour == 2500
+    assert schedule.interval_sec == 2304
+    assert schedule.next_due_at == now.now + timedelta(seconds=2304)
+
+
+def test_schedule_endpoint_lists_next_due(client, db, sampling_scheduler, sensor_manager):
+    zone = make_zone(db)
+    sensor_manager.values = {0: 20000}
+    sampling_scheduler.tick()
+
+    response = client.get("/api/zones/schedule")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["zone_id"] for item in data] == [zone.id]
+    assert data[0]["last_value"] == 20000
+    assert data[0]["next_due_at"]
+
+
+def test_failing_pass_backs_off_instead_of_spinning(session_factory, sensor_manager, pump_engine):
+    calls = []
+
+    class BrokenScheduler(SamplingScheduler):
+        def tick(self):
+            calls.append(time.monotonic())
+            raise RuntimeError("database is locked")
+
+    scheduler = BrokenScheduler(session_factory, sensor_manager, pump_engine, retry_sec=0.05)
+    scheduler.start()
+    time.sleep(0.3)
+    scheduler.shutdown()
+
+    assert 2 <= len(calls) <= 4
+    assert calls[1] - calls[0] >= 0.05
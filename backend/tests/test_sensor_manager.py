@@ -0,0 +1,139 @@
+import threading
+import time
+
+from app.services import sensor_manager
+from app.services.sensor_manager import SensorManager, filter_samples
+
+
+class FakeBus:
+    def __init__(self, values, ready_after=2):
+        self.values = values
+        self.ready_after = ready_after
+        self.mux = None
+        self.polls = 0
+
+    def write_i2c_block_data(self, address, register, data):
+        config = (data[0] << 8) | data[1]
+        self.mux = (config >> 12) & 0x3
+        self.polls = 0
+
+    def read_i2c_block_data(self, address, register, length):
+        if register == 0x01:
+            self.polls += 1
+            ready = self.polls >= self.ready_after
+            return [0x80 if ready else 0x00, 0x00]
+        value = self.values[self.mux].pop(0) & 0xFFFF
+        return [value >> 8, value & 0xFF]
+
+
+def test_filter_samples():
+    samples = [100, 101, 99, 5000, 100]
+    assert filter_samples(samples, "median") == 100
+    assert filter_samples(samples, "trimmed_mean", 0.2) == 100
+    assert filter_samples(samples, "mean") == 1080
+
+
+def test_single_shot_waits_for_conversion_and_filters():
+    bus = FakeBus({1: [200, 201, 9000, 199, 200]})
+    manager = SensorManager(
+        adcs=[(1, 0x48)],
+        samples=5,
+        filter_mode="median",
+        ads_mode="single",
+        simulate=False,
+        bus_factory=lambda number: bus,
+        sleep=lambda seconds: None,
+    )
+
+    assert manager.read_channel(1) == 200
+    stats = manager.stats()[1]
+    assert stats["reads"] == 1
+    assert stats["last_spread"] == 8801
+
+
+def test_single_shot_times_out_when_never_ready():
+    bus = FakeBus({0: [1]}, ready_after=10**9)
+    manager = SensorManager(
+        adcs=[(1, 0x48)],
+        samples=1,
+        simulate=False,
+        bus_factory=lambda number: bus,
+        sleep=lambda seconds: None,
+    )
+
+    assert manager.read_channel(0) is None
+    assert manager.stats()[0]["failures"] == 1
+
+
+def test_read_channels_runs_buses_concurrently():
+    barrier = threading.Barrier(2, timeout=2)
+
+    class SlowManager(SensorManager):
+        def _acquire(self, channel):
+            if channel % 4 == 0:
+                barrier.wait()
+            time.sleep(0.01)
+            return [channel]
+
+    manager = SlowManager(adcs=[(1, 0x48), (3, 0x48)], samples=1, simulate=True)
+    try:
+        values = manager.read_channels([0, 1, 4, 5])
+    finally:
+        manager.shutdown()
+
+    assert values == {0: 0, 1: 1, 4: 4, 5: 5}
+
+
+def test_callers_on_one_bus_do_not_interleave_transactions():
+    bus = FakeBus({0: [100], 1: [200]})
+    first_waiting = threading.Event()
+    second_wrote = threading.Event()
+    write = bus.write_i2c_block_data
+
+    def tracked_write(address, register, data):
+        write(address, register, data)
+        if threading.current_thread().name == "second":
+            second_wrote.set()
+
+    def sleep(seconds):
+        if threading.current_thread().name == "first":
+            first_waiting.set()
+            second_wrote.wait(0.2)
+
+    bus.write_i2c_block_data = tracked_write
+    manager = SensorManager(
+        adcs=[(1, 0x48)],
+        samples=1,
+        ads_mode="single",
+        simulate=False,
+        bus_factory=lambda number: bus,
+        sleep=sleep,
+    )
+    values = {}
+
+    def read(channel):
+        values[channel] = manager.read_channel(channel)
+
+    first = threading.Thread(target=read, args=(0,), name="first")
+    second = threading.Thread(target=read, args=(1,), name="second")
+    first.start()
+    assert first_waiting.wait(2)
+    second.start()
+    first.join(2)
+    second.join(2)
+
+    assert values == {0: 100, 1: 200}
+
+
+def test_hardware_drivers_load_on_first_real_read(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(sensor_manager, "load_driver", lambda name: loaded.append(name))
+
+    simulated = SensorManager(samples=1, simulate=True)
+    assert simulated.read_channel(0) is not None
+    manager = SensorManager(adcs=[(1, 0x48)], samples=1, simulate=False)
+    assert loaded == []
+
+    assert manager.read_channel(0) is None
+    manager.read_channel(1)
+    assert loaded == ["explorerhat", "smbus2"]
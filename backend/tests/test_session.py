@@ -0,0 +1,25 @@
+from sqlalchemy import text
+
+from app.config import settings
+from app.db.session import make_engine
+
+
+def _pragma(connection, name):
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_profile_applied_on_connect(engine):
+    with engine.connect() as connection:
+        assert _pragma(connection, "journal_mode") == "wal"
+        assert _pragma(connection, "synchronous") == 1
+        assert _pragma(connection, "busy_timeout") == settings.sqlite_busy_timeout_ms
+        assert _pragma(connection, "cache_size") == -settings.sqlite_cache_size_kib
+        assert _pragma(connection, "temp_store") == 2
+    assert engine.pool.size() == settings.db_pool_size
+
+
+def test_untuned_engine_keeps_sqlite_defaults(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'plain.db'}", tuned=False)
+    with engine.connect() as connection:
+        assert _pragma(connection, "journal_mode") == "delete"
+    engine.dispose()
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import make_zone
+
+from app.services.replay import replay
+from app.services.simulation import SoilParams, SoilSimulator, VirtualClock
+
+START = datetime(2026, 5, 1, 6, 0)
+
+
+def test_same_seed_gives_same_samples():
+    runs = []
+    for _ in range(2):
+        clock = VirtualClock(START)
+        simulator = SoilSimulator(seed=7, now=clock.now)
+        values = []
+        for _ in range(24):
+            values.extend(simulator.samples(3, 5))
+            clock.advance(3600)
+        runs.append(values)
+    assert runs[0] == runs[1]
+    other = SoilSimulator(seed=8, now=VirtualClock(START).now)
+    assert other.samples(3, 5) != runs[0][:5]
+
+
+def test_soil_dries_over_time_and_pump_wets_it():
+    clock = VirtualClock(START)
+    simulator = SoilSimulator(seed=1, now=clock.now, gpio_channels={17: [0]})
+    initial = simulator.moisture(0)
+    clock.advance(12 * 3600)
+    dried = simulator.moisture(0)
+    assert dried < initial
+
+    simulator.pump_on(17)
+    clock.advance(10)
+    simulator.pump_off(17)
+    wetted = simulator.moisture(0)
+    assert wetted > dried
+    assert wetted <= SoilParams().wet_value
+    assert simulator.moisture(1) == SoilSimulator(seed=1, now=clock.now).moisture(1)
+
+
+def test_injected_faults_expire():
+    clock = VirtualClock(START)
+    simulator = SoilSimulator(seed=1, now=clock.now)
+    simulator.inject_fault(0, "dropout", 600)
+    assert simulator.samples(0, 5) == []
+
+    clock.advance(600)
+    simulator.inject_fault(0, "stuck", 600)
+    stuck = simulator.samples(0, 3)
+    clock.advance(300)
+    assert len(set(stuck + simulator.samples(0, 3))) == 1
+
+    clock.advance(300)
+    assert len(set(simulator.samples(0, 5))) > 1
+    with pytest.raises(ValueError):
+        simulator.inject_fault(0, "melted", 60)
+
+
+def test_replay_runs_days_of_cycles_against_the_db(db, session_factory):
+    for channel, gpio in ((0, 17), (1, 27)):
+        make_zone(db, name=f"Zone {channel}", sensor_channel=channel, pump_gpio=gpio)
+
+    clock = VirtualClock(START)
+    simulator = SoilSimulator(seed=3, now=clock.now, gpio_channels={17: [0], 27: [1]})
+    report = replay(session_factory, simulator, clock, START + timedelta(days=5))
+
+    assert report.cycles > 0
+    assert report.readings >= report.cycles
+    assert report.pumps > 0
+    assert report.cycle_at[-1] <= START + timedelta(days=5)
+    assert len(report.cycle_queries) == report.cycles
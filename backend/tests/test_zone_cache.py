@@ -0,0 +1,82 @@
+from conftest import assert_max_queries, make_zone
+
+from app.models import ReadingRollupHourly
+from app.services.data_version import data_version
+from app.services.forecast import forecaster
+from app.services.recent_readings import recent_readings
+from app.services.zone_cache import zone_cache
+
+ZONE = {
+    "name": "New",
+    "threshold": 1,
+    "hysteresis": 1,
+    "cooldown_hours": 1,
+    "water_duration_sec": 1,
+    "sensor_channel": 0,
+}
+
+
+def test_zone_routes_hit_cache_and_mutations_update_it(client, db):
+    zone = make_zone(db)
+    before = zone_cache.stats()
+
+    assert len(client.get("/api/zones").json()) == 1
+    assert len(assert_max_queries(client, "/api/zones", 0).json()) == 1
+
+    version = zone_cache.version
+    response = client.patch(f"/api/zones/{zone.id}", json={"threshold": 12345})
+    assert response.status_code == 200
+    assert zone_cache.version > version
+    assert client.get("/api/zones").json()[0]["threshold"] == 12345
+
+    created = client.post("/api/zones", json=dict(ZONE, sensor_channel=3)).json()
+    assert [item["id"] for item in client.get("/api/zones").json()] == [zone.id, created["id"]]
+
+    client.delete(f"/api/zones/{zone.id}")
+    assert [item["id"] for item in client.get("/api/zones").json()] == [created["id"]]
+
+    stats = client.get("/api/zones/cache-stats").json()
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] >= 3
+    assert data_version.stats()["hits"] >= 1
+
+
+def test_stale_load_is_not_installed(db):
+    make_zone(db)
+    zone_cache.invalidate()
+
+    original = db.query
+
+    def racing_query(*args, **kwargs):
+        zone_cache.invalidate()
+        return original(*args, **kwargs)
+
+    db.query = racing_query
+    assert len(zone_cache.all(db)) == 1
+    db.query = original
+    assert zone_cache.stats()["loaded"] is False
+
+
+def _leftovers(db, zone_id, scheduler):
+    return {
+        "rollups": db.query(ReadingRollupHourly).filter_by(zone_id=zone_id).count(),
+        "forecast_samples": forecaster.forecast(zone_id, 1).samples,
+        "ring": recent_readings.window(zone_id, limit=10) or [],
+        "schedules": [s.last_value for s in scheduler.schedules() if s.zone_id == zone_id],
+    }
+
+
+def test_reused_zone_ids_start_without_stale_state(client, db, sampling_scheduler, sensor_manager):
+    empty = {"rollups": 0, "forecast_samples": 0, "ring": [], "schedules": []}
+    sensor_manager.values = {0: 21000}
+    zone_id = client.post("/api/zones", json=ZONE).json()["id"]
+    sampling_scheduler.tick()
+    assert _leftovers(db, zone_id, sampling_scheduler) != empty
+
+    assert client.delete(f"/api/zones/{zone_id}").status_code == 204
+    assert _leftovers(db, zone_id, sampling_scheduler) == empty
+    assert client.post("/api/zones", json=ZONE).json()["id"] == zone_id
+
+    sampling_scheduler.tick()
+    assert client.post("/api/reset-db").status_code == 200
+    assert _leftovers(db, zone_id, sampling_scheduler) == empty
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from conftest import FakeSensorManager, assert_max_queries, make_zone
+
+from app.db.profiling import profiler
+from app.models import AlertEvent, PumpEvent, Reading, ZoneState
+from app.services import monitoring
+from app.services.monitoring import run_monitoring_cycle
+from app.services.zone_state import backfill_zone_states
+
+
+def test_cycle_updates_zone_state(db, pump_engine, clock):
+    zone = make_zone(db, sensor_channel=0)
+
+    result = run_monitoring_cycle(db, FakeSensorManager({0: 12000}), pump_engine)
+    clock.advance(zone.water_duration_sec)
+    pump_engine.tick()
+
+    assert result == {"readings_saved": 1, "pumps_scheduled": 1}
+    db.expire_all()
+    state = db.get(ZoneState, zone.id)
+    assert state.latest_value == 12000
+    assert state.latest_reading_id == db.query(Reading).one().id
+    assert state.last_pump_event_id == db.query(PumpEvent).one().id
+    assert state.water_cooldown_until == state.last_pump_at + timedelta(hours=4)
+    assert state.last_low_moisture_alert_id == db.query(AlertEvent).one().id
+
+
+def test_cycle_skips_failed_reads(db, pump_engine):
+    make_zone(db, name="Ok", sensor_channel=0)
+    make_zone(db, name="Failed", sensor_channel=1)
+
+    result = run_monitoring_cycle(db, FakeSensorManager({0: 20000}), pump_engine)
+
+    assert result == {"readings_saved": 1, "pumps_scheduled": 0}
+    assert db.query(Reading).count() == 1
+
+
+def test_pump_finishing_between_snapshot_and_save_is_kept(db, pump_engine, clock, monkeypatch):
+    fresh = make_zone(db, name="Fresh", sensor_channel=0, pump_gpio=17)
+    known = make_zone(db, name="Known", sensor_channel=1, pump_gpio=27)
+    run_monitoring_cycle(db, FakeSensorManager({1: 20000}), pump_engine)
+    jobs = [pump_engine.submit(z.id, z.pump_gpio, 5, "manual", "manual") for z in (fresh, known)]
+    snapshot = monitoring.snapshot_states
+
+    def snapshot_then_finish_pumps(*args):
+        states = snapshot(*args)
+        clock.advance(5)
+        pump_engine.tick()
+        return states
+
+    monkeypatch.setattr(monitoring, "snapshot_states", snapshot_then_finish_pumps)
+    result = run_monitoring_cycle(db, FakeSensorManager({0: 12000, 1: 12000}), pump_engine)
+
+    assert [job.status for job in jobs] == ["completed", "completed"]
+    assert result == {"readings_saved": 2, "pumps_scheduled": 0}
+    db.expire_all()
+    for zone in (fresh, known):
+        state = db.get(ZoneState, zone.id)
+        assert state.latest_value == 12000
+        assert state.last_pump_event_id is not None
+        assert state.water_cooldown_until == state.last_pump_at + timedelta(hours=4)
+        assert state.last_low_moisture_alert_id is not None
+
+
+def test_cycle_respects_cooldown_from_state(db, pump_engine, clock):
+    make_zone(db, sensor_channel=0)
+    sensors = FakeSensorManager({0: 12000})
+
+    run_monitoring_cycle(db, sensors, pump_engine)
+    clock.advance(60)
+    pump_engine.tick()
+    db.expire_all()
+    result = run_monitoring_cycle(db, sensors, pump_engine)
+
+    assert result == {"readings_saved": 1, "pumps_scheduled": 0}
+    assert db.query(AlertEvent).count() == 1
+
+
+def _cycle_queries(db, pump_engine, zones):
+    sensors = FakeSensorManager({channel: 12000 + channel for channel in range(zones)})
+    counts = []
+    for _ in range(2):
+        with profiler.profile() as stats:
+            run_monitoring_cycle(db, sensors, pump_engine)
+        counts.append(stats.count)
+    return counts
+
+
+def test_cycle_query_count_is_constant(db, pump_engine, monkeypatch):
+    monkeypatch.setattr(profiler, "enabled", True)
+    for channel in range(3):
+        make_zone(db, name=f"Zone {channel}", sensor_channel=channel)
+    small = _cycle_queries(db, pump_engine, 3)
+
+    for channel in range(3, 60):
+        make_zone(db, name=f"Zone {channel}", sensor_channel=channel)
+    db.query(ZoneState).delete()
+    db.commit()
+    large = _cycle_queries(db, pump_engine, 60)
+
+    assert small == large
+    assert large[0] <= 7
+    assert db.query(Reading).count() == 126
+    assert db.query(AlertEvent).count() == 63
+
+
+def test_backfill_zone_states(db):
+    zone = make_zone(db)
+    db.add(Reading(zone_id=zone.id, value=15000))
+    db.add(PumpEvent(zone_id=zone.id, action="manual", reason="manual", duration_sec=5))
+    db.commit()
+
+    assert backfill_zone_states(db) == 1
+    state = db.get(ZoneState, zone.id)
+    assert state.latest_value == 15000
+    assert state.water_cooldown_until is not None
+
+
+def test_status_reads_zone_state_in_one_query(client, db, pump_engine):
+    for channel in range(5):
+        make_zone(db, name=f"Zone {channel}", sensor_channel=channel)
+    run_monitoring_cycle(
+        db,
+        FakeSensorManager({channel: 20000 for channel in range(5)}),
+        pump_engine,
+    )
+
+    response = assert_max_queries(client, "/api/status", 1)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 5
+    assert all(item["latest_reading"]["value"] == 20000 for item in data)
@@ -21,8 +21,8 @@ export default function History() {
         client.get("/api/pump-events"),
       ]);
       setZones(zonesRes.data);
-      setReadings(readingsRes.data);
-      setPumpEvents(pumpRes.data);
+      setReadings(readingsRes.data.items);
+      setPumpEvents(pumpRes.data.items);
       setError("");
     } catch (err) {
       setError("Unable to load history.");
@@ -38,7 +38,7 @@ export default function System() {
         client.get("/api/alerts", { params }),
       ]);
       setStatus(statusRes.data);
-      setAlerts(alertRes.data);
+      setAlerts(alertRes.data.items);
       setError("");
     } catch (err) {
       setError("Unable to load system status.");